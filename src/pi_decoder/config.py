@@ -8,6 +8,7 @@ import re
 import shutil
 import sys
 import tempfile
+from collections.abc import Callable
 from dataclasses import dataclass, field, fields
 from pathlib import Path
 
@@ -29,7 +30,7 @@ DEFAULT_CONFIG_PATH = Path("/etc/pi-decoder/config.toml")
 # ── dataclasses ──────────────────────────────────────────────────────────────
 
 
-@dataclass
+@dataclass(slots=True)
 class StreamConfig:
     url: str = ""
     backup_url: str = ""  # failover URL — auto-switch after consecutive failures
@@ -39,7 +40,7 @@ class StreamConfig:
     presets: list = field(default_factory=list)  # [{label: str, url: str}, ...]
 
 
-@dataclass
+@dataclass(slots=True)
 class OverlayConfig:
     enabled: bool = False
     position: str = "bottom-right"
@@ -53,7 +54,7 @@ class OverlayConfig:
     timezone: str = "Europe/Copenhagen"
 
 
-@dataclass
+@dataclass(slots=True)
 class PCOConfig:
     app_id: str = ""
     secret: str = ""
@@ -63,17 +64,17 @@ class PCOConfig:
     poll_interval: int = 5
 
 
-@dataclass
+@dataclass(slots=True)
 class WebConfig:
     port: int = 80
 
 
-@dataclass
+@dataclass(slots=True)
 class GeneralConfig:
     name: str = "Pi-Decoder"
 
 
-@dataclass
+@dataclass(slots=True)
 class NetworkConfig:
     hotspot_ssid: str = "Pi-Decoder"
     hotspot_password: str = "pidecodersetup"
@@ -89,12 +90,12 @@ class NetworkConfig:
     wifi_dns: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class DisplayConfig:
     hdmi_resolution: str = "1920x1080@30D"
 
 
-@dataclass
+@dataclass(slots=True)
 class CECConfig:
     # On startup, if an Audio System (soundbar/AVR, e.g. eARC/ARC device) is
     # detected on the CEC bus, request that audio be routed to it instead of
@@ -104,7 +105,7 @@ class CECConfig:
     prefer_audio_system: bool = True
 
 
-@dataclass
+@dataclass(slots=True)
 class Config:
     general: GeneralConfig = field(default_factory=GeneralConfig)
     stream: StreamConfig = field(default_factory=StreamConfig)
@@ -116,28 +117,115 @@ class Config:
     cec: CECConfig = field(default_factory=CECConfig)
 
 
+# (section name, section class) in TOML order, derived from Config's fields
+_SECTIONS: tuple[tuple[str, type], ...] = tuple(
+    (f.name, f.default_factory) for f in fields(Config)  # type: ignore[misc]
+)
+
+
+# ── validation tables ────────────────────────────────────────────────────────
+
+_STREAM_PROTOCOLS = ("rtmp://", "rtmps://", "srt://", "http://", "https://", "rtp://", "udp://")
+_POSITIONS = frozenset({"top-left", "top-right", "bottom-left", "bottom-right"})
+_TIMER_MODES = frozenset({"service", "item"})
+_SEARCH_MODES = frozenset({"service_type", "folder"})
+_MAX_RESOLUTIONS = frozenset({"best", "2160", "1440", "1080", "720", "480"})
+_HDMI_REFRESH_RATES = frozenset({24, 25, 30, 50, 60})
+# WxH[@R[D]] — digit counts bound what the range check below can accept
+_HDMI_RES_RE = re.compile(r"(\d{3,4})x(\d{3,4})(?:@(\d{2})(D)?)?")
+_IP_MODES = frozenset({"auto", "manual"})
+
+# Field names never included in exported/served config (see to_dict_safe)
+_SECRET_FIELDS = frozenset({"secret"})
+
+# (section, field) -> (min, max) inclusive clamp range
+_CLAMPS: dict[tuple[str, str], tuple[float, float]] = {
+    ("network", "ethernet_timeout"): (1, 120),
+    ("network", "wifi_timeout"): (1, 120),
+    ("stream", "network_caching"): (200, 30000),
+    ("overlay", "font_size"): (10, 200),
+    ("overlay", "font_size_title"): (10, 200),
+    ("overlay", "font_size_info"): (10, 200),
+    ("overlay", "transparency"): (0.0, 1.0),
+    ("pco", "poll_interval"): (1, 60),
+    ("web", "port"): (1, 65535),
+}
+
+# (section, field) -> (allowed values, fallback)
+_CHOICES: dict[tuple[str, str], tuple[frozenset, str]] = {
+    ("overlay", "position"): (_POSITIONS, "bottom-right"),
+    ("overlay", "timer_mode"): (_TIMER_MODES, "service"),
+    ("pco", "search_mode"): (_SEARCH_MODES, "service_type"),
+    ("stream", "max_resolution"): (_MAX_RESOLUTIONS, "1080"),
+}
+
+
 # ── helpers ──────────────────────────────────────────────────────────────────
 
 
+def _coerce_bool(val: object) -> object:
+    if isinstance(val, str):
+        return val.lower() in ("true", "1", "yes")
+    return val
+
+
+def _coerce_list(val: object) -> object:
+    return val if isinstance(val, list) else list(val)  # type: ignore[call-overload]
+
+
+def _identity(val: object) -> object:
+    return val
+
+
+# (field name, coercer) pairs for one section dataclass
+_Schema = tuple[tuple[str, Callable[[object], object]], ...]
+
+# Coercer per declared basic field type (annotations are strings here)
+_COERCERS = {
+    "int": int,
+    "float": float,
+    "bool": _coerce_bool,
+    "str": str,
+    "list": _coerce_list,
+}
+
+
+def _build_schema(cls: type) -> _Schema:
+    """Precompute (field name, coercer) pairs for a section dataclass."""
+    return tuple(
+        (f.name, _COERCERS.get(f.type if isinstance(f.type, str) else f.type.__name__, _identity))
+        for f in fields(cls)  # type: ignore[arg-type]
+    )
+
+
+def _coerce_fields(cls: type, data: dict) -> dict:
+    """Coerce the known keys of a raw section dict, skipping unknown keys.
+
+    Raises ValueError naming the offending field if a value can't be coerced.
+    """
+    schema = _SCHEMAS.get(cls) or _build_schema(cls)
+    out = {}
+    for name, coerce in schema:
+        if name in data:
+            try:
+                out[name] = coerce(data[name])
+            except (TypeError, ValueError) as e:
+                raise ValueError(f"{name}: {e}") from e
+    return out
+
+
 def _apply_dict(dc: object, data: dict) -> None:
     """Overwrite dataclass fields from a dict, skipping unknown keys."""
-    for f in fields(dc):  # type: ignore[arg-type]
-        if f.name in data:
-            val = data[f.name]
-            # coerce basic types
-            if f.type in ("int", int):
-                val = int(val)
-            elif f.type in ("float", float):
-                val = float(val)
-            elif f.type in ("bool", bool):
-                if isinstance(val, str):
-                    val = val.lower() in ("true", "1", "yes")
-            elif f.type in ("str", str):
-                val = str(val)
-            elif f.type in ("list", list):
-                if not isinstance(val, list):
-                    val = list(val)
-            setattr(dc, f.name, val)
+    for name, val in _coerce_fields(type(dc), data).items():
+        setattr(dc, name, val)
+
+
+def _decode_section(name: str, cls: type, data: dict) -> object:
+    """Build a config section from a raw TOML table in one constructor call."""
+    try:
+        return cls(**_coerce_fields(cls, data))
+    except ValueError as e:
+        raise ValueError(f"{name}.{e}") from e
 
 
 def _section_to_dict(dc: object) -> dict:
@@ -145,6 +233,17 @@ def _section_to_dict(dc: object) -> dict:
     return {f.name: getattr(dc, f.name) for f in fields(dc)}  # type: ignore[arg-type]
 
 
+def _to_dict(cfg: Config) -> dict:
+    """Convert a Config to a plain dict of section dicts."""
+    return {name: _section_to_dict(getattr(cfg, name)) for name, _ in _SECTIONS}
+
+
+# Field coercion schema per section class, built once at import
+_SCHEMAS: dict[type, _Schema] = {
+    cls: _build_schema(cls) for _, cls in _SECTIONS
+}
+
+
 # ── public API ───────────────────────────────────────────────────────────────
 
 
@@ -157,7 +256,7 @@ def _validate_static_ip(net: NetworkConfig, prefix: str) -> None:
     import ipaddress
 
     mode = getattr(net, f"{prefix}_ip_mode")
-    if mode not in ("auto", "manual"):
+    if mode not in _IP_MODES:
         setattr(net, f"{prefix}_ip_mode", "auto")
         mode = "auto"
 
@@ -206,29 +305,18 @@ def _validate_static_ip(net: NetworkConfig, prefix: str) -> None:
 
 def validate_config(cfg: Config) -> None:
     """Clamp and validate all config values in place."""
-    cfg.network.ethernet_timeout = max(1, min(cfg.network.ethernet_timeout, 120))
-    cfg.network.wifi_timeout = max(1, min(cfg.network.wifi_timeout, 120))
+    for (section, name), (lo, hi) in _CLAMPS.items():
+        sec = getattr(cfg, section)
+        setattr(sec, name, max(lo, min(getattr(sec, name), hi)))
+    for (section, name), (allowed, fallback) in _CHOICES.items():
+        sec = getattr(cfg, section)
+        if getattr(sec, name) not in allowed:
+            setattr(sec, name, fallback)
 
-    _allowed_protocols = ("rtmp://", "rtmps://", "srt://", "http://", "https://", "rtp://", "udp://")
     _url = cfg.stream.url
-    if _url and not any(_url.startswith(p) for p in _allowed_protocols):
+    if _url and not _url.startswith(_STREAM_PROTOCOLS):
         log.warning("Invalid stream URL protocol: %s", _url)
 
-    cfg.stream.network_caching = max(200, min(cfg.stream.network_caching, 30000))
-    cfg.overlay.font_size = max(10, min(cfg.overlay.font_size, 200))
-    cfg.overlay.font_size_title = max(10, min(cfg.overlay.font_size_title, 200))
-    cfg.overlay.font_size_info = max(10, min(cfg.overlay.font_size_info, 200))
-    cfg.overlay.transparency = max(0.0, min(cfg.overlay.transparency, 1.0))
-    if cfg.overlay.position not in (
-        "top-left",
-        "top-right",
-        "bottom-left",
-        "bottom-right",
-    ):
-        cfg.overlay.position = "bottom-right"
-    if cfg.overlay.timer_mode not in ("service", "item"):
-        cfg.overlay.timer_mode = "service"
-
     _tz = cfg.overlay.timezone
     if _tz:
         try:
@@ -237,10 +325,6 @@ def validate_config(cfg: Config) -> None:
         except (KeyError, ImportError):
             log.warning("Invalid timezone '%s', falling back to UTC", _tz)
             cfg.overlay.timezone = "UTC"
-    cfg.pco.poll_interval = max(1, min(cfg.pco.poll_interval, 60))
-    if cfg.pco.search_mode not in ("service_type", "folder"):
-        cfg.pco.search_mode = "service_type"
-    cfg.web.port = max(1, min(cfg.web.port, 65535))
 
     # Hotspot SSID validation (WiFi spec: non-empty, max 32 bytes)
     _ssid = cfg.network.hotspot_ssid.strip()
@@ -261,18 +345,12 @@ def validate_config(cfg: Config) -> None:
         log.warning("Too many presets (%d), truncating to 10", len(cfg.stream.presets))
         cfg.stream.presets = cfg.stream.presets[:10]
 
-    # Stream max resolution validation
-    _allowed_max_res = {"best", "2160", "1440", "1080", "720", "480"}
-    if cfg.stream.max_resolution not in _allowed_max_res:
-        cfg.stream.max_resolution = "1080"
-
     # HDMI resolution validation — tightened ranges and known refresh rates
-    _valid_refresh = {24, 25, 30, 50, 60}
-    _hdmi_m = re.match(r'^(\d+)x(\d+)(?:@(\d+)(D)?)?$', cfg.display.hdmi_resolution)
+    _hdmi_m = _HDMI_RES_RE.fullmatch(cfg.display.hdmi_resolution)
     if _hdmi_m:
         _w, _h = int(_hdmi_m.group(1)), int(_hdmi_m.group(2))
         _rate = int(_hdmi_m.group(3)) if _hdmi_m.group(3) else 30
-        if not (320 <= _w <= 7680 and 240 <= _h <= 4320 and _rate in _valid_refresh):
+        if not (320 <= _w <= 7680 and 240 <= _h <= 4320 and _rate in _HDMI_REFRESH_RATES):
             cfg.display.hdmi_resolution = "1920x1080@30D"
     else:
         cfg.display.hdmi_resolution = "1920x1080@30D"
@@ -285,33 +363,25 @@ def validate_config(cfg: Config) -> None:
 def load_config(path: str | Path | None = None) -> Config:
     """Read TOML config, return validated Config.  Missing keys get defaults."""
     path = Path(path) if path else DEFAULT_CONFIG_PATH
-    cfg = Config()
+    cfg: Config | None = None
 
     if path.exists():
         try:
             with open(path, "rb") as fp:
                 raw = tomllib.load(fp)
-            if "general" in raw:
-                _apply_dict(cfg.general, raw["general"])
-            if "stream" in raw:
-                _apply_dict(cfg.stream, raw["stream"])
-            if "overlay" in raw:
-                _apply_dict(cfg.overlay, raw["overlay"])
-            if "pco" in raw:
-                _apply_dict(cfg.pco, raw["pco"])
-            if "web" in raw:
-                _apply_dict(cfg.web, raw["web"])
-            if "network" in raw:
-                _apply_dict(cfg.network, raw["network"])
-            if "display" in raw:
-                _apply_dict(cfg.display, raw["display"])
-            if "cec" in raw:
-                _apply_dict(cfg.cec, raw["cec"])
+            # Only sections absent from the file are default-constructed
+            cfg = Config(**{
+                name: _decode_section(name, cls, raw[name])
+                for name, cls in _SECTIONS
+                if name in raw
+            })
         except Exception:
             log.exception("Failed to parse config at %s — using defaults", path)
     else:
         log.warning("Config file %s not found — using defaults", path)
 
+    if cfg is None:
+        cfg = Config()
     validate_config(cfg)
 
     return cfg
@@ -319,18 +389,16 @@ def load_config(path: str | Path | None = None) -> Config:
 
 def to_dict_safe(cfg: Config) -> dict:
     """Export config as a dict, stripping sensitive fields."""
-    data = {
-        "general": _section_to_dict(cfg.general),
-        "stream": _section_to_dict(cfg.stream),
-        "overlay": _section_to_dict(cfg.overlay),
-        "pco": _section_to_dict(cfg.pco),
-        "web": _section_to_dict(cfg.web),
-        "network": _section_to_dict(cfg.network),
-        "display": _section_to_dict(cfg.display),
-        "cec": _section_to_dict(cfg.cec),
-    }
-    # Strip secrets
-    data["pco"].pop("secret", None)
+    data = {}
+    for name, _ in _SECTIONS:
+        section = getattr(cfg, name)
+        data[name] = {
+            f.name: getattr(section, f.name)
+            for f in fields(section)
+            if f.name not in _SECRET_FIELDS
+        }
+    # Don't hand out the live presets list
+    data["stream"]["presets"] = list(cfg.stream.presets)
     return data
 
 
@@ -340,16 +408,7 @@ def save_config(cfg: Config, path: str | Path | None = None) -> None:
 
     path = Path(path) if path else DEFAULT_CONFIG_PATH
 
-    data = {
-        "general": _section_to_dict(cfg.general),
-        "stream": _section_to_dict(cfg.stream),
-        "overlay": _section_to_dict(cfg.overlay),
-        "pco": _section_to_dict(cfg.pco),
-        "web": _section_to_dict(cfg.web),
-        "network": _section_to_dict(cfg.network),
-        "display": _section_to_dict(cfg.display),
-        "cec": _section_to_dict(cfg.cec),
-    }
+    payload = tomli_w.dumps(_to_dict(cfg)).encode()
 
     with writable("/"):
         path.parent.mkdir(parents=True, exist_ok=True)
@@ -361,11 +420,13 @@ def save_config(cfg: Config, path: str | Path | None = None) -> None:
             except OSError:
                 log.warning("Could not create config backup")
 
-        # Atomic write: temp file + os.replace
+        # Atomic write: one buffered write to a temp file, fsync, os.replace
         tmp_path = path.parent / (path.name + ".tmp")
         try:
             with open(tmp_path, "wb") as fp:
-                tomli_w.dump(data, fp)
+                fp.write(payload)
+                fp.flush()
+                os.fsync(fp.fileno())
             os.replace(tmp_path, path)
         except Exception:
             try:
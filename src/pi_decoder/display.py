@@ -15,12 +15,21 @@ _DRM_MODES_GLOB = "/sys/class/drm/card*-HDMI-A-1/modes"
 
 _FALLBACK_MODES = ["1920x1080", "1280x720", "720x480"]
 
+# Trailing interlaced/progressive marker on a DRM mode line
+_MODE_SUFFIX_RE = re.compile(rb"(?<=[0-9])[ip](?=[ \t\r]*$)", re.MULTILINE)
+
+# KMS mode set on the kernel command line; an empty value doesn't count
+_VIDEO_PARAM_RE = re.compile(r"video=HDMI-A-1:(\S+)")
+
 _ALL_RATES = [24, 25, 30, 50, 60]
 _4K_RATES_PI4 = [24, 25, 30]
 _4K_RATES_PI5 = [24, 25, 30, 50, 60]
 
 _PI_MODEL_PATH = Path("/proc/device-tree/model")
 
+# Resolved once at import; the platform can't change under a running process
+_IS_LINUX = platform.system() == "Linux"
+
 
 def get_pi_model() -> int:
     """Detect the Raspberry Pi model number (4, 5, etc.).
@@ -65,7 +74,7 @@ def get_available_modes() -> list[str]:
     Returns deduplicated list like ["1920x1080", "1280x720", ...].
     Falls back to a default list on non-Linux or missing sysfs.
     """
-    if platform.system() != "Linux":
+    if not _IS_LINUX:
         return list(_FALLBACK_MODES)
 
     import glob as _glob
@@ -73,23 +82,26 @@ def get_available_modes() -> list[str]:
     if not mode_files:
         return list(_FALLBACK_MODES)
 
-    seen: set[str] = set()
-    modes: list[str] = []
-    for mf in mode_files:
-        try:
-            text = Path(mf).read_text()
-            for line in text.strip().splitlines():
-                # Lines look like "1920x1080" or "1920x1080i"
-                res = line.strip()
-                # Normalize: strip trailing 'i' or 'p' suffix
-                res = re.sub(r'[ip]$', '', res)
-                if res and res not in seen:
-                    seen.add(res)
-                    modes.append(res)
-        except Exception:
-            log.debug("Failed to read DRM modes from %s", mf, exc_info=True)
-
-    return modes if modes else list(_FALLBACK_MODES)
+    contents = [_read_modes_file(f) for f in mode_files]
+
+    # dict keys double as an insertion-ordered set for dedupe
+    seen: dict[str, None] = {}
+    for data in contents:
+        # Lines look like "1920x1080" or "1920x1080i"; strip the 'i'/'p'
+        # suffix across the whole buffer in one pass, then split on whitespace
+        for res in _MODE_SUFFIX_RE.sub(b"", data).split():
+            seen.setdefault(res.decode("ascii", errors="replace"), None)
+
+    return list(seen) if seen else list(_FALLBACK_MODES)
+
+
+def _read_modes_file(path: str) -> bytes:
+    """Read one DRM connector modes file, returning b"" on failure."""
+    try:
+        return Path(path).read_bytes()
+    except Exception:
+        log.debug("Failed to read DRM modes from %s", path, exc_info=True)
+        return b""
 
 
 def _find_cmdline_path() -> Path | None:
@@ -110,9 +122,9 @@ def get_current_resolution() -> str:
         return ""
 
     try:
-        content = cmdline_path.read_text().strip()
+        content = cmdline_path.read_text()
         # Look for video=HDMI-A-1:WxH@RD or similar
-        match = re.search(r'video=HDMI-A-1:(\S+)', content)
+        match = _VIDEO_PARAM_RE.search(content)
         if match:
             return match.group(1)
     except Exception:
@@ -126,7 +138,7 @@ async def set_display_resolution(resolution: str) -> None:
 
     Strips old video=HDMI-A-1:... param and appends new one.
     """
-    if platform.system() != "Linux":
+    if not _IS_LINUX:
         log.debug("Display resolution change skipped (not Linux)")
         return
 
@@ -143,18 +155,16 @@ async def set_display_resolution(resolution: str) -> None:
     content = content.strip() + f" video=HDMI-A-1:{resolution}"
 
     from pi_decoder.fsutil import writable
+    from pi_decoder.procutil import run_command
 
     with writable("/boot/firmware"):
-        proc = await asyncio.create_subprocess_exec(
+        rc, _, stderr = await run_command(
             "sudo", "tee", str(cmdline_path),
-            stdin=asyncio.subprocess.PIPE,
-            stdout=asyncio.subprocess.DEVNULL,
-            stderr=asyncio.subprocess.PIPE,
+            input=content.encode(), capture_stdout=False,
         )
-        _, stderr = await asyncio.wait_for(proc.communicate(input=content.encode()), timeout=10)
-        if proc.returncode != 0:
+        if rc != 0:
             err = stderr.decode(errors="replace").strip()
-            raise RuntimeError(f"Failed to write cmdline.txt (rc={proc.returncode}): {err}")
+            raise RuntimeError(f"Failed to write cmdline.txt (rc={rc}): {err}")
 
     log.info("HDMI resolution set to %s in %s", resolution, cmdline_path)
 
@@ -169,7 +179,7 @@ def _find_drm_status_path() -> str | None:
 
     Returns None on non-Linux or if no HDMI connector is found.
     """
-    if platform.system() != "Linux":
+    if not _IS_LINUX:
         return None
     import glob as _glob
     paths = sorted(_glob.glob(_DRM_STATUS_GLOB))
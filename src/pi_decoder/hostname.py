@@ -10,6 +10,15 @@ from pathlib import Path
 
 log = logging.getLogger(__name__)
 
+# Resolved once at import; the platform can't change under a running process
+_IS_LINUX = platform.system() == "Linux"
+
+# Output of sanitize_hostname: 1-63 of [a-z0-9-], no leading/trailing/double hyphen
+_VALID_HOSTNAME_RE = re.compile(r"(?!.*--)[a-z0-9](?:[a-z0-9-]{0,61}[a-z0-9])?")
+
+# A 127.0.1.1 line in /etc/hosts (but not e.g. 127.0.1.10)
+_HOSTS_LOOPBACK_RE = re.compile(r"^[ \t]*127\.0\.1\.1(?![\d.]).*$", re.MULTILINE)
+
 
 def sanitize_hostname(name: str) -> str:
     """Convert a display name to a valid hostname.
@@ -22,6 +31,9 @@ def sanitize_hostname(name: str) -> str:
     - Truncate to 63 chars (RFC 1123)
     - Fallback to "pi-decoder" if result is empty
     """
+    # Fast path: already a valid hostname (the usual case on restart)
+    if _VALID_HOSTNAME_RE.fullmatch(name):
+        return name
     h = name.lower()
     h = h.replace(" ", "-").replace("_", "-")
     h = re.sub(r"[^a-z0-9\-]", "", h)
@@ -31,6 +43,21 @@ def sanitize_hostname(name: str) -> str:
     return h or "pi-decoder"
 
 
+def _rewrite_hosts(text: str, hostname: str) -> str:
+    """Point every 127.0.1.1 line in an /etc/hosts body at hostname.
+
+    Appends a 127.0.1.1 line if none exists. Done as one substitution over
+    the whole file rather than a per-line loop.
+    """
+    entry = f"127.0.1.1\t{hostname}"
+    content, count = _HOSTS_LOOPBACK_RE.subn(entry, text)
+    if content and not content.endswith("\n"):
+        content += "\n"
+    if not count:
+        content += entry + "\n"
+    return content
+
+
 async def set_hostname(name: str) -> str:
     """Sanitize name, then set system hostname + update /etc/hosts.
 
@@ -41,24 +68,22 @@ async def set_hostname(name: str) -> str:
     """
     hostname = sanitize_hostname(name)
 
-    if platform.system() != "Linux":
+    if not _IS_LINUX:
         log.debug("Hostname sync skipped (not Linux)")
         return hostname
 
     from pi_decoder.fsutil import writable
+    from pi_decoder.procutil import run_command
 
     with writable("/"):
         # Set hostname via hostnamectl
         try:
-            proc = await asyncio.create_subprocess_exec(
+            rc, _, stderr = await run_command(
                 "sudo", "hostnamectl", "set-hostname", hostname,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
             )
-            stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=10)
-            if proc.returncode != 0:
+            if rc != 0:
                 err = stderr.decode(errors="replace").strip()
-                log.warning("hostnamectl failed (rc=%d): %s", proc.returncode, err)
+                log.warning("hostnamectl failed (rc=%d): %s", rc, err)
                 return hostname
         except asyncio.TimeoutError:
             log.warning("hostnamectl timed out")
@@ -69,27 +94,12 @@ async def set_hostname(name: str) -> str:
 
         # Update /etc/hosts — replace or add 127.0.1.1 line (safe Python file write)
         try:
-            hosts_path = Path("/etc/hosts")
-            lines = hosts_path.read_text().splitlines()
-            new_lines = []
-            found = False
-            for line in lines:
-                if line.strip().startswith("127.0.1.1"):
-                    new_lines.append(f"127.0.1.1\t{hostname}")
-                    found = True
-                else:
-                    new_lines.append(line)
-            if not found:
-                new_lines.append(f"127.0.1.1\t{hostname}")
-            content = "\n".join(new_lines) + "\n"
+            content = _rewrite_hosts(Path("/etc/hosts").read_text(), hostname)
             # Write via sudo tee to handle permissions
-            proc = await asyncio.create_subprocess_exec(
+            await run_command(
                 "sudo", "tee", "/etc/hosts",
-                stdin=asyncio.subprocess.PIPE,
-                stdout=asyncio.subprocess.DEVNULL,
-                stderr=asyncio.subprocess.PIPE,
+                input=content.encode(), capture_stdout=False,
             )
-            await asyncio.wait_for(proc.communicate(input=content.encode()), timeout=10)
         except Exception:
             log.warning("Failed to update /etc/hosts", exc_info=True)
 
@@ -8,6 +8,7 @@ import os
 import signal
 import socket
 import sys
+from asyncio import run as _asyncio_run
 
 import uvicorn
 
@@ -137,7 +138,7 @@ def run() -> None:
         datefmt="%H:%M:%S",
     )
     try:
-        asyncio.run(async_main())
+        _asyncio_run(async_main())
     except KeyboardInterrupt:
         pass
 
@@ -83,6 +83,10 @@ class MpvManager:
         self._using_backup: bool = False
         self._overlay_confirmed: bool = False
         self._last_was_idle: bool = True  # Track idle→playing transition
+        # Health-loop delays and IPC/process timeouts go through these so
+        # tests can skip or force them
+        self._sleep = asyncio.sleep
+        self._wait_for = asyncio.wait_for
 
     def _drm_mode(self) -> str | None:
         """Parse config hdmi_resolution into mpv --drm-mode format.
@@ -228,7 +232,7 @@ class MpvManager:
         if self._process and self._process.returncode is None:
             self._process.terminate()
             try:
-                await asyncio.wait_for(self._process.wait(), timeout=5.0)
+                await self._wait_for(self._process.wait(), timeout=5.0)
             except asyncio.TimeoutError:
                 self._process.kill()
                 await self._process.wait()
@@ -491,7 +495,10 @@ class MpvManager:
         self._reader = None
         self._writer = None
         self._overlay_confirmed = False
-        # cancel all pending futures
+        self._cancel_pending()
+
+    def _cancel_pending(self) -> None:
+        """Cancel every request still waiting on an IPC reply."""
         for fut in self._pending.values():
             if not fut.done():
                 fut.cancel()
@@ -555,7 +562,7 @@ class MpvManager:
             self._writer.write(payload.encode())
             await self._writer.drain()
         try:
-            return await asyncio.wait_for(fut, timeout=timeout)
+            return await self._wait_for(fut, timeout=timeout)
         except asyncio.TimeoutError:
             self._pending.pop(rid, None)
             raise
@@ -569,98 +576,102 @@ class MpvManager:
         """Monitor mpv subprocess health, auto-restart on failure."""
         try:
             while not self._stopping:
-                await asyncio.sleep(5)
+                await self._sleep(5)
                 if self._stopping:
                     break
-                if not self.is_alive_sync():
-                    log.warning("mpv process died — restarting in %.0fs", self._restart_backoff)
-                    await asyncio.sleep(self._restart_backoff)
-                    if self._stopping:
-                        break
-                    self._restart_backoff = min(self._restart_backoff * 2, 60.0)
-                    await self._disconnect_ipc()
-                    await self.start()
-                    continue
-                # Stream health check — also serves as IPC liveness test.
-                # If get_status() succeeds, mpv is responsive (no separate
-                # ping needed).  Only fall back to a dedicated IPC ping +
-                # restart when get_status() raises.
-                try:
-                    status = await asyncio.wait_for(
-                        self.get_status(), timeout=10.0,
-                    )
-                except Exception:
-                    # get_status failed — mpv IPC may be unresponsive
-                    log.warning("mpv IPC unresponsive — killing and restarting")
-                    if self._process and self._process.returncode is None:
-                        self._process.kill()
-                        await self._process.wait()
-                    await self._disconnect_ipc()
-                    await asyncio.sleep(self._restart_backoff)
-                    if self._stopping:
-                        break
-                    self._restart_backoff = min(self._restart_backoff * 2, 60.0)
-                    await self.start()
-                    continue
+                await self._health_tick()
+        except asyncio.CancelledError:
+            return
 
-                if status.get("idle"):
-                    self._last_was_idle = True
-                    # Build enhanced idle overlay
-                    try:
-                        net = await asyncio.get_event_loop().run_in_executor(
-                            None, _get_network_info,
+    async def _health_tick(self) -> None:
+        """Run one health check (the body of _health_loop)."""
+        if not self.is_alive_sync():
+            log.warning("mpv process died — restarting in %.0fs", self._restart_backoff)
+            await self._sleep(self._restart_backoff)
+            if self._stopping:
+                return
+            self._restart_backoff = min(self._restart_backoff * 2, 60.0)
+            await self._disconnect_ipc()
+            await self.start()
+            return
+        # Stream health check — also serves as IPC liveness test.
+        # If get_status() succeeds, mpv is responsive (no separate
+        # ping needed).  Only fall back to a dedicated IPC ping +
+        # restart when get_status() raises.
+        try:
+            status = await self._wait_for(
+                self.get_status(), timeout=10.0,
+            )
+        except Exception:
+            # get_status failed — mpv IPC may be unresponsive
+            log.warning("mpv IPC unresponsive — killing and restarting")
+            if self._process and self._process.returncode is None:
+                self._process.kill()
+                await self._process.wait()
+            await self._disconnect_ipc()
+            await self._sleep(self._restart_backoff)
+            if self._stopping:
+                return
+            self._restart_backoff = min(self._restart_backoff * 2, 60.0)
+            await self.start()
+            return
+
+        if status.get("idle"):
+            self._last_was_idle = True
+            # Build enhanced idle overlay
+            try:
+                net = await asyncio.get_event_loop().run_in_executor(
+                    None, _get_network_info,
+                )
+                ass = self._build_idle_overlay(net)
+                await self.set_overlay(IP_OVERLAY_ID, ass)
+
+                # Auto-retry on network change
+                conn_type = net.get("connection_type", "")
+                if (self._last_connection_type
+                        and conn_type != self._last_connection_type
+                        and conn_type not in ("none", "hotspot")):
+                    log.info("Network changed (%s -> %s), resetting stream retry",
+                             self._last_connection_type, conn_type)
+                    self.reset_stream_retry()
+                self._last_connection_type = conn_type
+            except Exception:
+                log.warning("Idle overlay push failed", exc_info=True)
+
+            if self._config.stream.url and not self._user_stopped:
+                # Stream not playing but we have a URL configured
+                now = time.monotonic()
+                if now - self._last_stream_attempt > self._stream_retry_backoff:
+                    self._stream_failures += 1
+                    # Failover: after N consecutive failures, try backup URL
+                    use_url = self._config.stream.url
+                    backup = self._config.stream.backup_url
+                    if (backup and self._stream_failures >= _FAILOVER_THRESHOLD
+                            and not self._using_backup):
+                        log.warning(
+                            "Stream failed %d times, switching to backup: %s",
+                            self._stream_failures, backup,
                         )
-                        ass = self._build_idle_overlay(net)
-                        await self.set_overlay(IP_OVERLAY_ID, ass)
-
-                        # Auto-retry on network change
-                        conn_type = net.get("connection_type", "")
-                        if (self._last_connection_type
-                                and conn_type != self._last_connection_type
-                                and conn_type not in ("none", "hotspot")):
-                            log.info("Network changed (%s -> %s), resetting stream retry",
-                                     self._last_connection_type, conn_type)
-                            self.reset_stream_retry()
-                        self._last_connection_type = conn_type
+                        use_url = backup
+                        self._using_backup = True
+                    elif self._using_backup and backup:
+                        use_url = backup
+                    log.info("Stream idle, attempting to reload: %s", use_url)
+                    self._last_stream_attempt = now
+                    try:
+                        await self.load_stream(use_url)
+                        # Increase backoff for next attempt (max 60s)
+                        self._stream_retry_backoff = min(self._stream_retry_backoff * 1.5, 60.0)
                     except Exception:
-                        log.warning("Idle overlay push failed", exc_info=True)
-
-                    if self._config.stream.url and not self._user_stopped:
-                        # Stream not playing but we have a URL configured
-                        now = time.monotonic()
-                        if now - self._last_stream_attempt > self._stream_retry_backoff:
-                            self._stream_failures += 1
-                            # Failover: after N consecutive failures, try backup URL
-                            use_url = self._config.stream.url
-                            backup = self._config.stream.backup_url
-                            if (backup and self._stream_failures >= _FAILOVER_THRESHOLD
-                                    and not self._using_backup):
-                                log.warning(
-                                    "Stream failed %d times, switching to backup: %s",
-                                    self._stream_failures, backup,
-                                )
-                                use_url = backup
-                                self._using_backup = True
-                            elif self._using_backup and backup:
-                                use_url = backup
-                            log.info("Stream idle, attempting to reload: %s", use_url)
-                            self._last_stream_attempt = now
-                            try:
-                                await self.load_stream(use_url)
-                                # Increase backoff for next attempt (max 60s)
-                                self._stream_retry_backoff = min(self._stream_retry_backoff * 1.5, 60.0)
-                            except Exception:
-                                log.debug("Stream reload failed, will retry", exc_info=True)
-                else:
-                    # Stream is playing — minimize IPC to avoid frame drops.
-                    # Remove idle overlay only on the idle→playing transition.
-                    if self._last_was_idle:
-                        try:
-                            await self.remove_overlay(IP_OVERLAY_ID)
-                        except Exception:
-                            pass
-                        self._last_was_idle = False
-                    self._stream_retry_backoff = 5.0
-                    self._stream_failures = 0
-        except asyncio.CancelledError:
-            return
+                        log.debug("Stream reload failed, will retry", exc_info=True)
+        else:
+            # Stream is playing — minimize IPC to avoid frame drops.
+            # Remove idle overlay only on the idle→playing transition.
+            if self._last_was_idle:
+                try:
+                    await self.remove_overlay(IP_OVERLAY_ID)
+                except Exception:
+                    pass
+                self._last_was_idle = False
+            self._stream_retry_backoff = 5.0
+            self._stream_failures = 0
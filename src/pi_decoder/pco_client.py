@@ -89,6 +89,8 @@ class PCOClient:
         # Circuit breaker: exponential backoff after consecutive failures
         self._consecutive_failures: int = 0
         self._backoff_until: float = 0.0  # monotonic time
+        # Circuit-breaker clock; tests swap it for a fixed one
+        self._clock = time.monotonic
 
     async def _get_client(self) -> httpx.AsyncClient:
         if self._client is None or self._client.is_closed:
@@ -184,7 +186,7 @@ class PCOClient:
             return status
 
         # Circuit breaker: skip poll if backing off
-        now = time.monotonic()
+        now = self._clock()
         if self._consecutive_failures >= _CB_THRESHOLD and now < self._backoff_until:
             return self._cached_status
 
@@ -222,7 +224,7 @@ class PCOClient:
         self._consecutive_failures += 1
         if self._consecutive_failures >= _CB_THRESHOLD:
             backoff = min(2 ** (self._consecutive_failures - _CB_THRESHOLD), _CB_MAX_BACKOFF)
-            self._backoff_until = time.monotonic() + backoff
+            self._backoff_until = self._clock() + backoff
             log.warning(
                 "PCO circuit breaker: %d consecutive failures, backing off %ds",
                 self._consecutive_failures, backoff,
@@ -498,8 +500,14 @@ class PCOClient:
         return None, None
 
     @staticmethod
-    def _upcoming_status(plan: dict, service_start: datetime | None = None) -> LiveStatus:
-        """Build a 'not yet live' status from a future plan."""
+    def _upcoming_status(
+        plan: dict, service_start: datetime | None = None,
+        now: datetime | None = None,
+    ) -> LiveStatus:
+        """Build a 'not yet live' status from a future plan.
+
+        ``now`` defaults to the current UTC time.
+        """
         title = plan["attributes"].get("title") or plan["attributes"].get("dates", "")
 
         # Prefer PlanTime starts_at (accurate), fall back to sort_date
@@ -511,7 +519,8 @@ class PCOClient:
         if service_start is None:
             return LiveStatus(message=f"Next: {title}", plan_title=title)
 
-        now = datetime.now(timezone.utc)
+        if now is None:
+            now = datetime.now(timezone.utc)
         if now >= service_start:
             # Start time passed but Live not started yet
             return LiveStatus(message="Not live", plan_title=title)
@@ -0,0 +1,41 @@
+"""Subprocess utilities — bounded concurrency for sudo helper commands."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+
+log = logging.getLogger(__name__)
+
+# Caps concurrent hostnamectl/tee launches when the web UI fires several
+# config saves back-to-back. Created unbound; asyncio binds it on first wait.
+_MAX_CONCURRENT = 2
+_sem = asyncio.Semaphore(_MAX_CONCURRENT)
+
+
+async def run_command(
+    *argv: str,
+    input: bytes | None = None,
+    timeout: float = 10,
+    capture_stdout: bool = True,
+) -> tuple[int | None, bytes, bytes]:
+    """Run a command to completion, returning (returncode, stdout, stderr).
+
+    At most two commands run at once across all callers. stdin is only
+    opened when ``input`` is given; stdout is discarded unless
+    ``capture_stdout``. Raises asyncio.TimeoutError if the command doesn't
+    finish within ``timeout`` seconds.
+
+    Commands are passed through as given (e.g. "sudo", "tee") rather than
+    resolved to absolute paths: sudoers rules match the configured command
+    path, so argv must stay exactly what deploy/sudoers-pi-decoder expects.
+    """
+    async with _sem:
+        proc = await asyncio.create_subprocess_exec(
+            *argv,
+            stdin=asyncio.subprocess.PIPE if input is not None else None,
+            stdout=asyncio.subprocess.PIPE if capture_stdout else asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        stdout, stderr = await asyncio.wait_for(proc.communicate(input=input), timeout=timeout)
+        return proc.returncode, stdout or b"", stderr or b""
@@ -15,6 +15,7 @@ from datetime import datetime, timezone
 from importlib.metadata import version as pkg_version
 from pathlib import Path
 
+import orjson
 import psutil
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Request, UploadFile, File
 from fastapi.responses import HTMLResponse, JSONResponse, Response
@@ -1060,7 +1061,9 @@ def create_app(
                     except Exception:
                         pass
 
-                await ws.send_json({
+                # orjson encodes straight to bytes; sent as a text frame
+                # like send_json() would
+                await ws.send_text(orjson.dumps({
                     "name": config.general.name,
                     "hostname": socket.gethostname(),
                     "mpv": mpv_status,
@@ -1068,7 +1071,7 @@ def create_app(
                     "system": await asyncio.to_thread(_system_info),
                     "network": network_info,
                     "cec": {"available": cec_avail, "power": cec_status},
-                })
+                }).decode())
                 await asyncio.sleep(2)
         except WebSocketDisconnect:
             pass
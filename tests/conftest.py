@@ -8,19 +8,19 @@ from pathlib import Path
 from pi_decoder.config import Config
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def project_root() -> Path:
     """Return the project root directory."""
     return Path(__file__).parent.parent
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def deploy_dir(project_root: Path) -> Path:
     """Return the deploy directory."""
     return project_root / "deploy"
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def pigen_dir(deploy_dir: Path) -> Path:
     """Return the pi-gen directory."""
     return deploy_dir / "pi-gen"
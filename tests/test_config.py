@@ -178,6 +178,18 @@ wifi_timeout = 30
         assert cfg.network.ethernet_timeout == 15
         assert cfg.network.wifi_timeout == 30
 
+    def test_load_bad_value_logs_field_path(self, tmp_config: Path, caplog):
+        """An uncoercible value falls back to defaults and names the field."""
+        tmp_config.write_text("""
+[stream]
+url = "http://test.local/stream"
+network_caching = "lots"
+""")
+        cfg = load_config(tmp_config)
+        assert cfg.stream.url == ""
+        assert cfg.stream.network_caching == 2000
+        assert "stream.network_caching" in caplog.text
+
 
 class TestConfigValidation:
     """Test configuration value validation."""
@@ -302,6 +314,13 @@ hdmi_resolution = "1920x1080@120D"
         cfg = load_config(tmp_config)
         assert cfg.display.hdmi_resolution == "1920x1080@30D"
 
+    def test_oversized_hdmi_resolution_digits_defaults(self):
+        """Absurdly long dimensions are rejected before any int() conversion."""
+        cfg = Config()
+        cfg.display.hdmi_resolution = "9" * 5000 + "x1080@30D"
+        validate_config(cfg)
+        assert cfg.display.hdmi_resolution == "1920x1080@30D"
+
     def test_valid_hdmi_resolution_preserved(self, tmp_config: Path):
         """Valid hdmi_resolution values should be preserved."""
         tmp_config.write_text("""
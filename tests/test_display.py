@@ -1,7 +1,6 @@
 """Tests for the display module — HDMI resolution management."""
 
 import asyncio
-import platform
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -21,19 +20,19 @@ from pi_decoder.display import (
 
 
 class TestGetAvailableModes:
-    @patch("platform.system", return_value="Darwin")
-    def test_fallback_on_non_linux(self, _mock):
+    @patch("pi_decoder.display._IS_LINUX", False)
+    def test_fallback_on_non_linux(self):
         modes = get_available_modes()
         assert modes == _FALLBACK_MODES
 
-    @patch("platform.system", return_value="Linux")
-    def test_fallback_on_missing_sysfs(self, _mock):
+    @patch("pi_decoder.display._IS_LINUX", True)
+    def test_fallback_on_missing_sysfs(self):
         with patch("glob.glob", return_value=[]):
             modes = get_available_modes()
         assert modes == _FALLBACK_MODES
 
-    @patch("platform.system", return_value="Linux")
-    def test_reads_modes_from_sysfs(self, _mock, tmp_path):
+    @patch("pi_decoder.display._IS_LINUX", True)
+    def test_reads_modes_from_sysfs(self, tmp_path):
         modes_file = tmp_path / "modes"
         modes_file.write_text("1920x1080\n1280x720\n720x480\n")
 
@@ -44,8 +43,8 @@ class TestGetAvailableModes:
         assert "1280x720" in modes
         assert "720x480" in modes
 
-    @patch("platform.system", return_value="Linux")
-    def test_deduplicates_modes(self, _mock, tmp_path):
+    @patch("pi_decoder.display._IS_LINUX", True)
+    def test_deduplicates_modes(self, tmp_path):
         modes_file = tmp_path / "modes"
         modes_file.write_text("1920x1080\n1920x1080\n1280x720\n")
 
@@ -54,8 +53,8 @@ class TestGetAvailableModes:
 
         assert modes.count("1920x1080") == 1
 
-    @patch("platform.system", return_value="Linux")
-    def test_strips_interlace_suffix(self, _mock, tmp_path):
+    @patch("pi_decoder.display._IS_LINUX", True)
+    def test_strips_interlace_suffix(self, tmp_path):
         modes_file = tmp_path / "modes"
         modes_file.write_text("1920x1080i\n1280x720p\n")
 
@@ -65,6 +64,19 @@ class TestGetAvailableModes:
         assert "1920x1080" in modes
         assert "1280x720" in modes
 
+    @patch("pi_decoder.display._IS_LINUX", True)
+    def test_merges_multiple_connectors_in_order(self, tmp_path):
+        first = tmp_path / "card0-modes"
+        first.write_text("1920x1080\n1280x720\n")
+        second = tmp_path / "card1-modes"
+        second.write_text("3840x2160\n1920x1080\n")
+        missing = tmp_path / "card2-modes"
+
+        with patch("glob.glob", return_value=[str(first), str(second), str(missing)]):
+            modes = get_available_modes()
+
+        assert modes == ["1920x1080", "1280x720", "3840x2160"]
+
 
 class TestGetPiModel:
     def test_detects_pi5(self, tmp_path):
@@ -149,21 +161,34 @@ class TestGetCurrentResolution:
 
         assert result == "1280x720@50D"
 
+    @pytest.mark.parametrize("content,expected", [
+        ("console=tty1 video=HDMI-A-1: quiet", ""),
+        ("video=HDMI-A-1: x video=HDMI-A-1:720x480", "720x480"),
+    ])
+    def test_skips_empty_video_value(self, tmp_path, content, expected):
+        cmdline = tmp_path / "cmdline.txt"
+        cmdline.write_text(content)
+
+        with patch("pi_decoder.display._find_cmdline_path", return_value=cmdline):
+            result = get_current_resolution()
+
+        assert result == expected
+
 
 class TestSetDisplayResolution:
-    @patch("platform.system", return_value="Darwin")
-    async def test_skips_on_non_linux(self, _mock):
+    @patch("pi_decoder.display._IS_LINUX", False)
+    async def test_skips_on_non_linux(self):
         # Should not raise
         await set_display_resolution("1920x1080@60D")
 
-    @patch("platform.system", return_value="Linux")
-    async def test_raises_when_no_cmdline(self, _mock):
+    @patch("pi_decoder.display._IS_LINUX", True)
+    async def test_raises_when_no_cmdline(self):
         with patch("pi_decoder.display._find_cmdline_path", return_value=None):
             with pytest.raises(FileNotFoundError):
                 await set_display_resolution("1920x1080@60D")
 
-    @patch("platform.system", return_value="Linux")
-    async def test_writes_new_resolution(self, _mock, tmp_path):
+    @patch("pi_decoder.display._IS_LINUX", True)
+    async def test_writes_new_resolution(self, tmp_path):
         cmdline = tmp_path / "cmdline.txt"
         cmdline.write_text("console=tty1 video=HDMI-A-1:1920x1080@60D root=/dev/mmcblk0p2")
 
@@ -183,8 +208,8 @@ class TestSetDisplayResolution:
         assert "video=HDMI-A-1:1280x720@50D" in content
         assert "video=HDMI-A-1:1920x1080@60D" not in content
 
-    @patch("platform.system", return_value="Linux")
-    async def test_adds_resolution_when_none_existed(self, _mock, tmp_path):
+    @patch("pi_decoder.display._IS_LINUX", True)
+    async def test_adds_resolution_when_none_existed(self, tmp_path):
         cmdline = tmp_path / "cmdline.txt"
         cmdline.write_text("console=tty1 root=/dev/mmcblk0p2")
 
@@ -207,17 +232,17 @@ class TestSetDisplayResolution:
 
 
 class TestFindDrmStatusPath:
-    @patch("platform.system", return_value="Darwin")
-    def test_returns_none_on_non_linux(self, _mock):
+    @patch("pi_decoder.display._IS_LINUX", False)
+    def test_returns_none_on_non_linux(self):
         assert _find_drm_status_path() is None
 
-    @patch("platform.system", return_value="Linux")
-    def test_returns_none_when_no_connectors(self, _mock):
+    @patch("pi_decoder.display._IS_LINUX", True)
+    def test_returns_none_when_no_connectors(self):
         with patch("glob.glob", return_value=[]):
             assert _find_drm_status_path() is None
 
-    @patch("platform.system", return_value="Linux")
-    def test_returns_first_connector(self, _mock):
+    @patch("pi_decoder.display._IS_LINUX", True)
+    def test_returns_first_connector(self):
         paths = [
             "/sys/class/drm/card1-HDMI-A-1/status",
             "/sys/class/drm/card0-HDMI-A-1/status",
@@ -5,7 +5,7 @@ from unittest.mock import AsyncMock, patch, MagicMock
 
 import pytest
 
-from pi_decoder.hostname import sanitize_hostname, set_hostname
+from pi_decoder.hostname import _rewrite_hosts, sanitize_hostname, set_hostname
 
 
 # ── sanitize_hostname tests ──────────────────────────────────────────
@@ -58,6 +58,25 @@ class TestSanitizeHostname:
         assert sanitize_hostname("my-decoder") == "my-decoder"
 
 
+# ── _rewrite_hosts tests ─────────────────────────────────────────────
+
+
+class TestRewriteHosts:
+    def test_replaces_loopback_line(self):
+        hosts = "127.0.0.1\tlocalhost\n127.0.1.1\told-name\n::1\tlocalhost\n"
+        assert _rewrite_hosts(hosts, "sanctuary") == (
+            "127.0.0.1\tlocalhost\n127.0.1.1\tsanctuary\n::1\tlocalhost\n"
+        )
+
+    def test_appends_when_missing(self):
+        hosts = "127.0.0.1\tlocalhost"
+        assert _rewrite_hosts(hosts, "sanctuary") == "127.0.0.1\tlocalhost\n127.0.1.1\tsanctuary\n"
+
+    def test_ignores_similar_addresses(self):
+        hosts = "127.0.1.10\tother\n"
+        assert _rewrite_hosts(hosts, "sanctuary") == "127.0.1.10\tother\n127.0.1.1\tsanctuary\n"
+
+
 # ── set_hostname tests ───────────────────────────────────────────────
 
 
@@ -65,17 +84,15 @@ class TestSetHostname:
     @pytest.mark.asyncio
     async def test_returns_sanitized_hostname(self):
         """set_hostname always returns the sanitized hostname."""
-        with patch("pi_decoder.hostname.platform") as mock_platform:
-            mock_platform.system.return_value = "Darwin"
+        with patch("pi_decoder.hostname._IS_LINUX", False):
             result = await set_hostname("Overflow Room")
             assert result == "overflow-room"
 
     @pytest.mark.asyncio
     async def test_skips_on_non_linux(self):
         """On non-Linux, logs debug and returns without running commands."""
-        with patch("pi_decoder.hostname.platform") as mock_platform, \
+        with patch("pi_decoder.hostname._IS_LINUX", False), \
              patch("pi_decoder.hostname.asyncio.create_subprocess_exec") as mock_exec:
-            mock_platform.system.return_value = "Darwin"
             result = await set_hostname("Test")
             assert result == "test"
             mock_exec.assert_not_called()
@@ -87,9 +104,8 @@ class TestSetHostname:
         mock_proc.communicate = AsyncMock(return_value=(b"", b""))
         mock_proc.returncode = 0
 
-        with patch("pi_decoder.hostname.platform") as mock_platform, \
+        with patch("pi_decoder.hostname._IS_LINUX", True), \
              patch("pi_decoder.hostname.asyncio.create_subprocess_exec", return_value=mock_proc) as mock_exec:
-            mock_platform.system.return_value = "Linux"
             result = await set_hostname("Sanctuary")
             assert result == "sanctuary"
             # First call should be hostnamectl
@@ -104,10 +120,9 @@ class TestSetHostname:
         mock_proc.returncode = 0
 
         mock_hosts = "127.0.0.1\tlocalhost\n127.0.1.1\told-hostname\n"
-        with patch("pi_decoder.hostname.platform") as mock_platform, \
+        with patch("pi_decoder.hostname._IS_LINUX", True), \
              patch("pi_decoder.hostname.asyncio.create_subprocess_exec", return_value=mock_proc) as mock_exec, \
              patch("pi_decoder.hostname.Path") as mock_path_cls:
-            mock_platform.system.return_value = "Linux"
             mock_path_cls.return_value.read_text.return_value = mock_hosts
             await set_hostname("Sanctuary")
             # Should have two calls: hostnamectl and tee
@@ -123,10 +138,9 @@ class TestSetHostname:
         mock_proc.communicate = AsyncMock(return_value=(b"", b"permission denied"))
         mock_proc.returncode = 1
 
-        with patch("pi_decoder.hostname.platform") as mock_platform, \
+        with patch("pi_decoder.hostname._IS_LINUX", True), \
              patch("pi_decoder.hostname.asyncio.create_subprocess_exec", return_value=mock_proc), \
              patch("pi_decoder.hostname.log") as mock_log:
-            mock_platform.system.return_value = "Linux"
             result = await set_hostname("Test")
             assert result == "test"
             mock_log.warning.assert_called()
@@ -137,10 +151,9 @@ class TestSetHostname:
         mock_proc = AsyncMock()
         mock_proc.communicate = AsyncMock(side_effect=asyncio.TimeoutError)
 
-        with patch("pi_decoder.hostname.platform") as mock_platform, \
+        with patch("pi_decoder.hostname._IS_LINUX", True), \
              patch("pi_decoder.hostname.asyncio.create_subprocess_exec", return_value=mock_proc), \
              patch("pi_decoder.hostname.log") as mock_log:
-            mock_platform.system.return_value = "Linux"
             result = await set_hostname("Test")
             assert result == "test"
             mock_log.warning.assert_called()
@@ -148,10 +161,9 @@ class TestSetHostname:
     @pytest.mark.asyncio
     async def test_exception_logs_warning_no_raise(self):
         """If subprocess creation fails entirely, logs warning but doesn't raise."""
-        with patch("pi_decoder.hostname.platform") as mock_platform, \
+        with patch("pi_decoder.hostname._IS_LINUX", True), \
              patch("pi_decoder.hostname.asyncio.create_subprocess_exec", side_effect=FileNotFoundError("hostnamectl")), \
              patch("pi_decoder.hostname.log") as mock_log:
-            mock_platform.system.return_value = "Linux"
             result = await set_hostname("Test")
             assert result == "test"
             mock_log.warning.assert_called()
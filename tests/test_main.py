@@ -1,77 +1,128 @@
 """Tests for main entry point."""
 
 import asyncio
-from unittest.mock import AsyncMock, MagicMock, patch
+import logging
+from contextlib import ExitStack
+from unittest.mock import DEFAULT, AsyncMock, MagicMock, create_autospec, patch
 
 import pytest
+import pytest_asyncio
+import uvicorn
 
 from pi_decoder.config import Config
+from pi_decoder.main import async_main, run
+from pi_decoder.mpv_manager import MpvManager
+from pi_decoder.overlay import OverlayUpdater
+from pi_decoder.pco_client import PCOClient
 
 
 class TestRun:
     """Test the run() entry point."""
 
-    @patch("pi_decoder.main.asyncio.run")
+    @patch("pi_decoder.main._asyncio_run")
     def test_run_calls_asyncio_run(self, mock_arun):
-        from pi_decoder.main import run
         run()
         mock_arun.assert_called_once()
 
-    @patch("pi_decoder.main.asyncio.run", side_effect=KeyboardInterrupt)
+    @patch("pi_decoder.main._asyncio_run", side_effect=KeyboardInterrupt)
     def test_run_handles_keyboard_interrupt(self, mock_arun):
-        from pi_decoder.main import run
         # Should not raise
         run()
 
 
+def _make_base_cfg() -> Config:
+    cfg = Config()
+    cfg.general.name = "test-decoder"
+    cfg.stream.url = "rtmp://test/live"
+    cfg.overlay.enabled = False
+    return cfg
+
+
+# Patched in with new= and reset by mock_deps, so no AsyncMock is built per start()
+_SET_HOSTNAME_MOCK = AsyncMock()
+_CEC_POWER_ON_MOCK = AsyncMock()
+_CEC_ACTIVE_SOURCE_MOCK = AsyncMock()
+
+
+@pytest.fixture(scope="module")
+def _patched_main(tmp_path_factory):
+    """Patch all heavy dependencies for async_main once per module."""
+    config_path = str(tmp_path_factory.mktemp("cfg") / "config.toml")
+    main_patch = patch.multiple(
+        "pi_decoder.main",
+        load_config=DEFAULT,
+        MpvManager=DEFAULT,
+        PCOClient=DEFAULT,
+        OverlayUpdater=DEFAULT,
+        create_app=DEFAULT,
+        uvicorn=DEFAULT,
+        CONFIG_PATH=config_path,
+    )
+    patches = {
+        "set_hostname": patch("pi_decoder.hostname.set_hostname", new=_SET_HOSTNAME_MOCK),
+        "cec_power_on": patch("pi_decoder.cec.power_on", new=_CEC_POWER_ON_MOCK),
+        "cec_active_source": patch("pi_decoder.cec.active_source", new=_CEC_ACTIVE_SOURCE_MOCK),
+    }
+    with ExitStack() as stack:
+        main = stack.enter_context(main_patch)
+        mocks = {name: stack.enter_context(p) for name, p in patches.items()}
+        mocks.update(
+            load_config=main["load_config"],
+            mpv_cls=main["MpvManager"],
+            pco_cls=main["PCOClient"],
+            overlay_cls=main["OverlayUpdater"],
+            create_app=main["create_app"],
+            uvicorn_config=main["uvicorn"].Config,
+            uvicorn_server=main["uvicorn"].Server,
+        )
+        yield mocks
+
+
+@pytest.mark.xdist_group("async_main")
+@pytest.mark.asyncio(loop_scope="module")
 class TestAsyncMain:
     """Test async_main startup sequence with mocked components."""
 
+    @pytest_asyncio.fixture(autouse=True, loop_scope="module")
+    async def _no_loop_blocking(self, caplog):
+        """Fail if any callback blocks the event loop (e.g. stray sync I/O).
+
+        Uses asyncio debug mode, which logs every callback that runs longer
+        than slow_callback_duration.
+        """
+        loop = asyncio.get_running_loop()
+        prev_debug, prev_slow = loop.get_debug(), loop.slow_callback_duration
+        loop.set_debug(True)
+        loop.slow_callback_duration = 0.05
+        with caplog.at_level(logging.WARNING, logger="asyncio"):
+            yield
+        loop.set_debug(prev_debug)
+        loop.slow_callback_duration = prev_slow
+        blocked = [
+            r.getMessage() for r in caplog.get_records("call")
+            if r.name == "asyncio" and r.getMessage().startswith("Executing")
+        ]
+        assert not blocked, f"Event loop blocked: {blocked}"
+
     @pytest.fixture
-    def mock_deps(self, tmp_path):
-        """Patch all heavy dependencies for async_main."""
-        config_path = str(tmp_path / "config.toml")
-        cfg = Config()
-        cfg.general.name = "test-decoder"
-        cfg.stream.url = "rtmp://test/live"
-        cfg.overlay.enabled = False
-
-        patches = {
-            "load_config": patch("pi_decoder.main.load_config", return_value=cfg),
-            "mpv_cls": patch("pi_decoder.main.MpvManager"),
-            "pco_cls": patch("pi_decoder.main.PCOClient"),
-            "overlay_cls": patch("pi_decoder.main.OverlayUpdater"),
-            "create_app": patch("pi_decoder.main.create_app"),
-            "uvicorn_config": patch("pi_decoder.main.uvicorn.Config"),
-            "uvicorn_server": patch("pi_decoder.main.uvicorn.Server"),
-            "set_hostname": patch("pi_decoder.hostname.set_hostname", new_callable=AsyncMock, return_value="test-decoder"),
-            "sanitize": patch("pi_decoder.hostname.sanitize_hostname", return_value="test-decoder"),
-            "config_path": patch("pi_decoder.main.CONFIG_PATH", config_path),
-            "gethostname": patch("pi_decoder.main.socket.gethostname", return_value="old-name"),
-            "cec_power_on": patch("pi_decoder.cec.power_on", new_callable=AsyncMock),
-            "cec_active_source": patch("pi_decoder.cec.active_source", new_callable=AsyncMock),
-        }
-        mocks = {}
-        for name, p in patches.items():
-            mocks[name] = p.start()
-
-        # Configure MpvManager mock
-        mock_mpv = MagicMock()
-        mock_mpv.start = AsyncMock()
-        mock_mpv.stop = AsyncMock()
+    def mock_deps(self, _patched_main):
+        """Reset the shared patches and wire fresh return values per test."""
+        mocks = dict(_patched_main)
+        for m in mocks.values():
+            if isinstance(m, (MagicMock, AsyncMock)):
+                m.reset_mock(return_value=True, side_effect=True)
+
+        cfg = _make_base_cfg()
+        mocks["load_config"].return_value = cfg
+        mocks["set_hostname"].return_value = "test-decoder"
+
+        # Spec'd instances: async methods are AsyncMocks, and calls that
+        # don't match the real signatures fail
+        mock_mpv = create_autospec(MpvManager, instance=True)
         mocks["mpv_cls"].return_value = mock_mpv
         mocks["mock_mpv"] = mock_mpv
-
-        # Configure PCOClient mock
-        mock_pco = MagicMock()
-        mock_pco.close = AsyncMock()
-        mocks["pco_cls"].return_value = mock_pco
-
-        # Configure OverlayUpdater mock
-        mock_overlay = MagicMock()
-        mock_overlay.stop = AsyncMock()
-        mock_overlay.start_task = MagicMock()
-        mocks["overlay_cls"].return_value = mock_overlay
+        mocks["pco_cls"].return_value = create_autospec(PCOClient, instance=True)
+        mocks["overlay_cls"].return_value = create_autospec(OverlayUpdater, instance=True)
 
         # Configure create_app mock to expose _get_overlay/_get_pco accessors
         mock_app = MagicMock()
@@ -80,84 +131,68 @@ class TestAsyncMain:
         mocks["create_app"].return_value = mock_app
 
         # Configure uvicorn server mock to exit immediately
-        mock_server = MagicMock()
-        mock_server.serve = AsyncMock()
+        mock_server = create_autospec(uvicorn.Server, instance=True)
         mock_server.should_exit = False
         mocks["uvicorn_server"].return_value = mock_server
         mocks["mock_server"] = mock_server
 
         mocks["config"] = cfg
 
-        yield mocks
-
-        for p in patches.values():
-            p.stop()
+        return mocks
 
-    @pytest.mark.asyncio
-    async def test_startup_loads_config(self, mock_deps):
-        from pi_decoder.main import async_main
+    async def test_startup_sequence(self, mock_deps):
+        """Default config: one async_main run checked against every mock."""
         await async_main()
         mock_deps["load_config"].assert_called_once()
-
-    @pytest.mark.asyncio
-    async def test_startup_starts_mpv(self, mock_deps):
-        from pi_decoder.main import async_main
-        await async_main()
         mock_deps["mock_mpv"].start.assert_awaited_once()
-
-    @pytest.mark.asyncio
-    async def test_startup_stops_mpv_on_shutdown(self, mock_deps):
-        from pi_decoder.main import async_main
-        await async_main()
-        mock_deps["mock_mpv"].stop.assert_awaited_once()
-
-    @pytest.mark.asyncio
-    async def test_startup_creates_app(self, mock_deps):
-        from pi_decoder.main import async_main
-        await async_main()
         mock_deps["create_app"].assert_called_once()
-
-    @pytest.mark.asyncio
-    async def test_overlay_not_created_when_disabled(self, mock_deps):
-        mock_deps["config"].overlay.enabled = False
-        from pi_decoder.main import async_main
-        await async_main()
+        mock_deps["mock_server"].serve.assert_awaited_once()
+        mock_deps["mock_mpv"].stop.assert_awaited_once()
         mock_deps["overlay_cls"].assert_not_called()
-
-    @pytest.mark.asyncio
-    async def test_overlay_created_when_enabled_with_credentials(self, mock_deps):
-        mock_deps["config"].overlay.enabled = True
-        mock_deps["config"].pco.app_id = "test_app"
-        mock_deps["config"].pco.secret = "test_secret"
+        mock_deps["pco_cls"].assert_not_called()
+
+    @pytest.mark.parametrize("enabled,app_id,expect_pco,expect_overlay", [
+        (False, "test_app", False, False),
+        (True, "test_app", True, True),
+        # PCO client still created for web UI testing, but no overlay
+        (True, "", True, False),
+    ])
+    async def test_overlay_and_pco_creation(self, mock_deps, enabled, app_id, expect_pco, expect_overlay):
+        mock_deps["config"].overlay.enabled = enabled
+        mock_deps["config"].pco.app_id = app_id
+        mock_deps["config"].pco.secret = "test_secret" if app_id else ""
         mock_overlay = mock_deps["overlay_cls"].return_value
         mock_pco = mock_deps["pco_cls"].return_value
         # Shutdown reads overlay/pco from app accessors
-        mock_deps["create_app"].return_value._get_overlay.return_value = mock_overlay
-        mock_deps["create_app"].return_value._get_pco.return_value = mock_pco
-        from pi_decoder.main import async_main
-        await async_main()
-        mock_deps["overlay_cls"].assert_called_once()
+        app = mock_deps["create_app"].return_value
+        app._get_overlay.return_value = mock_overlay if expect_overlay else None
+        app._get_pco.return_value = mock_pco if expect_pco else None
 
-    @pytest.mark.asyncio
-    async def test_pco_created_without_overlay_when_no_credentials(self, mock_deps):
-        mock_deps["config"].overlay.enabled = True
-        mock_deps["config"].pco.app_id = ""
-        from pi_decoder.main import async_main
         await async_main()
-        # PCO client created for web UI testing, but overlay not created
-        mock_deps["pco_cls"].assert_called_once()
-        mock_deps["overlay_cls"].assert_not_called()
 
-    @pytest.mark.asyncio
-    async def test_hostname_sync_when_mismatch(self, mock_deps):
-        # gethostname returns "old-name" by default, sanitize returns "test-decoder"
-        from pi_decoder.main import async_main
-        await async_main()
-        mock_deps["set_hostname"].assert_awaited()
+        assert mock_deps["pco_cls"].call_count == int(expect_pco)
+        assert mock_deps["overlay_cls"].call_count == int(expect_overlay)
+        if expect_overlay:
+            mock_overlay.start_task.assert_called_once()
+            mock_overlay.stop.assert_awaited_once()
+        if expect_pco:
+            mock_pco.close.assert_awaited_once()
 
-    @pytest.mark.asyncio
-    async def test_hostname_no_sync_when_matches(self, mock_deps):
-        mock_deps["gethostname"].return_value = "test-decoder"
-        from pi_decoder.main import async_main
+    @pytest.fixture
+    def mock_hostname_env(self):
+        """Stub the current system hostname seen by async_main."""
+        with patch("pi_decoder.main.socket") as mock_socket:
+            yield mock_socket
+
+    @pytest.mark.parametrize("name,current,should_sync", [
+        ("Test Decoder", "old-name", True),
+        ("Test Decoder", "test-decoder", False),
+    ])
+    async def test_hostname_sync(self, mock_deps, mock_hostname_env, name, current, should_sync):
+        mock_deps["config"].general.name = name
+        mock_hostname_env.gethostname.return_value = current
         await async_main()
-        mock_deps["set_hostname"].assert_not_awaited()
+        if should_sync:
+            mock_deps["set_hostname"].assert_awaited_once_with(name)
+        else:
+            mock_deps["set_hostname"].assert_not_awaited()
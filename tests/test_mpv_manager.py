@@ -2,7 +2,9 @@
 
 import asyncio
 import json
+import socket
 import time
+from types import MappingProxyType, SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -28,39 +30,144 @@ def _make_manager(config: Config | None = None) -> MpvManager:
     return MpvManager(config or _make_config())
 
 
-def _attach_mock_writer(mgr: MpvManager) -> MagicMock:
-    """Attach a mock writer to the manager and return it."""
-    writer = MagicMock()
-    writer.write = MagicMock()
-    writer.drain = AsyncMock()
-    writer.close = MagicMock()
-    writer.wait_closed = AsyncMock()
+class _WriterStub:
+    """Stand-in for asyncio.StreamWriter that records each payload written.
+
+    If *close_exc* is given, close() raises it.
+    """
+
+    __slots__ = (
+        "written", "drain_count", "close_count", "wait_closed_count",
+        "_on_write", "_close_exc",
+    )
+
+    def __init__(self, on_write=None, close_exc: Exception | None = None) -> None:
+        self.written: list[bytes] = []
+        self.drain_count = 0
+        self.close_count = 0
+        self.wait_closed_count = 0
+        self._on_write = on_write
+        self._close_exc = close_exc
+
+    def write(self, data: bytes) -> None:
+        self.written.append(data)
+        if self._on_write is not None:
+            self._on_write(data)
+
+    async def drain(self) -> None:
+        self.drain_count += 1
+
+    def close(self) -> None:
+        self.close_count += 1
+        if self._close_exc is not None:
+            raise self._close_exc
+
+    async def wait_closed(self) -> None:
+        self.wait_closed_count += 1
+
+
+class _ProcStub:
+    """Stand-in for asyncio.subprocess.Process that counts terminate/kill calls."""
+
+    __slots__ = ("returncode", "terminate_count", "kill_count")
+
+    def __init__(self, returncode: int | None = None) -> None:
+        self.returncode = returncode
+        self.terminate_count = 0
+        self.kill_count = 0
+
+    def terminate(self) -> None:
+        self.terminate_count += 1
+
+    def kill(self) -> None:
+        self.kill_count += 1
+
+    async def wait(self) -> int | None:
+        return self.returncode
+
+
+async def _timeout_now(aw, timeout):
+    """Stand-in for MpvManager._wait_for that times out immediately."""
+    if asyncio.iscoroutine(aw):
+        aw.close()
+    raise asyncio.TimeoutError
+
+
+_NO_REPLY = object()
+
+
+def _attach_mock_writer(mgr: MpvManager, reply=_NO_REPLY) -> _WriterStub:
+    """Attach a stub writer to the manager and return it.
+
+    If *reply* is given, every write resolves the pending request on the
+    spot with it (or fails it, if *reply* is an exception), standing in for
+    the IPC reader so no resolver task or sleep is needed.
+    """
+    on_write = None
+    if reply is not _NO_REPLY:
+        def on_write(payload: bytes) -> None:
+            fut = mgr._pending[mgr._request_id]
+            if isinstance(reply, BaseException):
+                fut.set_exception(reply)
+            else:
+                fut.set_result(reply)
+
+    writer = _WriterStub(on_write)
     mgr._writer = writer
     return writer
 
 
-def _attach_mock_process(mgr: MpvManager, alive: bool = True) -> MagicMock:
-    """Attach a mock subprocess to the manager and return it."""
-    proc = MagicMock()
-    proc.returncode = None if alive else 1
-    proc.terminate = MagicMock()
-    proc.kill = MagicMock()
-    proc.wait = AsyncMock()
+def _attach_mock_process(mgr: MpvManager, alive: bool = True) -> _ProcStub:
+    """Attach a stub subprocess to the manager and return it."""
+    proc = _ProcStub(None if alive else 1)
     mgr._process = proc
     return proc
 
 
+@pytest.fixture(params=[True, False], ids=["alive", "dead"])
+def mgr_with_proc(request):
+    """A manager with a stub process attached, once running and once exited.
+
+    Returns ``(mgr, proc, alive)``.
+    """
+    mgr = _make_manager()
+    proc = _attach_mock_process(mgr, alive=request.param)
+    return mgr, proc, request.param
+
+
+def _no_task(coro):
+    """create_task stand-in: drop the coroutine and return a never-done task."""
+    coro.close()
+    return SimpleNamespace(done=lambda: False)
+
+
+@pytest.fixture
+def start_env(monkeypatch):
+    """Fake everything MpvManager.start() touches outside the manager.
+
+    The subprocess, IPC socket path and sleeps are stubbed, and create_task
+    never schedules the stderr drain or health loop. ``start_env.exec``
+    records the mpv argv; ``start_env.proc`` is the process it returns.
+    """
+    proc = MagicMock()
+    proc.returncode = None
+    mock_exec = AsyncMock(return_value=proc)
+    mock_path = MagicMock()
+    mock_path.return_value.exists.return_value = True
+    monkeypatch.setattr("asyncio.create_subprocess_exec", mock_exec)
+    monkeypatch.setattr("pi_decoder.mpv_manager.Path", mock_path)
+    monkeypatch.setattr("asyncio.sleep", AsyncMock())
+    monkeypatch.setattr("asyncio.create_task", _no_task)
+    return SimpleNamespace(exec=mock_exec, proc=proc, path=mock_path)
+
+
 # ── Constants ────────────────────────────────────────────────────────────────
 
 
 class TestConstants:
-    def test_ipc_socket_path(self):
+    def test_constants(self):
         assert IPC_SOCKET == "/tmp/mpv-pi-decoder.sock"
-
-    def test_screenshot_path(self):
         assert SCREENSHOT_PATH == "/tmp/mpv-preview.jpg"
-
-    def test_ip_overlay_id(self):
         assert IP_OVERLAY_ID == 63
 
 
@@ -98,47 +205,30 @@ class TestSend:
 
     async def test_send_writes_json_and_waits(self):
         mgr = _make_manager()
-        writer = _attach_mock_writer(mgr)
+        writer = _attach_mock_writer(mgr, reply="ok")
 
-        async def _resolve():
-            """Simulate IPC reader resolving the future after a tiny delay."""
-            await asyncio.sleep(0.01)
-            rid = mgr._request_id
-            fut = mgr._pending.get(rid)
-            if fut and not fut.done():
-                fut.set_result("ok")
-
-        task = asyncio.create_task(_resolve())
         result = await mgr._send(["stop"], timeout=2.0)
-        await task
 
         assert result == "ok"
-        writer.write.assert_called_once()
-        payload = writer.write.call_args[0][0]
-        msg = json.loads(payload.decode())
-        assert msg["command"] == ["stop"]
-        assert "request_id" in msg
-        writer.drain.assert_awaited_once()
+        assert len(writer.written) == 1
+        payload = writer.written[0]
+        assert b'"command": ["stop"]' in payload
+        assert b'"request_id": ' in payload
+        assert writer.drain_count == 1
 
     async def test_send_increments_request_id(self):
         mgr = _make_manager()
-        _attach_mock_writer(mgr)
+        _attach_mock_writer(mgr, reply=None)
 
         for i in range(1, 4):
-            async def _resolve(expected_id=i):
-                await asyncio.sleep(0.01)
-                fut = mgr._pending.get(expected_id)
-                if fut and not fut.done():
-                    fut.set_result(None)
-
-            task = asyncio.create_task(_resolve())
             await mgr._send(["noop"], timeout=2.0)
-            await task
             assert mgr._request_id == i
 
     async def test_send_timeout_cleans_up_pending(self):
         mgr = _make_manager()
         _attach_mock_writer(mgr)
+        # Time out at once rather than waiting out the real 50 ms
+        mgr._wait_for = _timeout_now
 
         with pytest.raises(asyncio.TimeoutError):
             await mgr._send(["hang"], timeout=0.05)
@@ -148,19 +238,10 @@ class TestSend:
 
     async def test_send_propagates_ipc_error(self):
         mgr = _make_manager()
-        _attach_mock_writer(mgr)
+        _attach_mock_writer(mgr, reply=RuntimeError("property not found"))
 
-        async def _resolve_error():
-            await asyncio.sleep(0.01)
-            rid = mgr._request_id
-            fut = mgr._pending.get(rid)
-            if fut and not fut.done():
-                fut.set_exception(RuntimeError("property not found"))
-
-        task = asyncio.create_task(_resolve_error())
         with pytest.raises(RuntimeError, match="property not found"):
             await mgr._send(["get_property", "nonexistent"], timeout=2.0)
-        await task
 
 
 # ── _get_property ────────────────────────────────────────────────────────────
@@ -183,26 +264,23 @@ class TestIsAlive:
         mgr = _make_manager()
         assert mgr.is_alive_sync() is False
 
-    def test_is_alive_sync_alive_process(self):
-        mgr = _make_manager()
-        _attach_mock_process(mgr, alive=True)
-        assert mgr.is_alive_sync() is True
-
-    def test_is_alive_sync_dead_process(self):
-        mgr = _make_manager()
-        _attach_mock_process(mgr, alive=False)
-        assert mgr.is_alive_sync() is False
+    def test_is_alive_sync(self, mgr_with_proc):
+        mgr, _proc, alive = mgr_with_proc
+        assert mgr.is_alive_sync() is alive
 
     async def test_is_alive_async_no_process(self):
         mgr = _make_manager()
         assert await mgr.is_alive() is False
 
-    async def test_is_alive_async_alive_with_ipc(self):
-        mgr = _make_manager()
-        _attach_mock_process(mgr, alive=True)
+    async def test_is_alive_async_with_ipc(self, mgr_with_proc):
+        mgr, _proc, alive = mgr_with_proc
         mgr._get_property = AsyncMock(return_value="mpv 0.38.0")
-        assert await mgr.is_alive() is True
-        mgr._get_property.assert_awaited_once_with("mpv-version")
+        assert await mgr.is_alive() is alive
+        # A dead process short-circuits before the IPC ping
+        if alive:
+            mgr._get_property.assert_awaited_once_with("mpv-version")
+        else:
+            mgr._get_property.assert_not_awaited()
 
     async def test_is_alive_async_alive_no_ipc(self):
         mgr = _make_manager()
@@ -290,117 +368,129 @@ class TestOverlayCommands:
 # ── get_status ───────────────────────────────────────────────────────────────
 
 
-class TestGetStatus:
-    async def test_status_when_playing(self):
-        mgr = _make_manager()
-        _attach_mock_process(mgr, alive=True)
-        mgr._get_property = AsyncMock(side_effect=[
-            False,   # pause
-            False,   # idle-active
-            "http://example.com/stream.m3u8",  # path
-            "v4l2m2m",  # hwdec-current
-            29.97,   # estimated-vf-fps
-            0,       # frame-drop-count
-            0,       # decoder-frame-drop-count
-            1920,    # video-params/w
-            1080,    # video-params/h
-            "h264",  # video-codec
-        ])
-        status = await mgr.get_status()
-        assert status["alive"] is True
-        assert status["paused"] is False
-        assert status["idle"] is False
-        assert status["playing"] is True
-        assert status["stream_url"] == "http://example.com/stream.m3u8"
-        assert status["hwdec_current"] == "v4l2m2m"
-        assert status["fps"] == 29.97
-        assert status["resolution"] == "1920x1080"
-        assert status["video_codec"] == "h264"
-
-    async def test_status_when_paused(self):
-        mgr = _make_manager()
-        _attach_mock_process(mgr, alive=True)
-        mgr._get_property = AsyncMock(side_effect=[
-            True,    # pause
-            False,   # idle-active
-            "http://example.com/stream.m3u8",  # path
-            "",      # hwdec-current
-            0,       # estimated-vf-fps
-            0,       # frame-drop-count
-            0,       # decoder-frame-drop-count
-            None,    # video-params/w
-            None,    # video-params/h
-            "",      # video-codec
-        ])
-        status = await mgr.get_status()
-        assert status["paused"] is True
-        assert status["playing"] is False
+_PLAYING_PROPS = {
+    "pause": False,
+    "idle-active": False,
+    "path": "http://example.com/stream.m3u8",
+    "hwdec-current": "v4l2m2m",
+    "estimated-vf-fps": 29.97,
+    "frame-drop-count": 0,
+    "decoder-frame-drop-count": 0,
+    "video-params/w": 1920,
+    "video-params/h": 1080,
+    "video-codec": "h264",
+}
+
+_PAUSED_PROPS = {
+    "pause": True,
+    "idle-active": False,
+    "path": "http://example.com/stream.m3u8",
+    "hwdec-current": "",
+    "estimated-vf-fps": 0,
+    "frame-drop-count": 0,
+    "decoder-frame-drop-count": 0,
+    "video-params/w": None,
+    "video-params/h": None,
+    "video-codec": "",
+}
+
+_IDLE_PROPS = {
+    "pause": False,
+    "idle-active": True,
+    "path": None,
+    "hwdec-current": None,
+    "estimated-vf-fps": 0,
+    "frame-drop-count": 0,
+    "decoder-frame-drop-count": 0,
+    "video-params/w": None,
+    "video-params/h": None,
+    "video-codec": None,
+}
+
+
+def _fake_get_property(props):
+    """Build a _get_property stand-in that answers from a name → value map.
+
+    If *props* is an exception, every query raises it instead.
+    """
+    async def _get_property(name):
+        if isinstance(props, BaseException):
+            raise props
+        return props[name]
 
-    async def test_status_when_idle(self):
-        mgr = _make_manager()
-        _attach_mock_process(mgr, alive=True)
-        mgr._get_property = AsyncMock(side_effect=[
-            False,   # pause
-            True,    # idle-active
-            None,    # path
-            None,    # hwdec-current
-            0,       # estimated-vf-fps
-            0,       # frame-drop-count
-            0,       # decoder-frame-drop-count
-            None,    # video-params/w
-            None,    # video-params/h
-            None,    # video-codec
-        ])
-        status = await mgr.get_status()
-        assert status["idle"] is True
-        assert status["playing"] is False
-        assert status["stream_url"] == ""
-        assert status["hwdec_current"] == ""
+    return _get_property
 
-    async def test_status_on_ipc_error(self):
-        mgr = _make_manager()
-        _attach_mock_process(mgr, alive=True)
-        mgr._get_property = AsyncMock(side_effect=RuntimeError("IPC dead"))
-        status = await mgr.get_status()
-        assert status["alive"] is True
-        assert status["playing"] is False
-        assert status["idle"] is True
-        assert status["stream_url"] == ""
-        assert status["hwdec_current"] == ""
 
-    async def test_status_no_process(self):
-        mgr = _make_manager()
-        mgr._get_property = AsyncMock(side_effect=RuntimeError("nope"))
+class TestGetStatus:
+    @pytest.mark.parametrize("alive,props,expected", [
+        pytest.param(True, _PLAYING_PROPS, {
+            "alive": True,
+            "paused": False,
+            "idle": False,
+            "playing": True,
+            "stream_url": "http://example.com/stream.m3u8",
+            "hwdec_current": "v4l2m2m",
+            "fps": 29.97,
+            "resolution": "1920x1080",
+            "video_codec": "h264",
+        }, id="playing"),
+        pytest.param(True, _PAUSED_PROPS, {
+            "paused": True,
+            "playing": False,
+        }, id="paused"),
+        pytest.param(True, _IDLE_PROPS, {
+            "idle": True,
+            "playing": False,
+            "stream_url": "",
+            "hwdec_current": "",
+        }, id="idle"),
+        pytest.param(True, RuntimeError("IPC dead"), {
+            "alive": True,
+            "playing": False,
+            "idle": True,
+            "stream_url": "",
+            "hwdec_current": "",
+        }, id="ipc-error"),
+        pytest.param(False, RuntimeError("nope"), {
+            "alive": False,
+        }, id="no-process"),
+    ])
+    async def test_status(self, alive, props, expected):
+        mgr = _make_manager()
+        if alive:
+            _attach_mock_process(mgr, alive=True)
+        mgr._get_property = _fake_get_property(props)
         status = await mgr.get_status()
-        assert status["alive"] is False
+        # Pin types too, so 0 can't pass for False or 1 for True
+        actual = {k: (type(status[k]), status[k]) for k in expected}
+        assert actual == {k: (type(v), v) for k, v in expected.items()}
 
 
 # ── take_screenshot ──────────────────────────────────────────────────────────
 
 
+_FAKE_JPG = b"\xff\xd8\xff\xe0JFIF-fake-screenshot"
+
+
 class TestScreenshot:
-    async def test_take_screenshot_success(self, tmp_path):
+    async def test_take_screenshot_success(self):
         mgr = _make_manager()
         mgr._send = AsyncMock()
 
-        fake_jpg = b"\xff\xd8\xff\xe0JFIF-fake-screenshot"
-        fake_path = tmp_path / "mpv-preview.jpg"
-        fake_path.write_bytes(fake_jpg)
-
-        with patch("pi_decoder.mpv_manager.SCREENSHOT_PATH", str(fake_path)), \
-             patch("pi_decoder.mpv_manager.Path") as MockPath, \
+        with patch("pi_decoder.mpv_manager.Path") as MockPath, \
              patch("asyncio.sleep", new_callable=AsyncMock):
-            # Make Path(SCREENSHOT_PATH) return a mock whose exists/read_bytes work
+            # Path is mocked, so nothing touches the filesystem
             path_inst = MagicMock()
             path_inst.exists.return_value = True
-            path_inst.read_bytes.return_value = fake_jpg
+            path_inst.read_bytes.return_value = _FAKE_JPG
             path_inst.unlink = MagicMock()
             MockPath.return_value = path_inst
 
             data = await mgr.take_screenshot()
 
-        assert data == fake_jpg
-        mgr._send.assert_awaited_once_with(["screenshot-to-file", str(fake_path), "window"])
+        assert data == _FAKE_JPG
+        MockPath.assert_called_once_with(SCREENSHOT_PATH)
+        mgr._send.assert_awaited_once_with(["screenshot-to-file", SCREENSHOT_PATH, "window"])
         path_inst.unlink.assert_called_once_with(missing_ok=True)
 
     async def test_take_screenshot_no_file(self):
@@ -448,145 +538,114 @@ class TestResetStreamRetry:
 
 
 class TestBuildIdleOverlay:
-    def _make_net(self, **kwargs):
-        base = {
-            "connection_type": "none",
-            "ip": "",
-            "ssid": "",
-            "hotspot_active": False,
-            "signal": 0,
-        }
-        base.update(kwargs)
-        return base
-
-    @patch("pi_decoder.mpv_manager._get_version", return_value="1.2.3")
-    def test_ethernet_connected(self, _mock_ver):
-        cfg = _make_config(**{"general.name": "MyDecoder"})
-        mgr = MpvManager(cfg)
-        net = self._make_net(connection_type="ethernet", ip="192.168.1.100")
-        result = mgr._build_idle_overlay(net)
-
-        assert "MyDecoder v1.2.3" in result
-        assert "Network: Ethernet" in result
-        assert "IP: 192.168.1.100" in result
-        assert "http://192.168.1.100" in result
-        # ASS newline separator
-        assert "\\N" in result
-
-    @patch("pi_decoder.mpv_manager._get_version", return_value="1.0.0")
-    def test_wifi_connected(self, _mock_ver):
-        mgr = _make_manager()
-        net = self._make_net(connection_type="wifi", ip="10.0.0.5", ssid="MyNet", signal=75)
-        result = mgr._build_idle_overlay(net)
-
-        assert "Network: WiFi (MyNet) 75%" in result
-        assert "IP: 10.0.0.5" in result
-
-    @patch("pi_decoder.mpv_manager._get_version", return_value="1.0.0")
-    def test_wifi_no_signal(self, _mock_ver):
-        mgr = _make_manager()
-        net = self._make_net(connection_type="wifi", ip="10.0.0.5", ssid="MyNet", signal=0)
-        result = mgr._build_idle_overlay(net)
-
-        # signal=0 should omit signal percentage
-        assert "Network: WiFi (MyNet)" in result
-        assert "75%" not in result
-
-    @patch("pi_decoder.mpv_manager._get_version", return_value="1.0.0")
-    def test_hotspot_active(self, _mock_ver):
-        cfg = _make_config(**{
-            "network.hotspot_ssid": "PiDec-Setup",
-            "network.hotspot_password": "secret123",
-        })
-        mgr = MpvManager(cfg)
-        net = self._make_net(connection_type="hotspot", ip="10.42.0.1", hotspot_active=True)
+    @pytest.fixture(autouse=True)
+    def _version(self, monkeypatch):
+        monkeypatch.setattr("pi_decoder.mpv_manager._get_version", lambda: "1.0.0")
+
+    @pytest.mark.parametrize("cfg_over,net,must_contain,must_not_contain", [
+        pytest.param(
+            {"general.name": "MyDecoder"},
+            {"connection_type": "ethernet", "ip": "192.168.1.100", "ssid": "", "hotspot_active": False, "signal": 0},
+            # ASS newline separator included
+            ["MyDecoder v1.0.0", "Network: Ethernet", "IP: 192.168.1.100",
+             "http://192.168.1.100", "\\N"],
+            [],
+            id="ethernet",
+        ),
+        pytest.param(
+            {},
+            {"connection_type": "wifi", "ip": "10.0.0.5", "ssid": "MyNet", "hotspot_active": False, "signal": 75},
+            ["Network: WiFi (MyNet) 75%", "IP: 10.0.0.5"],
+            [],
+            id="wifi",
+        ),
+        pytest.param(
+            # signal=0 should omit signal percentage
+            {},
+            {"connection_type": "wifi", "ip": "10.0.0.5", "ssid": "MyNet", "hotspot_active": False, "signal": 0},
+            ["Network: WiFi (MyNet)"],
+            ["75%"],
+            id="wifi-no-signal",
+        ),
+        pytest.param(
+            {"network.hotspot_ssid": "PiDec-Setup", "network.hotspot_password": "secret123"},
+            {"connection_type": "hotspot", "ip": "10.42.0.1", "ssid": "", "hotspot_active": True, "signal": 0},
+            ["Network: Hotspot", "WiFi Setup:", "Network: PiDec-Setup", "Password: secret123"],
+            [],
+            id="hotspot-active",
+        ),
+        pytest.param(
+            # No "Web UI" line without an IP
+            {},
+            {"connection_type": "none", "ip": "", "ssid": "", "hotspot_active": False, "signal": 0},
+            ["Network: Not connected", "IP: No network"],
+            ["Web UI"],
+            id="no-connection",
+        ),
+        pytest.param(
+            {},
+            {"connection_type": "unknown", "ip": "", "ssid": "", "hotspot_active": False, "signal": 0},
+            ["Network: Not connected"],
+            [],
+            id="unknown-connection",
+        ),
+        pytest.param(
+            {"stream.url": "http://example.com/stream"},
+            {"connection_type": "ethernet", "ip": "192.168.1.5", "ssid": "", "hotspot_active": False, "signal": 0},
+            ["Stream: Connecting..."],
+            [],
+            id="stream-url-configured",
+        ),
+        pytest.param(
+            {"stream.url": ""},
+            {"connection_type": "ethernet", "ip": "192.168.1.5", "ssid": "", "hotspot_active": False, "signal": 0},
+            ["Stream: No URL configured"],
+            [],
+            id="no-stream-url",
+        ),
+        pytest.param(
+            {"web.port": 8080},
+            {"connection_type": "ethernet", "ip": "192.168.1.100", "ssid": "", "hotspot_active": False, "signal": 0},
+            ["http://192.168.1.100:8080", f"http://{socket.gethostname()}.local:8080"],
+            [],
+            id="port-suffix-non-default",
+        ),
+        pytest.param(
+            {"web.port": 80},
+            {"connection_type": "ethernet", "ip": "192.168.1.100", "ssid": "", "hotspot_active": False, "signal": 0},
+            ["http://192.168.1.100"],
+            [":80"],
+            id="port-suffix-default",
+        ),
+        pytest.param(
+            {},
+            {"connection_type": "ethernet", "ip": "10.0.0.1", "ssid": "", "hotspot_active": False, "signal": 0},
+            [],
+            ["WiFi Setup:", "Password:"],
+            id="hotspot-inactive-no-credentials",
+        ),
+    ])
+    def test_overlay_text(self, cfg_over, net, must_contain, must_not_contain):
+        mgr = MpvManager(_make_config(**cfg_over))
         result = mgr._build_idle_overlay(net)
 
-        assert "Network: Hotspot" in result
-        assert "WiFi Setup:" in result
-        assert "Network: PiDec-Setup" in result
-        assert "Password: secret123" in result
+        for text in must_contain:
+            assert text in result
+        for text in must_not_contain:
+            assert text not in result
 
-    @patch("pi_decoder.mpv_manager._get_version", return_value="1.0.0")
-    def test_no_connection(self, _mock_ver):
-        mgr = _make_manager()
-        net = self._make_net(connection_type="none", ip="")
-        result = mgr._build_idle_overlay(net)
-
-        assert "Network: Not connected" in result
-        assert "IP: No network" in result
-        # Should NOT contain "Web UI" when no IP
-        assert "Web UI" not in result
-
-    @patch("pi_decoder.mpv_manager._get_version", return_value="1.0.0")
-    def test_unknown_connection(self, _mock_ver):
-        mgr = _make_manager()
-        net = self._make_net(connection_type="unknown", ip="")
-        result = mgr._build_idle_overlay(net)
-
-        assert "Network: Not connected" in result
-
-    @patch("pi_decoder.mpv_manager._get_version", return_value="1.0.0")
-    def test_stream_url_configured(self, _mock_ver):
-        cfg = _make_config(**{"stream.url": "http://example.com/stream"})
-        mgr = MpvManager(cfg)
-        mgr._last_stream_attempt = 0.0
-        net = self._make_net(connection_type="ethernet", ip="192.168.1.5")
-        result = mgr._build_idle_overlay(net)
-
-        assert "Stream: Connecting..." in result
-
-    @patch("pi_decoder.mpv_manager._get_version", return_value="1.0.0")
-    def test_stream_retry_countdown(self, _mock_ver):
+    def test_stream_retry_countdown(self, monkeypatch):
+        # Freeze the module's clock (not time.monotonic itself) so the
+        # countdown is exact
+        monkeypatch.setattr("pi_decoder.mpv_manager.time", SimpleNamespace(monotonic=lambda: 1000.0))
         cfg = _make_config(**{"stream.url": "http://example.com/stream"})
         mgr = MpvManager(cfg)
         mgr._stream_retry_backoff = 30.0
-        mgr._last_stream_attempt = time.monotonic()  # just attempted
-        net = self._make_net(connection_type="ethernet", ip="192.168.1.5")
-        result = mgr._build_idle_overlay(net)
-
-        assert "Stream: Retrying in" in result
-
-    @patch("pi_decoder.mpv_manager._get_version", return_value="1.0.0")
-    def test_no_stream_url_configured(self, _mock_ver):
-        cfg = _make_config(**{"stream.url": ""})
-        mgr = MpvManager(cfg)
-        net = self._make_net(connection_type="ethernet", ip="192.168.1.5")
+        mgr._last_stream_attempt = 1000.0  # just attempted
+        net = {"connection_type": "ethernet", "ip": "192.168.1.5", "ssid": "", "hotspot_active": False, "signal": 0}
         result = mgr._build_idle_overlay(net)
 
-        assert "Stream: No URL configured" in result
-
-    @patch("pi_decoder.mpv_manager._get_version", return_value="1.0.0")
-    def test_port_suffix_when_non_default(self, _mock_ver):
-        """Port suffix should appear in URLs when port != 80."""
-        cfg = _make_config(**{"web.port": 8080})
-        mgr = MpvManager(cfg)
-        net = self._make_net(connection_type="ethernet", ip="192.168.1.100")
-        result = mgr._build_idle_overlay(net)
-
-        assert "http://192.168.1.100:8080" in result
-        assert f"http://{__import__('socket').gethostname()}.local:8080" in result
-
-    @patch("pi_decoder.mpv_manager._get_version", return_value="1.0.0")
-    def test_port_suffix_omitted_when_default(self, _mock_ver):
-        """Port suffix should be omitted when port == 80."""
-        cfg = _make_config(**{"web.port": 80})
-        mgr = MpvManager(cfg)
-        net = self._make_net(connection_type="ethernet", ip="192.168.1.100")
-        result = mgr._build_idle_overlay(net)
-
-        assert "http://192.168.1.100" in result
-        assert ":80" not in result
-
-    @patch("pi_decoder.mpv_manager._get_version", return_value="1.0.0")
-    def test_hotspot_not_active_no_credentials(self, _mock_ver):
-        """When hotspot_active=False, credentials should not appear."""
-        mgr = _make_manager()
-        net = self._make_net(connection_type="ethernet", ip="10.0.0.1", hotspot_active=False)
-        result = mgr._build_idle_overlay(net)
-
-        assert "WiFi Setup:" not in result
-        assert "Password:" not in result
+        assert result.split("\\N")[-1].endswith("Stream: Retrying in 30s...")
 
 
 # ── _drm_mode ────────────────────────────────────────────────────────────
@@ -624,25 +683,14 @@ class TestDrmMode:
 
     @patch("platform.system", return_value="Linux")
     @patch("pi_decoder.mpv_manager._find_drm_device", return_value="/dev/dri/card1")
-    @patch("pi_decoder.mpv_manager.Path")
-    @patch("asyncio.create_subprocess_exec", new_callable=AsyncMock)
-    @patch("asyncio.sleep", new_callable=AsyncMock)
-    async def test_start_includes_drm_mode(
-        self, mock_sleep, mock_exec, mock_path_cls, mock_drm_dev, _mock_plat
-    ):
+    async def test_start_includes_drm_mode(self, mock_drm_dev, _mock_plat, start_env):
         cfg = _make_config(**{"display.hdmi_resolution": "1920x1080@30D"})
         mgr = MpvManager(cfg)
-        mock_proc = MagicMock()
-        mock_proc.returncode = None
-        mock_exec.return_value = mock_proc
         mgr._connect_ipc = AsyncMock()
-        mock_path_cls.return_value.exists.return_value = True
 
-        with patch("asyncio.create_task") as mock_task:
-            mock_task.return_value = MagicMock(done=MagicMock(return_value=False))
-            await mgr.start()
+        await mgr.start()
 
-        call_args = mock_exec.call_args[0]
+        call_args = start_env.exec.call_args[0]
         assert "--drm-mode=1920x1080@30" in call_args
         assert "--drm-device=/dev/dri/card1" in call_args
 
@@ -682,25 +730,14 @@ class TestYtdlFormat:
             "/bestvideo+bestaudio/best"
         )
 
-    @patch("pi_decoder.mpv_manager.Path")
-    @patch("asyncio.create_subprocess_exec", new_callable=AsyncMock)
-    @patch("asyncio.sleep", new_callable=AsyncMock)
-    async def test_start_uses_max_resolution_in_ytdl_format(
-        self, mock_sleep, mock_exec, mock_path_cls
-    ):
+    async def test_start_uses_max_resolution_in_ytdl_format(self, start_env):
         cfg = _make_config(**{"stream.max_resolution": "720"})
         mgr = MpvManager(cfg)
-        mock_proc = MagicMock()
-        mock_proc.returncode = None
-        mock_exec.return_value = mock_proc
         mgr._connect_ipc = AsyncMock()
-        mock_path_cls.return_value.exists.return_value = True
 
-        with patch("asyncio.create_task") as mock_task:
-            mock_task.return_value = MagicMock(done=MagicMock(return_value=False))
-            await mgr.start()
+        await mgr.start()
 
-        call_args = mock_exec.call_args[0]
+        call_args = start_env.exec.call_args[0]
         expected_fmt = (
             "bestvideo[height<=720][vcodec^=avc1]+bestaudio"
             "/bestvideo[height<=720][vcodec^=vp9]+bestaudio"
@@ -713,163 +750,68 @@ class TestYtdlFormat:
 # ── Process lifecycle: start ─────────────────────────────────────────────────
 
 
+@pytest.mark.xdist_group("mpv_proc")
 class TestStart:
-    @patch("pi_decoder.mpv_manager.Path")
-    @patch("asyncio.create_subprocess_exec", new_callable=AsyncMock)
-    @patch("asyncio.sleep", new_callable=AsyncMock)
-    async def test_start_launches_mpv_and_connects(
-        self, mock_sleep, mock_exec, mock_path_cls
-    ):
+    async def test_start_launches_mpv_and_connects(self, start_env):
         mgr = _make_manager()
-        mock_proc = MagicMock()
-        mock_proc.returncode = None
-        mock_exec.return_value = mock_proc
         mgr._connect_ipc = AsyncMock()
 
-        # Socket appears immediately
-        mock_path_cls.return_value.exists.return_value = True
+        await mgr.start()
 
-        # Prevent the health loop from actually running
-        with patch("asyncio.create_task") as mock_task:
-            mock_task.return_value = MagicMock(done=MagicMock(return_value=False))
-            await mgr.start()
-
-        mock_exec.assert_awaited_once()
+        start_env.exec.assert_awaited_once()
         # First arg should be 'mpv'
-        call_args = mock_exec.call_args[0]
+        call_args = start_env.exec.call_args[0]
         assert call_args[0] == "mpv"
         # IPC socket arg should be present
         assert any(IPC_SOCKET in str(a) for a in call_args)
 
         mgr._connect_ipc.assert_awaited_once()
-        assert mgr._process is mock_proc
+        assert mgr._process is start_env.proc
         assert mgr._restart_backoff == 3.0
         assert mgr._stopping is False
 
-    @patch("pi_decoder.mpv_manager.Path")
-    @patch("asyncio.create_subprocess_exec", new_callable=AsyncMock)
-    @patch("asyncio.sleep", new_callable=AsyncMock)
-    async def test_start_includes_stream_url_when_configured(
-        self, mock_sleep, mock_exec, mock_path_cls
-    ):
-        cfg = _make_config(**{"stream.url": "http://example.com/live.m3u8"})
-        mgr = MpvManager(cfg)
-        mock_proc = MagicMock()
-        mock_proc.returncode = None
-        mock_exec.return_value = mock_proc
-        mgr._connect_ipc = AsyncMock()
-        mock_path_cls.return_value.exists.return_value = True
-
-        with patch("asyncio.create_task") as mock_task:
-            mock_task.return_value = MagicMock(done=MagicMock(return_value=False))
-            await mgr.start()
-
-        call_args = mock_exec.call_args[0]
-        assert "http://example.com/live.m3u8" in call_args
-
-    @patch("pi_decoder.mpv_manager.Path")
-    @patch("asyncio.create_subprocess_exec", new_callable=AsyncMock)
-    @patch("asyncio.sleep", new_callable=AsyncMock)
-    async def test_start_excludes_stream_url_when_empty(
-        self, mock_sleep, mock_exec, mock_path_cls
-    ):
-        cfg = _make_config(**{"stream.url": ""})
-        mgr = MpvManager(cfg)
-        mock_proc = MagicMock()
-        mock_proc.returncode = None
-        mock_exec.return_value = mock_proc
-        mgr._connect_ipc = AsyncMock()
-        mock_path_cls.return_value.exists.return_value = True
-
-        with patch("asyncio.create_task") as mock_task:
-            mock_task.return_value = MagicMock(done=MagicMock(return_value=False))
-            await mgr.start()
-
-        call_args = mock_exec.call_args[0]
-        # No empty string or stream URL should appear
-        assert "" not in call_args[1:]  # skip 'mpv' itself
-
-    @patch("pi_decoder.mpv_manager.Path")
-    @patch("asyncio.create_subprocess_exec", new_callable=AsyncMock)
-    @patch("asyncio.sleep", new_callable=AsyncMock)
-    async def test_start_uses_hwdec_from_config(
-        self, mock_sleep, mock_exec, mock_path_cls
-    ):
-        cfg = _make_config(**{"stream.hwdec": "v4l2m2m"})
-        mgr = MpvManager(cfg)
-        mock_proc = MagicMock()
-        mock_proc.returncode = None
-        mock_exec.return_value = mock_proc
+    @pytest.mark.parametrize("cfg_over,in_argv,not_in_argv", [
+        pytest.param(
+            {"stream.url": "http://example.com/live.m3u8"},
+            ["http://example.com/live.m3u8"], [], id="stream-url",
+        ),
+        pytest.param(
+            # No empty string should stand in for a missing stream URL
+            {"stream.url": ""}, [], [""], id="no-stream-url",
+        ),
+        pytest.param({"stream.hwdec": "v4l2m2m"}, ["--hwdec=v4l2m2m"], [], id="hwdec-config"),
+        pytest.param({}, ["--hwdec=auto"], [], id="hwdec-default"),
+    ])
+    async def test_start_argv(self, start_env, cfg_over, in_argv, not_in_argv):
+        mgr = MpvManager(_make_config(**cfg_over))
         mgr._connect_ipc = AsyncMock()
-        mock_path_cls.return_value.exists.return_value = True
 
-        with patch("asyncio.create_task") as mock_task:
-            mock_task.return_value = MagicMock(done=MagicMock(return_value=False))
-            await mgr.start()
+        await mgr.start()
 
-        call_args = mock_exec.call_args[0]
-        assert "--hwdec=v4l2m2m" in call_args
-
-    @patch("pi_decoder.mpv_manager.Path")
-    @patch("asyncio.create_subprocess_exec", new_callable=AsyncMock)
-    @patch("asyncio.sleep", new_callable=AsyncMock)
-    async def test_start_defaults_to_hwdec_auto(
-        self, mock_sleep, mock_exec, mock_path_cls
-    ):
-        mgr = _make_manager()
-        mock_proc = MagicMock()
-        mock_proc.returncode = None
-        mock_exec.return_value = mock_proc
-        mgr._connect_ipc = AsyncMock()
-        mock_path_cls.return_value.exists.return_value = True
-
-        with patch("asyncio.create_task") as mock_task:
-            mock_task.return_value = MagicMock(done=MagicMock(return_value=False))
-            await mgr.start()
-
-        call_args = mock_exec.call_args[0]
-        assert "--hwdec=auto" in call_args
+        call_args = start_env.exec.call_args[0]
+        for arg in in_argv:
+            assert arg in call_args
+        for arg in not_in_argv:
+            assert arg not in call_args[1:]  # skip 'mpv' itself
 
     @patch("os.unlink")
-    @patch("pi_decoder.mpv_manager.Path")
-    @patch("asyncio.create_subprocess_exec", new_callable=AsyncMock)
-    @patch("asyncio.sleep", new_callable=AsyncMock)
-    async def test_start_removes_stale_socket(
-        self, mock_sleep, mock_exec, mock_path_cls, mock_unlink
-    ):
+    async def test_start_removes_stale_socket(self, mock_unlink, start_env):
         mgr = _make_manager()
-        mock_proc = MagicMock()
-        mock_proc.returncode = None
-        mock_exec.return_value = mock_proc
         mgr._connect_ipc = AsyncMock()
-        mock_path_cls.return_value.exists.return_value = True
 
-        with patch("asyncio.create_task") as mock_task:
-            mock_task.return_value = MagicMock(done=MagicMock(return_value=False))
-            await mgr.start()
+        await mgr.start()
 
         mock_unlink.assert_called_once_with(IPC_SOCKET)
 
     @patch("os.unlink", side_effect=FileNotFoundError)
-    @patch("pi_decoder.mpv_manager.Path")
-    @patch("asyncio.create_subprocess_exec", new_callable=AsyncMock)
-    @patch("asyncio.sleep", new_callable=AsyncMock)
-    async def test_start_tolerates_missing_stale_socket(
-        self, mock_sleep, mock_exec, mock_path_cls, mock_unlink
-    ):
+    async def test_start_tolerates_missing_stale_socket(self, mock_unlink, start_env):
         mgr = _make_manager()
-        mock_proc = MagicMock()
-        mock_proc.returncode = None
-        mock_exec.return_value = mock_proc
         mgr._connect_ipc = AsyncMock()
-        mock_path_cls.return_value.exists.return_value = True
 
-        with patch("asyncio.create_task") as mock_task:
-            mock_task.return_value = MagicMock(done=MagicMock(return_value=False))
-            await mgr.start()
+        await mgr.start()
 
         # Should not raise -- FileNotFoundError is handled
-        assert mgr._process is mock_proc
+        assert mgr._process is start_env.proc
 
 
 # ── Process lifecycle: stop ──────────────────────────────────────────────────
@@ -913,17 +855,16 @@ class TestStop:
         # Should not raise
         await mgr.stop()
 
-    async def test_stop_terminates_running_process(self):
-        mgr = _make_manager()
+    async def test_stop_terminates_only_running_process(self, mgr_with_proc):
+        mgr, proc, alive = mgr_with_proc
         mgr._send = AsyncMock()
         mgr._disconnect_ipc = AsyncMock()
 
-        proc = _attach_mock_process(mgr, alive=True)
-        proc.wait = AsyncMock()
-
         await mgr.stop()
 
-        proc.terminate.assert_called_once()
+        # An already-exited process is neither terminated nor killed
+        assert proc.terminate_count == (1 if alive else 0)
+        assert proc.kill_count == 0
         assert mgr._process is None
 
     async def test_stop_kills_process_on_terminate_timeout(self):
@@ -931,28 +872,14 @@ class TestStop:
         mgr._send = AsyncMock()
         mgr._disconnect_ipc = AsyncMock()
 
+        # After kill(), the bare `await proc.wait()` succeeds
         proc = _attach_mock_process(mgr, alive=True)
-        # After kill(), the bare `await proc.wait()` should succeed
-        proc.wait = AsyncMock(return_value=None)
-
-        with patch("asyncio.wait_for", side_effect=asyncio.TimeoutError):
-            await mgr.stop()
-
-        proc.terminate.assert_called_once()
-        proc.kill.assert_called_once()
-        assert mgr._process is None
-
-    async def test_stop_skips_terminate_when_already_dead(self):
-        mgr = _make_manager()
-        mgr._send = AsyncMock()
-        mgr._disconnect_ipc = AsyncMock()
-        proc = _attach_mock_process(mgr, alive=False)
 
+        mgr._wait_for = _timeout_now
         await mgr.stop()
 
-        # Process already exited, terminate/kill should NOT be called
-        proc.terminate.assert_not_called()
-        proc.kill.assert_not_called()
+        assert proc.terminate_count == 1
+        assert proc.kill_count == 1
         assert mgr._process is None
 
     async def test_stop_disconnects_ipc(self):
@@ -989,18 +916,31 @@ class TestRestart:
 # ── IPC reader ───────────────────────────────────────────────────────────────
 
 
+def _fake_reader(*lines: bytes) -> SimpleNamespace:
+    """Stand-in for asyncio.StreamReader: readline() yields *lines*, then EOF."""
+    it = iter(lines)
+
+    async def readline() -> bytes:
+        return next(it, b"")
+
+    return SimpleNamespace(readline=readline)
+
+
+# Raw IPC reply lines, as mpv writes them to the socket
+_RESP_OK = b'{"request_id": 1, "error": "success", "data": "v0.38"}\n'
+_RESP_PROP_NOT_FOUND = b'{"request_id": 2, "error": "property not found"}\n'
+_RESP_UNKNOWN_ID = b'{"request_id": 999, "error": "success", "data": "x"}\n'
+_EVENT_PLAYBACK_RESTART = b'{"event": "playback-restart"}\n'
+
+
+@pytest.mark.xdist_group("mpv_proc")
 class TestIpcReader:
     async def test_ipc_reader_resolves_pending_future(self):
         mgr = _make_manager()
         loop = asyncio.get_running_loop()
 
-        # Create a mock reader that yields one response then EOF
-        response = json.dumps({"request_id": 1, "error": "success", "data": "v0.38"}) + "\n"
-        reader = AsyncMock()
-        reader.readline = AsyncMock(side_effect=[
-            response.encode(),
-            b"",  # EOF
-        ])
+        # One response, then EOF
+        reader = _fake_reader(_RESP_OK)
         mgr._reader = reader
 
         fut = loop.create_future()
@@ -1012,71 +952,36 @@ class TestIpcReader:
         assert fut.result() == "v0.38"
         assert 1 not in mgr._pending
 
-    async def test_ipc_reader_sets_exception_on_error(self):
+    async def test_ipc_reader_skips_unmatched_lines(self):
+        """Invalid JSON, events and unknown request ids are skipped, and an
+        error reply after them still fails its pending future."""
         mgr = _make_manager()
         loop = asyncio.get_running_loop()
 
-        response = json.dumps({"request_id": 2, "error": "property not found"}) + "\n"
-        reader = AsyncMock()
-        reader.readline = AsyncMock(side_effect=[
-            response.encode(),
-            b"",
-        ])
-        mgr._reader = reader
+        mgr._reader = _fake_reader(
+            b"this is not json\n",
+            _EVENT_PLAYBACK_RESTART,  # mpv sends events without request_id
+            _RESP_UNKNOWN_ID,
+            _RESP_PROP_NOT_FOUND,
+        )
 
         fut = loop.create_future()
         mgr._pending[2] = fut
 
+        # Should not raise
         await mgr._ipc_reader()
 
         assert fut.done()
         with pytest.raises(RuntimeError, match="property not found"):
             fut.result()
-
-    async def test_ipc_reader_ignores_invalid_json(self):
-        mgr = _make_manager()
-
-        reader = AsyncMock()
-        reader.readline = AsyncMock(side_effect=[
-            b"this is not json\n",
-            b"",
-        ])
-        mgr._reader = reader
-
-        # Should not raise
-        await mgr._ipc_reader()
-
-    async def test_ipc_reader_ignores_messages_without_request_id(self):
-        mgr = _make_manager()
-
-        # mpv sends events without request_id
-        event = json.dumps({"event": "playback-restart"}) + "\n"
-        reader = AsyncMock()
-        reader.readline = AsyncMock(side_effect=[
-            event.encode(),
-            b"",
-        ])
-        mgr._reader = reader
-
-        await mgr._ipc_reader()
-        # Should not raise; pending dict should remain empty
         assert mgr._pending == {}
 
-    async def test_ipc_reader_ignores_unknown_request_ids(self):
-        mgr = _make_manager()
-        response = json.dumps({"request_id": 999, "error": "success", "data": "x"}) + "\n"
-        reader = AsyncMock()
-        reader.readline = AsyncMock(side_effect=[
-            response.encode(),
-            b"",
-        ])
-        mgr._reader = reader
 
-        # No matching pending future -- should not raise
-        await mgr._ipc_reader()
+# ── IPC connect / disconnect ─────────────────────────────────────────────────
 
 
-# ── IPC connect / disconnect ─────────────────────────────────────────────────
+_IPC_READER = object()
+_IPC_WRITER = object()
 
 
 class TestIpcConnect:
@@ -1095,36 +1000,27 @@ class TestIpcConnect:
         assert mgr._reader is mock_reader
         assert mgr._writer is mock_writer
 
+    @pytest.mark.parametrize("effects,expected_awaits,connected", [
+        pytest.param(
+            (ConnectionRefusedError, FileNotFoundError, (_IPC_READER, _IPC_WRITER)),
+            3, True, id="retries-then-connects",
+        ),
+        pytest.param((ConnectionRefusedError,) * 5, 5, False, id="gives-up-after-5"),
+    ])
     @patch("asyncio.sleep", new_callable=AsyncMock)
     @patch("asyncio.open_unix_connection", new_callable=AsyncMock)
-    async def test_connect_ipc_retries_on_failure(self, mock_open, mock_sleep):
+    async def test_connect_ipc_retries(
+        self, mock_open, mock_sleep, effects, expected_awaits, connected
+    ):
         mgr = _make_manager()
-        mock_reader = MagicMock()
-        mock_writer = MagicMock()
-        mock_open.side_effect = [
-            ConnectionRefusedError,
-            FileNotFoundError,
-            (mock_reader, mock_writer),
-        ]
+        mock_open.side_effect = effects
 
-        with patch("asyncio.create_task") as mock_task:
-            mock_task.return_value = MagicMock()
+        with patch("asyncio.create_task", _no_task):
             await mgr._connect_ipc()
 
-        assert mock_open.await_count == 3
-        assert mgr._reader is mock_reader
-
-    @patch("asyncio.sleep", new_callable=AsyncMock)
-    @patch("asyncio.open_unix_connection", new_callable=AsyncMock)
-    async def test_connect_ipc_gives_up_after_5_retries(self, mock_open, mock_sleep):
-        mgr = _make_manager()
-        mock_open.side_effect = ConnectionRefusedError
-
-        await mgr._connect_ipc()
-
-        assert mock_open.await_count == 5
-        assert mgr._reader is None
-        assert mgr._writer is None
+        assert mock_open.await_count == expected_awaits
+        assert mgr._reader is (_IPC_READER if connected else None)
+        assert mgr._writer is (_IPC_WRITER if connected else None)
 
 
 class TestIpcDisconnect:
@@ -1144,38 +1040,33 @@ class TestIpcDisconnect:
 
     async def test_disconnect_closes_writer(self):
         mgr = _make_manager()
-        writer = MagicMock()
-        writer.close = MagicMock()
-        writer.wait_closed = AsyncMock()
+        writer = _WriterStub()
         mgr._writer = writer
 
         await mgr._disconnect_ipc()
 
-        writer.close.assert_called_once()
-        writer.wait_closed.assert_awaited_once()
+        assert writer.close_count == 1
+        assert writer.wait_closed_count == 1
+        assert mgr._pending == {}
         assert mgr._writer is None
         assert mgr._reader is None
 
-    async def test_disconnect_cancels_pending_futures(self):
+    def test_cancel_pending_futures(self):
+        """Runs without an event loop: only done()/cancel() are touched."""
         mgr = _make_manager()
-        loop = asyncio.get_running_loop()
+        waiting = MagicMock(done=MagicMock(return_value=False))
+        answered = MagicMock(done=MagicMock(return_value=True))
+        mgr._pending = {1: waiting, 2: answered}
 
-        fut1 = loop.create_future()
-        fut2 = loop.create_future()
-        mgr._pending = {1: fut1, 2: fut2}
+        mgr._cancel_pending()
 
-        await mgr._disconnect_ipc()
-
-        assert fut1.cancelled()
-        assert fut2.cancelled()
+        waiting.cancel.assert_called_once()
+        answered.cancel.assert_not_called()
         assert mgr._pending == {}
 
     async def test_disconnect_tolerates_writer_close_error(self):
         mgr = _make_manager()
-        writer = MagicMock()
-        writer.close = MagicMock(side_effect=OSError("broken pipe"))
-        writer.wait_closed = AsyncMock()
-        mgr._writer = writer
+        mgr._writer = _WriterStub(close_exc=OSError("broken pipe"))
 
         # Should not raise
         await mgr._disconnect_ipc()
@@ -1185,6 +1076,26 @@ class TestIpcDisconnect:
 # ── Health loop ──────────────────────────────────────────────────────────────
 
 
+async def _no_sleep(duration):
+    """Stand-in for MpvManager._sleep that returns immediately."""
+
+
+_NET_INFO_STUB = MappingProxyType({
+    "connection_type": "ethernet",
+    "ip": "192.168.1.1",
+    "ssid": "",
+    "hotspot_active": False,
+    "signal": 0,
+})
+
+
+@pytest.fixture
+def stub_network_info(monkeypatch):
+    """Answer the health loop's network lookup with _NET_INFO_STUB."""
+    monkeypatch.setattr("pi_decoder.mpv_manager._get_network_info", lambda: _NET_INFO_STUB)
+
+
+@pytest.mark.usefixtures("stub_network_info")
 class TestHealthLoop:
     async def test_health_loop_exits_when_stopping(self):
         mgr = _make_manager()
@@ -1192,26 +1103,18 @@ class TestHealthLoop:
 
         # Should return quickly since _stopping is True from the start.
         # The loop checks _stopping after the first sleep.
-        with patch("asyncio.sleep", new_callable=AsyncMock):
-            await mgr._health_loop()
+        mgr._sleep = _no_sleep
+        await mgr._health_loop()
 
     async def test_health_loop_restarts_dead_process(self):
         mgr = _make_manager()
         _attach_mock_process(mgr, alive=False)
 
-        call_count = 0
-
-        async def fake_sleep(duration):
-            nonlocal call_count
-            call_count += 1
-            if call_count >= 3:
-                mgr._stopping = True
-
         mgr._disconnect_ipc = AsyncMock()
         mgr.start = AsyncMock()
 
-        with patch("asyncio.sleep", side_effect=fake_sleep):
-            await mgr._health_loop()
+        mgr._sleep = _no_sleep
+        await mgr._health_tick()
 
         mgr._disconnect_ipc.assert_awaited()
         mgr.start.assert_awaited()
@@ -1220,29 +1123,27 @@ class TestHealthLoop:
         mgr = _make_manager()
         proc = _attach_mock_process(mgr, alive=True)
 
-        call_count = 0
-
-        async def fake_sleep(duration):
-            nonlocal call_count
-            call_count += 1
-            if call_count >= 3:
-                mgr._stopping = True
-
         mgr._get_property = AsyncMock(side_effect=asyncio.TimeoutError)
         mgr._disconnect_ipc = AsyncMock()
         mgr.start = AsyncMock()
 
-        with patch("asyncio.sleep", side_effect=fake_sleep), \
-             patch("asyncio.wait_for", side_effect=asyncio.TimeoutError):
-            await mgr._health_loop()
+        mgr._sleep = _no_sleep
+        mgr._wait_for = _timeout_now
+        await mgr._health_tick()
 
-        proc.kill.assert_called()
+        assert proc.kill_count >= 1
         mgr._disconnect_ipc.assert_awaited()
         mgr.start.assert_awaited()
 
-    async def test_health_loop_doubles_backoff_on_restart(self):
+    @pytest.mark.parametrize("initial_backoff,restarts,expected", [
+        # 3.0 → 6.0 → 12.0
+        pytest.param(3.0, 2, 12.0, id="doubles"),
+        # min(50.0 * 2, 60.0)
+        pytest.param(50.0, 1, 60.0, id="caps-at-60"),
+    ])
+    async def test_health_loop_restart_backoff(self, initial_backoff, restarts, expected):
         mgr = _make_manager()
-        mgr._restart_backoff = 3.0
+        mgr._restart_backoff = initial_backoff
         _attach_mock_process(mgr, alive=False)
 
         restart_count = 0
@@ -1251,47 +1152,27 @@ class TestHealthLoop:
             nonlocal restart_count
             restart_count += 1
             # Process still dead after restart, so loop detects death again
-            if restart_count >= 2:
+            if restart_count >= restarts:
                 mgr._stopping = True
 
         mgr._disconnect_ipc = AsyncMock()
         mgr.start = fake_start
 
-        with patch("asyncio.sleep", new_callable=AsyncMock):
-            await mgr._health_loop()
-
-        # After first restart: min(3.0 * 2, 60.0) = 6.0
-        # After second restart: min(6.0 * 2, 60.0) = 12.0
-        assert mgr._restart_backoff == 12.0
-
-    async def test_health_loop_caps_backoff_at_60(self):
-        mgr = _make_manager()
-        mgr._restart_backoff = 50.0
-        _attach_mock_process(mgr, alive=False)
-
-        restart_count = 0
-
-        async def fake_start():
-            nonlocal restart_count
-            restart_count += 1
-            if restart_count >= 1:
-                mgr._stopping = True
+        mgr._sleep = _no_sleep
+        await mgr._health_loop()
 
-        mgr._disconnect_ipc = AsyncMock()
-        mgr.start = fake_start
-
-        with patch("asyncio.sleep", new_callable=AsyncMock):
-            await mgr._health_loop()
-
-        assert mgr._restart_backoff == 60.0
+        assert restart_count == restarts
+        assert mgr._restart_backoff == expected
 
     async def test_health_loop_handles_cancellation(self):
         mgr = _make_manager()
 
-        with patch("asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
-            mock_sleep.side_effect = asyncio.CancelledError
-            # Should exit gracefully
-            await mgr._health_loop()
+        async def cancelled_sleep(duration):
+            raise asyncio.CancelledError
+
+        mgr._sleep = cancelled_sleep
+        # Should exit gracefully
+        await mgr._health_loop()
 
     async def test_health_loop_skips_retry_when_user_stopped(self):
         mgr = _make_manager()
@@ -1301,28 +1182,12 @@ class TestHealthLoop:
         mgr._last_stream_attempt = 0.0
         mgr._stream_retry_backoff = 5.0
 
-        call_count = 0
-
-        async def fake_sleep(duration):
-            nonlocal call_count
-            call_count += 1
-            if call_count >= 2:
-                mgr._stopping = True
-
         mgr._get_property = AsyncMock(return_value="mpv 0.38.0")
         mgr.get_status = AsyncMock(return_value={"idle": True})
         mgr.set_overlay = AsyncMock()
         mgr.load_stream = AsyncMock()
 
-        with patch("asyncio.sleep", side_effect=fake_sleep), \
-             patch("pi_decoder.mpv_manager._get_network_info", return_value={
-                 "connection_type": "ethernet",
-                 "ip": "192.168.1.1",
-                 "ssid": "",
-                 "hotspot_active": False,
-                 "signal": 0,
-             }):
-            await mgr._health_loop()
+        await mgr._health_tick()
 
         mgr.load_stream.assert_not_awaited()
 
@@ -1333,28 +1198,12 @@ class TestHealthLoop:
         mgr._last_stream_attempt = 0.0
         mgr._stream_retry_backoff = 5.0
 
-        call_count = 0
-
-        async def fake_sleep(duration):
-            nonlocal call_count
-            call_count += 1
-            if call_count >= 2:
-                mgr._stopping = True
-
         mgr._get_property = AsyncMock(return_value="mpv 0.38.0")
         mgr.get_status = AsyncMock(return_value={"idle": True})
         mgr.set_overlay = AsyncMock()
         mgr.load_stream = AsyncMock()
 
-        with patch("asyncio.sleep", side_effect=fake_sleep), \
-             patch("pi_decoder.mpv_manager._get_network_info", return_value={
-                 "connection_type": "ethernet",
-                 "ip": "192.168.1.1",
-                 "ssid": "",
-                 "hotspot_active": False,
-                 "signal": 0,
-             }):
-            await mgr._health_loop()
+        await mgr._health_tick()
 
         mgr.load_stream.assert_awaited_with("http://example.com/stream.m3u8")
 
@@ -1362,27 +1211,11 @@ class TestHealthLoop:
         mgr = _make_manager()
         _attach_mock_process(mgr, alive=True)
 
-        call_count = 0
-
-        async def fake_sleep(duration):
-            nonlocal call_count
-            call_count += 1
-            if call_count >= 2:
-                mgr._stopping = True
-
         mgr._get_property = AsyncMock(return_value="mpv 0.38.0")
         mgr.get_status = AsyncMock(return_value={"idle": False, "playing": True})
         mgr.remove_overlay = AsyncMock()
 
-        with patch("asyncio.sleep", side_effect=fake_sleep), \
-             patch("pi_decoder.mpv_manager._get_network_info", return_value={
-                 "connection_type": "ethernet",
-                 "ip": "192.168.1.1",
-                 "ssid": "",
-                 "hotspot_active": False,
-                 "signal": 0,
-             }):
-            await mgr._health_loop()
+        await mgr._health_tick()
 
         mgr.remove_overlay.assert_awaited_with(IP_OVERLAY_ID)
         # Backoff should be reset when playing
@@ -1395,28 +1228,12 @@ class TestHealthLoop:
         mgr._last_stream_attempt = 0.0
         mgr._stream_retry_backoff = 5.0
 
-        call_count = 0
-
-        async def fake_sleep(duration):
-            nonlocal call_count
-            call_count += 1
-            if call_count >= 2:
-                mgr._stopping = True
-
         mgr._get_property = AsyncMock(return_value="mpv 0.38.0")
         mgr.get_status = AsyncMock(return_value={"idle": True})
         mgr.set_overlay = AsyncMock()
         mgr.load_stream = AsyncMock()
 
-        with patch("asyncio.sleep", side_effect=fake_sleep), \
-             patch("pi_decoder.mpv_manager._get_network_info", return_value={
-                 "connection_type": "ethernet",
-                 "ip": "192.168.1.1",
-                 "ssid": "",
-                 "hotspot_active": False,
-                 "signal": 0,
-             }):
-            await mgr._health_loop()
+        await mgr._health_tick()
 
         # After one reload attempt: min(5.0 * 1.5, 60.0) = 7.5
         assert mgr._stream_retry_backoff == 7.5
@@ -1431,28 +1248,12 @@ class TestHealthLoop:
         # normally pass with 30s backoff, but after reset (5s) it will.
         mgr._last_stream_attempt = time.monotonic() - 10.0
 
-        call_count = 0
-
-        async def fake_sleep(duration):
-            nonlocal call_count
-            call_count += 1
-            if call_count >= 2:
-                mgr._stopping = True
-
         mgr._get_property = AsyncMock(return_value="mpv 0.38.0")
         mgr.get_status = AsyncMock(return_value={"idle": True})
         mgr.set_overlay = AsyncMock()
         mgr.load_stream = AsyncMock()
 
-        with patch("asyncio.sleep", side_effect=fake_sleep), \
-             patch("pi_decoder.mpv_manager._get_network_info", return_value={
-                 "connection_type": "ethernet",
-                 "ip": "192.168.1.1",
-                 "ssid": "",
-                 "hotspot_active": False,
-                 "signal": 0,
-             }):
-            await mgr._health_loop()
+        await mgr._health_tick()
 
         # Network changed from hotspot -> ethernet, reset_stream_retry was called
         # (backoff went from 30.0 -> 5.0), then stream reload happened (5.0 * 1.5 = 7.5)
@@ -1464,6 +1265,7 @@ class TestHealthLoop:
 # ── Failover: backup URL ─────────────────────────────────────────────────
 
 
+@pytest.mark.usefixtures("stub_network_info")
 class TestFailoverBackupUrl:
     def test_initial_failover_state(self):
         mgr = _make_manager()
@@ -1489,28 +1291,12 @@ class TestFailoverBackupUrl:
         # Pre-set to 2 failures — next idle retry will be the 3rd
         mgr._stream_failures = 2
 
-        call_count = 0
-
-        async def fake_sleep(duration):
-            nonlocal call_count
-            call_count += 1
-            if call_count >= 2:
-                mgr._stopping = True
-
         mgr._get_property = AsyncMock(return_value="mpv 0.38.0")
         mgr.get_status = AsyncMock(return_value={"idle": True})
         mgr.set_overlay = AsyncMock()
         mgr.load_stream = AsyncMock()
 
-        with patch("asyncio.sleep", side_effect=fake_sleep), \
-             patch("pi_decoder.mpv_manager._get_network_info", return_value={
-                 "connection_type": "ethernet",
-                 "ip": "192.168.1.1",
-                 "ssid": "",
-                 "hotspot_active": False,
-                 "signal": 0,
-             }):
-            await mgr._health_loop()
+        await mgr._health_tick()
 
         # Should have switched to backup URL
         assert mgr._using_backup is True
@@ -1529,28 +1315,12 @@ class TestFailoverBackupUrl:
         mgr._using_backup = True
         mgr._stream_failures = 5
 
-        call_count = 0
-
-        async def fake_sleep(duration):
-            nonlocal call_count
-            call_count += 1
-            if call_count >= 2:
-                mgr._stopping = True
-
         mgr._get_property = AsyncMock(return_value="mpv 0.38.0")
         mgr.get_status = AsyncMock(return_value={"idle": True})
         mgr.set_overlay = AsyncMock()
         mgr.load_stream = AsyncMock()
 
-        with patch("asyncio.sleep", side_effect=fake_sleep), \
-             patch("pi_decoder.mpv_manager._get_network_info", return_value={
-                 "connection_type": "ethernet",
-                 "ip": "192.168.1.1",
-                 "ssid": "",
-                 "hotspot_active": False,
-                 "signal": 0,
-             }):
-            await mgr._health_loop()
+        await mgr._health_tick()
 
         mgr.load_stream.assert_awaited_with("rtmp://backup.local/live")
 
@@ -1599,85 +1369,41 @@ class TestFailoverBackup:
 
 
 class TestPerformanceFlags:
-    @patch("pi_decoder.mpv_manager.Path")
-    @patch("asyncio.create_subprocess_exec", new_callable=AsyncMock)
-    @patch("asyncio.sleep", new_callable=AsyncMock)
-    async def test_start_includes_vd_lavc_threads(
-        self, mock_sleep, mock_exec, mock_path_cls
-    ):
+    async def test_start_includes_vd_lavc_threads(self, start_env):
         mgr = _make_manager()
-        mock_proc = MagicMock()
-        mock_proc.returncode = None
-        mock_exec.return_value = mock_proc
         mgr._connect_ipc = AsyncMock()
-        mock_path_cls.return_value.exists.return_value = True
 
-        with patch("asyncio.create_task") as mock_task:
-            mock_task.return_value = MagicMock(done=MagicMock(return_value=False))
-            await mgr.start()
+        await mgr.start()
 
-        call_args = mock_exec.call_args[0]
+        call_args = start_env.exec.call_args[0]
         assert "--vd-lavc-threads=4" in call_args
 
-    @patch("pi_decoder.mpv_manager.Path")
-    @patch("asyncio.create_subprocess_exec", new_callable=AsyncMock)
-    @patch("asyncio.sleep", new_callable=AsyncMock)
-    async def test_start_includes_framedrop_vo(
-        self, mock_sleep, mock_exec, mock_path_cls
-    ):
+    async def test_start_includes_framedrop_vo(self, start_env):
         mgr = _make_manager()
-        mock_proc = MagicMock()
-        mock_proc.returncode = None
-        mock_exec.return_value = mock_proc
         mgr._connect_ipc = AsyncMock()
-        mock_path_cls.return_value.exists.return_value = True
 
-        with patch("asyncio.create_task") as mock_task:
-            mock_task.return_value = MagicMock(done=MagicMock(return_value=False))
-            await mgr.start()
+        await mgr.start()
 
-        call_args = mock_exec.call_args[0]
+        call_args = start_env.exec.call_args[0]
         assert "--framedrop=vo" in call_args
 
-    @patch("pi_decoder.mpv_manager.Path")
-    @patch("asyncio.create_subprocess_exec", new_callable=AsyncMock)
-    @patch("asyncio.sleep", new_callable=AsyncMock)
-    async def test_start_uses_gpu_vo_with_drm_context(
-        self, mock_sleep, mock_exec, mock_path_cls
-    ):
+    async def test_start_uses_gpu_vo_with_drm_context(self, start_env):
         mgr = _make_manager()
-        mock_proc = MagicMock()
-        mock_proc.returncode = None
-        mock_exec.return_value = mock_proc
         mgr._connect_ipc = AsyncMock()
-        mock_path_cls.return_value.exists.return_value = True
 
-        with patch("asyncio.create_task") as mock_task:
-            mock_task.return_value = MagicMock(done=MagicMock(return_value=False))
-            await mgr.start()
+        await mgr.start()
 
-        call_args = mock_exec.call_args[0]
+        call_args = start_env.exec.call_args[0]
         assert "--vo=gpu" in call_args
         assert "--gpu-context=drm" in call_args
 
-    @patch("pi_decoder.mpv_manager.Path")
-    @patch("asyncio.create_subprocess_exec", new_callable=AsyncMock)
-    @patch("asyncio.sleep", new_callable=AsyncMock)
-    async def test_start_includes_force_window(
-        self, mock_sleep, mock_exec, mock_path_cls
-    ):
+    async def test_start_includes_force_window(self, start_env):
         mgr = _make_manager()
-        mock_proc = MagicMock()
-        mock_proc.returncode = None
-        mock_exec.return_value = mock_proc
         mgr._connect_ipc = AsyncMock()
-        mock_path_cls.return_value.exists.return_value = True
 
-        with patch("asyncio.create_task") as mock_task:
-            mock_task.return_value = MagicMock(done=MagicMock(return_value=False))
-            await mgr.start()
+        await mgr.start()
 
-        call_args = mock_exec.call_args[0]
+        call_args = start_env.exec.call_args[0]
         assert "--force-window=yes" in call_args
 
 # ── IPC Payload Verification (shallow-mock) ──────────────────────────────
@@ -1690,24 +1416,14 @@ class TestSetOverlayIpcPayload:
     letting set_overlay() → _send() → JSON serialization execute real code.
     """
 
-    async def _resolve_after(self, mgr: MpvManager):
-        """Resolve the pending future after a tiny delay."""
-        await asyncio.sleep(0.01)
-        rid = mgr._request_id
-        fut = mgr._pending.get(rid)
-        if fut and not fut.done():
-            fut.set_result(None)
-
     async def test_set_overlay_writes_correct_json_payload(self):
         mgr = _make_manager()
-        writer = _attach_mock_writer(mgr)
+        writer = _attach_mock_writer(mgr, reply=None)
         ass_text = r"{\an7\fs22\b1}Hello World"
 
-        task = asyncio.create_task(self._resolve_after(mgr))
         await mgr.set_overlay(42, ass_text)
-        await task
 
-        raw = writer.write.call_args[0][0]
+        raw = writer.written[-1]
         msg = json.loads(raw.decode().strip())
         cmd = msg["command"]
         assert isinstance(cmd, dict)
@@ -1722,13 +1438,11 @@ class TestSetOverlayIpcPayload:
     async def test_set_overlay_4k_resolution(self):
         cfg = _make_config(**{"display.hdmi_resolution": "3840x2160@30D"})
         mgr = _make_manager(cfg)
-        writer = _attach_mock_writer(mgr)
+        writer = _attach_mock_writer(mgr, reply=None)
 
-        task = asyncio.create_task(self._resolve_after(mgr))
         await mgr.set_overlay(42, "test")
-        await task
 
-        raw = writer.write.call_args[0][0]
+        raw = writer.written[-1]
         msg = json.loads(raw.decode().strip())
         assert msg["command"]["res_x"] == 3840
         assert msg["command"]["res_y"] == 2160
@@ -1736,26 +1450,22 @@ class TestSetOverlayIpcPayload:
     async def test_set_overlay_invalid_resolution_falls_back(self):
         cfg = _make_config(**{"display.hdmi_resolution": "garbage"})
         mgr = _make_manager(cfg)
-        writer = _attach_mock_writer(mgr)
+        writer = _attach_mock_writer(mgr, reply=None)
 
-        task = asyncio.create_task(self._resolve_after(mgr))
         await mgr.set_overlay(42, "test")
-        await task
 
-        raw = writer.write.call_args[0][0]
+        raw = writer.written[-1]
         msg = json.loads(raw.decode().strip())
         assert msg["command"]["res_x"] == 1920
         assert msg["command"]["res_y"] == 1080
 
     async def test_remove_overlay_writes_correct_json(self):
         mgr = _make_manager()
-        writer = _attach_mock_writer(mgr)
+        writer = _attach_mock_writer(mgr, reply=None)
 
-        task = asyncio.create_task(self._resolve_after(mgr))
         await mgr.remove_overlay(63)
-        await task
 
-        raw = writer.write.call_args[0][0]
+        raw = writer.written[-1]
         msg = json.loads(raw.decode().strip())
         cmd = msg["command"]
         assert isinstance(cmd, dict)
@@ -1772,38 +1482,27 @@ class TestIpcCommandFormat:
     """Verify positional-arg commands use array format and named-arg commands
     use object format — regression test for the mpv IPC fix."""
 
-    async def _resolve_after(self, mgr: MpvManager):
-        await asyncio.sleep(0.01)
-        rid = mgr._request_id
-        fut = mgr._pending.get(rid)
-        if fut and not fut.done():
-            fut.set_result(None)
-
     async def test_positional_command_uses_array_format(self):
         mgr = _make_manager()
-        writer = _attach_mock_writer(mgr)
+        writer = _attach_mock_writer(mgr, reply=None)
 
-        task = asyncio.create_task(self._resolve_after(mgr))
         await mgr._send(["loadfile", "http://example.com/stream"])
-        await task
 
-        raw = writer.write.call_args[0][0]
+        raw = writer.written[-1]
         msg = json.loads(raw.decode().strip())
         assert isinstance(msg["command"], list)
         assert msg["command"] == ["loadfile", "http://example.com/stream"]
 
     async def test_named_arg_command_uses_object_format(self):
         mgr = _make_manager()
-        writer = _attach_mock_writer(mgr)
+        writer = _attach_mock_writer(mgr, reply=None)
 
-        task = asyncio.create_task(self._resolve_after(mgr))
         await mgr._send(
             ["osd-overlay"],
             id=1, format="ass-events", data="test", res_x=1920, res_y=1080,
         )
-        await task
 
-        raw = writer.write.call_args[0][0]
+        raw = writer.written[-1]
         msg = json.loads(raw.decode().strip())
         assert isinstance(msg["command"], dict)
         assert msg["command"]["name"] == "osd-overlay"
@@ -1822,18 +1521,11 @@ class TestIdleOverlayIntegration:
     _build_idle_overlay appears intact as the 'data' field in the IPC JSON.
     """
 
-    async def _resolve_after(self, mgr: MpvManager):
-        await asyncio.sleep(0.01)
-        rid = mgr._request_id
-        fut = mgr._pending.get(rid)
-        if fut and not fut.done():
-            fut.set_result(None)
-
     @patch("pi_decoder.mpv_manager._get_version", return_value="2.0.0")
     async def test_build_and_push_idle_overlay_produces_valid_ipc(self, _mock_ver):
         cfg = _make_config(**{"web.port": 8080, "general.name": "TestDec"})
         mgr = _make_manager(cfg)
-        writer = _attach_mock_writer(mgr)
+        writer = _attach_mock_writer(mgr, reply=None)
 
         net = {
             "connection_type": "ethernet",
@@ -1844,11 +1536,9 @@ class TestIdleOverlayIntegration:
         }
         ass = mgr._build_idle_overlay(net)
 
-        task = asyncio.create_task(self._resolve_after(mgr))
         await mgr.set_overlay(63, ass)
-        await task
 
-        raw = writer.write.call_args[0][0]
+        raw = writer.written[-1]
         msg = json.loads(raw.decode().strip())
         cmd = msg["command"]
         assert isinstance(cmd, dict)
@@ -1867,7 +1557,7 @@ class TestIdleOverlayIntegration:
             "network.hotspot_password": "welcome123",
         })
         mgr = _make_manager(cfg)
-        writer = _attach_mock_writer(mgr)
+        writer = _attach_mock_writer(mgr, reply=None)
 
         net = {
             "connection_type": "hotspot",
@@ -1878,11 +1568,9 @@ class TestIdleOverlayIntegration:
         }
         ass = mgr._build_idle_overlay(net)
 
-        task = asyncio.create_task(self._resolve_after(mgr))
         await mgr.set_overlay(63, ass)
-        await task
 
-        raw = writer.write.call_args[0][0]
+        raw = writer.written[-1]
         msg = json.loads(raw.decode().strip())
         assert "Network: ChurchWiFi" in msg["command"]["data"]
         assert "Password: welcome123" in msg["command"]["data"]
@@ -1,32 +1,49 @@
 """Tests for PCO client."""
 
 import pytest
+from dataclasses import asdict
 from datetime import datetime, timezone, timedelta
-from unittest.mock import AsyncMock, MagicMock, patch
+from functools import lru_cache
+from types import MappingProxyType
+from unittest.mock import AsyncMock, MagicMock
 
 import httpx
 
 from pi_decoder.pco_client import LiveStatus, PCOClient
 from pi_decoder.config import Config
 
+# Fixed reference time for building timestamps; the parser only compares
+# them with each other or with times passed in explicitly.
+NOW = datetime(2025, 1, 12, 9, 30, tzinfo=timezone.utc)
+NOW_ISO = NOW.isoformat()
+
+
+_LIVE_STATUS_DEFAULTS = {
+    "is_live": False,
+    "finished": False,
+    "plan_title": "",
+    "item_title": "",
+    "item_description": "",
+    "item_end_time": None,
+    "service_end_time": None,
+    "remaining_items_length": 0.0,
+    "message": "",
+    "next_item_title": "",
+    "plan_index": 0,
+    "plan_length": 0,
+    "planned_service_end": None,
+    "service_position": "during",
+}
+
 
 class TestLiveStatus:
     """Test LiveStatus dataclass."""
 
     def test_default_values(self):
-        status = LiveStatus()
-        assert status.is_live is False
-        assert status.finished is False
-        assert status.plan_title == ""
-        assert status.item_title == ""
-        assert status.item_description == ""
-        assert status.item_end_time is None
-        assert status.service_end_time is None
-        assert status.remaining_items_length == 0.0
-        assert status.message == ""
+        assert asdict(LiveStatus()) == _LIVE_STATUS_DEFAULTS
 
     def test_custom_values(self):
-        now = datetime.now(timezone.utc)
+        now = NOW
         status = LiveStatus(
             is_live=True,
             plan_title="Sunday Service",
@@ -40,6 +57,16 @@ class TestLiveStatus:
         assert status.item_end_time == now
 
 
+def _make_pco_config(**pco) -> Config:
+    """Config with placeholder PCO credentials and the given pco overrides."""
+    cfg = Config()
+    cfg.pco.app_id = "test"
+    cfg.pco.secret = "test"
+    for attr, val in pco.items():
+        setattr(cfg.pco, attr, val)
+    return cfg
+
+
 class TestPCOClient:
     """Test PCOClient functionality."""
 
@@ -83,19 +110,12 @@ class TestPCOClient:
         # Initial cached status
         assert client.cached_status.message == "Initializing..."
 
-    def test_no_service_type_or_folder_returns_error(self):
+    async def test_no_service_type_or_folder_returns_error(self):
         """Neither folder_id nor service_type_id configured."""
-        cfg = Config()
-        cfg.pco.app_id = "test"
-        cfg.pco.secret = "test"
-        cfg.pco.service_type_id = ""
-        cfg.pco.folder_id = ""
+        cfg = _make_pco_config(service_type_id="", folder_id="")
         client = PCOClient(cfg)
 
-        import asyncio
-        status = asyncio.get_event_loop().run_until_complete(
-            client.get_live_status()
-        )
+        status = await client.get_live_status()
         assert "No service type configured" in status.message
 
     def test_folder_id_allows_get_live_status(self, folder_config):
@@ -106,6 +126,53 @@ class TestPCOClient:
         assert client._folder_id == "000000"
 
 
+@lru_cache(maxsize=None)
+def _item(item_id, title, length, position, item_type="item", description=None):
+    """Read-only Item object, cached so repeated specs share one instance."""
+    attrs = {"title": title}
+    if description is not None:
+        attrs["description"] = description
+    attrs.update(length=length, item_type=item_type, service_position=position)
+    return MappingProxyType({
+        "id": item_id,
+        "type": "Item",
+        "attributes": MappingProxyType(attrs),
+    })
+
+
+# Shared between tests; _parse_live_response only reads the included
+# objects, and the proxies make any accidental write fail loudly.
+_WORSHIP = _item("item-1", "Worship", 900, "during", item_type="song")
+_SERMON = _item("item-2", "Sermon", 1800, "during")
+_SOUND_CHECK = _item("item-pre", "Sound Check", 600, "pre")
+
+
+def _live_response(current_item_id, *items, live_start_at=NOW):
+    """Live response whose current ItemTime points at ``current_item_id``."""
+    return {
+        "data": {
+            "attributes": {"title": "Sunday Service"},
+            "links": {"controller": "/users/123"},
+            "relationships": {
+                "current_item_time": {
+                    "data": {"id": "item-time-1", "type": "ItemTime"}
+                }
+            },
+        },
+        "included": [
+            {
+                "id": "item-time-1",
+                "type": "ItemTime",
+                "attributes": {"live_start_at": live_start_at.isoformat()},
+                "relationships": {
+                    "item": {"data": {"id": current_item_id}}
+                },
+            },
+            *items,
+        ],
+    }
+
+
 class TestParseLiveResponse:
     """Test parsing of PCO Live API responses."""
 
@@ -154,16 +221,7 @@ class TestParseLiveResponse:
                 "relationships": {},
             },
             "included": [
-                {
-                    "id": "item-1",
-                    "type": "Item",
-                    "attributes": {
-                        "title": "Worship",
-                        "length": 900,
-                        "item_type": "song",
-                        "service_position": "during",
-                    },
-                },
+                _WORSHIP,
             ],
         }
         status = client._parse_live_response(response)
@@ -172,44 +230,12 @@ class TestParseLiveResponse:
 
     def test_parse_live_with_item(self, client):
         """Test parsing with an active item."""
-        now = datetime.now(timezone.utc)
-        service_start = now - timedelta(minutes=10)
-        response = {
-            "data": {
-                "attributes": {
-                    "title": "Sunday Service",
-                },
-                "links": {"controller": "/users/123"},
-                "relationships": {
-                    "current_item_time": {
-                        "data": {"id": "item-time-1", "type": "ItemTime"}
-                    }
-                },
-            },
-            "included": [
-                {
-                    "id": "item-time-1",
-                    "type": "ItemTime",
-                    "attributes": {
-                        "live_start_at": (now - timedelta(minutes=5)).isoformat(),
-                    },
-                    "relationships": {
-                        "item": {"data": {"id": "item-1"}}
-                    },
-                },
-                {
-                    "id": "item-1",
-                    "type": "Item",
-                    "attributes": {
-                        "title": "Worship",
-                        "description": "Opening songs",
-                        "length": 900,  # 15 minutes
-                        "item_type": "song",
-                        "service_position": "during",
-                    },
-                },
-            ],
-        }
+        service_start = NOW - timedelta(minutes=10)
+        worship = _item(
+            "item-1", "Worship", 900, "during",  # 15 minutes
+            item_type="song", description="Opening songs",
+        )
+        response = _live_response("item-1", worship, live_start_at=NOW - timedelta(minutes=5))
         status = client._parse_live_response(response, service_start=service_start)
         assert status.is_live is True
         assert status.item_title == "Worship"
@@ -220,7 +246,7 @@ class TestParseLiveResponse:
 
     def test_parse_filters_during_items_only(self, client):
         """Verify pre-service items are excluded from totals."""
-        now = datetime.now(timezone.utc)
+        now = NOW
         service_start = now - timedelta(minutes=5)
         response = {
             "data": {
@@ -244,49 +270,13 @@ class TestParseLiveResponse:
                     },
                 },
                 # Pre-service item — should be excluded
-                {
-                    "id": "item-pre",
-                    "type": "Item",
-                    "attributes": {
-                        "title": "Sound Check",
-                        "length": 600,
-                        "item_type": "item",
-                        "service_position": "pre",
-                    },
-                },
+                _SOUND_CHECK,
                 # During-service item (current)
-                {
-                    "id": "item-during",
-                    "type": "Item",
-                    "attributes": {
-                        "title": "Worship",
-                        "length": 900,
-                        "item_type": "song",
-                        "service_position": "during",
-                    },
-                },
+                _item("item-during", "Worship", 900, "during", item_type="song"),
                 # Post-service item — should be excluded
-                {
-                    "id": "item-post",
-                    "type": "Item",
-                    "attributes": {
-                        "title": "Cleanup",
-                        "length": 300,
-                        "item_type": "item",
-                        "service_position": "post",
-                    },
-                },
+                _item("item-post", "Cleanup", 300, "post"),
                 # Header item — should be excluded
-                {
-                    "id": "item-header",
-                    "type": "Item",
-                    "attributes": {
-                        "title": "Section Header",
-                        "length": 0,
-                        "item_type": "header",
-                        "service_position": "during",
-                    },
-                },
+                _item("item-header", "Section Header", 0, "during", item_type="header"),
             ],
         }
         status = client._parse_live_response(response, service_start=service_start)
@@ -311,7 +301,7 @@ class TestParseLiveResponse:
                     "id": "item-time-1",
                     "type": "ItemTime",
                     "attributes": {
-                        "live_start_at": datetime.now(timezone.utc).isoformat(),
+                        "live_start_at": NOW_ISO,
                     },
                     "relationships": {
                         # item relationship is null — PlanTime-level countdown
@@ -335,231 +325,62 @@ class TestParseLiveResponse:
                 "relationships": {},
             },
             "included": [
-                {
-                    "id": "item-1",
-                    "type": "Item",
-                    "attributes": {
-                        "title": "Worship",
-                        "length": 900,
-                        "item_type": "song",
-                        "service_position": "during",
-                    },
-                },
+                _WORSHIP,
             ],
         }
         status = client._parse_live_response(response)
         assert status.is_live is True
         assert status.finished is True
 
-    def test_planned_service_end_prefers_planned_end(self, client):
-        """planned_service_end uses PlanTime ends_at when available."""
-        now = datetime.now(timezone.utc)
-        service_start = now - timedelta(minutes=10)
-        planned_end = now + timedelta(minutes=50)
-        response = {
-            "data": {
-                "attributes": {"title": "Sunday Service"},
-                "links": {"controller": "/users/123"},
-                "relationships": {
-                    "current_item_time": {
-                        "data": {"id": "item-time-1", "type": "ItemTime"}
-                    }
-                },
-            },
-            "included": [
-                {
-                    "id": "item-time-1",
-                    "type": "ItemTime",
-                    "attributes": {
-                        "live_start_at": (now - timedelta(minutes=5)).isoformat(),
-                    },
-                    "relationships": {
-                        "item": {"data": {"id": "item-1"}}
-                    },
-                },
-                {
-                    "id": "item-1",
-                    "type": "Item",
-                    "attributes": {
-                        "title": "Worship",
-                        "length": 900,
-                        "item_type": "song",
-                        "service_position": "during",
-                    },
-                },
-            ],
-        }
+    @pytest.mark.parametrize(
+        "items, service_start, planned_end, expected",
+        [
+            pytest.param(
+                (_WORSHIP,), NOW - timedelta(minutes=10), NOW + timedelta(minutes=50),
+                NOW + timedelta(minutes=50),
+                id="prefers-planned-end",
+            ),
+            pytest.param(
+                (_WORSHIP, _SERMON), NOW - timedelta(minutes=10), None,
+                NOW - timedelta(minutes=10) + timedelta(seconds=900 + 1800),
+                id="falls-back-to-items-sum",
+            ),
+            pytest.param(
+                (_WORSHIP,), None, None, None,
+                id="none-without-service-start",
+            ),
+        ],
+    )
+    def test_planned_service_end(self, client, items, service_start, planned_end, expected):
+        """PlanTime ends_at wins, then service_start + during items, else None."""
+        response = _live_response("item-1", *items, live_start_at=NOW - timedelta(minutes=5))
         status = client._parse_live_response(
             response, service_start=service_start, planned_end=planned_end,
         )
-        # Should use planned_end, not service_start + items sum
-        assert status.planned_service_end == planned_end
-
-    def test_planned_service_end_fallback_to_items_sum(self, client):
-        """planned_service_end falls back to service_start + items when no planned_end."""
-        now = datetime.now(timezone.utc)
-        service_start = now - timedelta(minutes=10)
-        response = {
-            "data": {
-                "attributes": {"title": "Sunday Service"},
-                "links": {"controller": "/users/123"},
-                "relationships": {
-                    "current_item_time": {
-                        "data": {"id": "item-time-1", "type": "ItemTime"}
-                    }
-                },
-            },
-            "included": [
-                {
-                    "id": "item-time-1",
-                    "type": "ItemTime",
-                    "attributes": {
-                        "live_start_at": (now - timedelta(minutes=5)).isoformat(),
-                    },
-                    "relationships": {
-                        "item": {"data": {"id": "item-1"}}
-                    },
-                },
-                {
-                    "id": "item-1",
-                    "type": "Item",
-                    "attributes": {
-                        "title": "Worship",
-                        "length": 900,
-                        "item_type": "song",
-                        "service_position": "during",
-                    },
-                },
-                {
-                    "id": "item-2",
-                    "type": "Item",
-                    "attributes": {
-                        "title": "Sermon",
-                        "length": 1800,
-                        "item_type": "item",
-                        "service_position": "during",
-                    },
-                },
-            ],
-        }
-        # No planned_end → falls back to service_start + sum(during items)
-        status = client._parse_live_response(response, service_start=service_start)
-        # 900 + 1800 = 2700 seconds total
-        assert status.planned_service_end == service_start + timedelta(seconds=2700)
-
-    def test_planned_service_end_none_without_service_start(self, client):
-        """planned_service_end is None when no service_start provided."""
-        now = datetime.now(timezone.utc)
-        response = {
-            "data": {
-                "attributes": {"title": "Sunday Service"},
-                "links": {"controller": "/users/123"},
-                "relationships": {
-                    "current_item_time": {
-                        "data": {"id": "item-time-1", "type": "ItemTime"}
-                    }
-                },
-            },
-            "included": [
-                {
-                    "id": "item-time-1",
-                    "type": "ItemTime",
-                    "attributes": {
-                        "live_start_at": now.isoformat(),
-                    },
-                    "relationships": {
-                        "item": {"data": {"id": "item-1"}}
-                    },
-                },
-                {
-                    "id": "item-1",
-                    "type": "Item",
-                    "attributes": {
-                        "title": "Worship",
-                        "length": 900,
-                        "item_type": "song",
-                        "service_position": "during",
-                    },
-                },
-            ],
-        }
-        # No service_start → planned_service_end should be None
-        status = client._parse_live_response(response, service_start=None)
-        assert status.planned_service_end is None
+        assert status.planned_service_end == expected
 
     def test_pre_service_item_gives_full_remaining(self, client):
         """Current item is pre-service → remaining = all during items, item_end_time = None."""
-        now = datetime.now(timezone.utc)
-        planned_end = now + timedelta(minutes=60)
-        response = {
-            "data": {
-                "attributes": {"title": "Sunday Service"},
-                "links": {"controller": "/users/123"},
-                "relationships": {
-                    "current_item_time": {
-                        "data": {"id": "item-time-1", "type": "ItemTime"}
-                    }
-                },
-            },
-            "included": [
-                {
-                    "id": "item-time-1",
-                    "type": "ItemTime",
-                    "attributes": {
-                        "live_start_at": now.isoformat(),
-                    },
-                    "relationships": {
-                        "item": {"data": {"id": "item-pre"}}
-                    },
-                },
-                {
-                    "id": "item-pre",
-                    "type": "Item",
-                    "attributes": {
-                        "title": "Sound Check",
-                        "length": 600,
-                        "item_type": "item",
-                        "service_position": "pre",
-                    },
-                },
-                {
-                    "id": "item-1",
-                    "type": "Item",
-                    "attributes": {
-                        "title": "Worship",
-                        "length": 900,
-                        "item_type": "song",
-                        "service_position": "during",
-                    },
-                },
-                {
-                    "id": "item-2",
-                    "type": "Item",
-                    "attributes": {
-                        "title": "Sermon",
-                        "length": 1800,
-                        "item_type": "item",
-                        "service_position": "during",
-                    },
-                },
-            ],
-        }
+        planned_end = NOW + timedelta(minutes=60)
+        response = _live_response("item-pre", _SOUND_CHECK, _WORSHIP, _SERMON)
         status = client._parse_live_response(
-            response, service_start=now - timedelta(minutes=5), planned_end=planned_end,
+            response, service_start=NOW - timedelta(minutes=5), planned_end=planned_end,
         )
-        assert status.is_live is True
-        assert status.item_title == "Sound Check"
-        assert status.item_end_time is None
-        assert status.remaining_items_length == 2700  # 900 + 1800
-        assert status.service_end_time == planned_end
-        assert status.next_item_title == "Worship"
-        assert status.plan_index == 0
-        assert status.plan_length == 2
-        assert status.service_position == "pre"
+        expected = {
+            "is_live": True,
+            "item_title": "Sound Check",
+            "item_end_time": None,
+            "remaining_items_length": 2700,  # 900 + 1800
+            "service_end_time": planned_end,
+            "next_item_title": "Worship",
+            "plan_index": 0,
+            "plan_length": 2,
+            "service_position": "pre",
+        }
+        assert {k: getattr(status, k) for k in expected} == expected
 
     def test_post_service_item_gives_zero_remaining(self, client):
         """Current item is post-service → remaining = 0, item_end_time = None."""
-        now = datetime.now(timezone.utc)
         response = {
             "data": {
                 "attributes": {"title": "Sunday Service"},
@@ -575,134 +396,101 @@ class TestParseLiveResponse:
                     "id": "item-time-1",
                     "type": "ItemTime",
                     "attributes": {
-                        "live_start_at": now.isoformat(),
+                        "live_start_at": NOW_ISO,
                     },
                     "relationships": {
                         "item": {"data": {"id": "item-post"}}
                     },
                 },
-                {
-                    "id": "item-post",
-                    "type": "Item",
-                    "attributes": {
-                        "title": "Cleanup",
-                        "length": 300,
-                        "item_type": "item",
-                        "service_position": "post",
-                    },
-                },
-                {
-                    "id": "item-1",
-                    "type": "Item",
-                    "attributes": {
-                        "title": "Worship",
-                        "length": 900,
-                        "item_type": "song",
-                        "service_position": "during",
-                    },
-                },
+                _item("item-post", "Cleanup", 300, "post"),
+                _WORSHIP,
             ],
         }
         status = client._parse_live_response(response)
-        assert status.is_live is True
-        assert status.item_title == "Cleanup"
-        assert status.item_end_time is None
-        assert status.remaining_items_length == 0
-        assert status.service_end_time is None
-        assert status.next_item_title == ""
-        assert status.plan_index == 1  # len(during items)
-        assert status.plan_length == 1
-        assert status.service_position == "post"
+        expected = {
+            "is_live": True,
+            "item_title": "Cleanup",
+            "item_end_time": None,
+            "remaining_items_length": 0,
+            "service_end_time": None,
+            "next_item_title": "",
+            "plan_index": 1,  # len(during items)
+            "plan_length": 1,
+            "service_position": "post",
+        }
+        assert {k: getattr(status, k) for k in expected} == expected
+
+
+_PT_REHEARSAL = {
+    "type": "PlanTime",
+    "attributes": {"time_type": "rehearsal", "starts_at": "2025-01-12T08:00:00Z"},
+}
+_PT_SERVICE = {
+    "type": "PlanTime",
+    "attributes": {
+        "time_type": "service",
+        "starts_at": "2025-01-12T09:30:00Z",
+        "ends_at": "2025-01-12T11:00:00Z",
+    },
+}
+_PT_SERVICE_NO_END = {
+    "type": "PlanTime",
+    "attributes": {"time_type": "service", "starts_at": "2025-01-12T09:30:00Z"},
+}
 
 
 class TestExtractServiceTimes:
     """Test PlanTime parsing for service start and end."""
 
-    def test_extract_service_times(self):
-        plan_times = [
-            {
-                "type": "PlanTime",
-                "attributes": {
-                    "time_type": "rehearsal",
-                    "starts_at": "2025-01-12T08:00:00Z",
-                },
-            },
-            {
-                "type": "PlanTime",
-                "attributes": {
-                    "time_type": "service",
-                    "starts_at": "2025-01-12T09:30:00Z",
-                    "ends_at": "2025-01-12T11:00:00Z",
-                },
-            },
-        ]
-        start, end = PCOClient._extract_service_times(plan_times)
-        assert start == datetime(2025, 1, 12, 9, 30, tzinfo=timezone.utc)
-        assert end == datetime(2025, 1, 12, 11, 0, tzinfo=timezone.utc)
-
-    def test_extract_service_times_no_ends_at(self):
-        """PlanTime without ends_at returns (start, None)."""
-        plan_times = [
-            {
-                "type": "PlanTime",
-                "attributes": {
-                    "time_type": "service",
-                    "starts_at": "2025-01-12T09:30:00Z",
-                },
-            },
-        ]
-        start, end = PCOClient._extract_service_times(plan_times)
-        assert start == datetime(2025, 1, 12, 9, 30, tzinfo=timezone.utc)
-        assert end is None
-
-    def test_extract_service_times_no_service_time(self):
-        plan_times = [
-            {
-                "type": "PlanTime",
-                "attributes": {
-                    "time_type": "rehearsal",
-                    "starts_at": "2025-01-12T08:00:00Z",
-                },
-            },
-        ]
-        start, end = PCOClient._extract_service_times(plan_times)
-        assert start is None
-        assert end is None
-
-    def test_extract_service_times_empty(self):
-        start, end = PCOClient._extract_service_times([])
-        assert start is None
-        assert end is None
+    @pytest.mark.parametrize(
+        "plan_times, expected",
+        [
+            (
+                [_PT_REHEARSAL, _PT_SERVICE],
+                (
+                    datetime(2025, 1, 12, 9, 30, tzinfo=timezone.utc),
+                    datetime(2025, 1, 12, 11, 0, tzinfo=timezone.utc),
+                ),
+            ),
+            ([_PT_SERVICE_NO_END], (datetime(2025, 1, 12, 9, 30, tzinfo=timezone.utc), None)),
+            ([_PT_REHEARSAL], (None, None)),
+            ([], (None, None)),
+        ],
+        ids=["full", "no_ends_at", "no_service", "empty"],
+    )
+    def test_extract_service_times(self, plan_times, expected):
+        """Only the service PlanTime counts; a missing ends_at gives (start, None)."""
+        assert PCOClient._extract_service_times(plan_times) == expected
 
 
 class TestUpcomingStatus:
     """Test upcoming plan status generation."""
 
     def test_future_plan_shows_next(self):
-        now = datetime.now(timezone.utc)
+        now = NOW
         plan = {
             "attributes": {
                 "title": "Next Sunday",
                 "sort_date": (now + timedelta(days=1)).isoformat(),
             }
         }
-        status = PCOClient._upcoming_status(plan)
+        status = PCOClient._upcoming_status(plan, now=NOW)
         assert "Next: Next Sunday" in status.message
 
     def test_soon_plan_shows_countdown(self):
-        now = datetime.now(timezone.utc)
+        now = NOW
         plan = {
             "attributes": {
                 "title": "Soon Service",
                 "sort_date": (now + timedelta(minutes=30)).isoformat(),
             }
         }
-        status = PCOClient._upcoming_status(plan)
+        status = PCOClient._upcoming_status(plan, now=NOW)
         assert "Starts in" in status.message
 
     def test_soon_plan_uses_service_start_when_provided(self):
         """Verify service_start (PlanTime) is used over sort_date."""
-        now = datetime.now(timezone.utc)
+        now = NOW
         # sort_date is 2 hours away (would show "Next:")
         plan = {
             "attributes": {
@@ -712,21 +500,32 @@ class TestUpcomingStatus:
         }
         # But actual service_start is 30 minutes away
         service_start = now + timedelta(minutes=30)
-        status = PCOClient._upcoming_status(plan, service_start=service_start)
+        status = PCOClient._upcoming_status(plan, service_start=service_start, now=NOW)
         assert "Starts in" in status.message
 
     def test_past_plan_not_live(self):
-        now = datetime.now(timezone.utc)
+        now = NOW
         plan = {
             "attributes": {
                 "title": "Past Service",
                 "sort_date": (now - timedelta(minutes=10)).isoformat(),
             }
         }
-        status = PCOClient._upcoming_status(plan)
+        status = PCOClient._upcoming_status(plan, now=NOW)
         assert status.message == "Not live"
 
 
+def _mock_http(handler):
+    """Real AsyncClient whose requests are answered in-process by ``handler``."""
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+def _raise(exc):
+    def handler(request):
+        raise exc
+    return handler
+
+
 class TestTestConnection:
     """Test the test_connection() method with mocked HTTP."""
 
@@ -734,107 +533,67 @@ class TestTestConnection:
     def client(self, pco_config):
         return PCOClient(pco_config)
 
-    @pytest.mark.asyncio
     async def test_success(self, client):
-        mock_resp = MagicMock()
-        mock_resp.status_code = 200
-        mock_resp.raise_for_status = MagicMock()
-        mock_resp.json.return_value = {
+        body = {
             "data": [
                 {"id": "1", "attributes": {"name": "Sunday", "frequency": "Weekly"}},
             ]
         }
-        mock_http = AsyncMock()
-        mock_http.get = AsyncMock(return_value=mock_resp)
-        mock_http.is_closed = False
-        client._client = mock_http
+        client._client = _mock_http(lambda request: httpx.Response(200, json=body))
 
         result = await client.test_connection()
         assert result["success"] is True
         assert len(result["service_types"]) == 1
         assert result["service_types"][0]["name"] == "Sunday"
 
-    @pytest.mark.asyncio
     async def test_401_auth_failure(self, client):
-        mock_resp = MagicMock()
-        mock_resp.status_code = 401
-        mock_http = AsyncMock()
-        mock_http.get = AsyncMock(return_value=mock_resp)
-        mock_http.is_closed = False
-        client._client = mock_http
+        client._client = _mock_http(lambda request: httpx.Response(401))
 
         result = await client.test_connection()
         assert result["success"] is False
         assert "401" in result["error"]
 
-    @pytest.mark.asyncio
     async def test_timeout(self, client):
-        mock_http = AsyncMock()
-        mock_http.get = AsyncMock(side_effect=httpx.TimeoutException("timed out"))
-        mock_http.is_closed = False
-        client._client = mock_http
+        client._client = _mock_http(_raise(httpx.TimeoutException("timed out")))
 
         result = await client.test_connection()
         assert result["success"] is False
         assert "timeout" in result["error"].lower()
 
-    @pytest.mark.asyncio
     async def test_connect_error(self, client):
-        mock_http = AsyncMock()
-        mock_http.get = AsyncMock(side_effect=httpx.ConnectError("refused"))
-        mock_http.is_closed = False
-        client._client = mock_http
+        client._client = _mock_http(_raise(httpx.ConnectError("refused")))
 
         result = await client.test_connection()
         assert result["success"] is False
         assert "Connection error" in result["error"]
 
-    @pytest.mark.asyncio
     async def test_http_500_error(self, client):
-        mock_resp = MagicMock()
-        mock_resp.status_code = 500
-        mock_resp.raise_for_status = MagicMock(
-            side_effect=httpx.HTTPStatusError("500", request=MagicMock(), response=mock_resp)
-        )
-        mock_http = AsyncMock()
-        mock_http.get = AsyncMock(return_value=mock_resp)
-        mock_http.is_closed = False
-        client._client = mock_http
+        client._client = _mock_http(lambda request: httpx.Response(500))
 
         result = await client.test_connection()
         assert result["success"] is False
+        assert "500" in result["error"]
 
 
 class TestGetServiceTypes:
     """Test get_service_types() delegates to test_connection."""
 
-    @pytest.mark.asyncio
     async def test_returns_service_types(self, pco_config):
         client = PCOClient(pco_config)
-        mock_resp = MagicMock()
-        mock_resp.status_code = 200
-        mock_resp.raise_for_status = MagicMock()
-        mock_resp.json.return_value = {
+        body = {
             "data": [
                 {"id": "1", "attributes": {"name": "Sunday", "frequency": "Weekly"}},
                 {"id": "2", "attributes": {"name": "Wednesday", "frequency": "Weekly"}},
             ]
         }
-        mock_http = AsyncMock()
-        mock_http.get = AsyncMock(return_value=mock_resp)
-        mock_http.is_closed = False
-        client._client = mock_http
+        client._client = _mock_http(lambda request: httpx.Response(200, json=body))
 
         types = await client.get_service_types()
         assert len(types) == 2
 
-    @pytest.mark.asyncio
     async def test_returns_empty_on_error(self, pco_config):
         client = PCOClient(pco_config)
-        mock_http = AsyncMock()
-        mock_http.get = AsyncMock(side_effect=httpx.TimeoutException("timeout"))
-        mock_http.is_closed = False
-        client._client = mock_http
+        client._client = _mock_http(_raise(httpx.TimeoutException("timeout")))
 
         types = await client.get_service_types()
         assert types == []
@@ -843,60 +602,32 @@ class TestGetServiceTypes:
 class TestServiceTypeDiscovery:
     """Test _get_service_type_ids() for folder vs service_type mode."""
 
-    @pytest.mark.asyncio
     async def test_service_type_mode_returns_single_id(self, pco_config):
         client = PCOClient(pco_config)
         ids = await client._get_service_type_ids()
         assert ids == ["12345"]
 
-    @pytest.mark.asyncio
     async def test_folder_mode_fetches_from_api(self):
-        cfg = Config()
-        cfg.pco.app_id = "test"
-        cfg.pco.secret = "test"
-        cfg.pco.folder_id = "999"
-        cfg.pco.search_mode = "folder"
+        cfg = _make_pco_config(folder_id="999", search_mode="folder")
         client = PCOClient(cfg)
 
-        mock_resp = MagicMock()
-        mock_resp.status_code = 200
-        mock_resp.raise_for_status = MagicMock()
-        mock_resp.json.return_value = {
-            "data": [{"id": "10"}, {"id": "20"}]
-        }
-        mock_http = AsyncMock()
-        mock_http.get = AsyncMock(return_value=mock_resp)
-        mock_http.is_closed = False
-        client._client = mock_http
+        body = {"data": [{"id": "10"}, {"id": "20"}]}
+        client._client = _mock_http(lambda request: httpx.Response(200, json=body))
 
         ids = await client._get_service_type_ids()
         assert ids == ["10", "20"]
 
-    @pytest.mark.asyncio
     async def test_folder_mode_returns_empty_on_error(self):
-        cfg = Config()
-        cfg.pco.app_id = "test"
-        cfg.pco.secret = "test"
-        cfg.pco.folder_id = "999"
-        cfg.pco.search_mode = "folder"
+        cfg = _make_pco_config(folder_id="999", search_mode="folder")
         client = PCOClient(cfg)
 
-        mock_http = AsyncMock()
-        mock_http.get = AsyncMock(side_effect=Exception("network error"))
-        mock_http.is_closed = False
-        client._client = mock_http
+        client._client = _mock_http(_raise(Exception("network error")))
 
         ids = await client._get_service_type_ids()
         assert ids == []
 
-    @pytest.mark.asyncio
     async def test_no_config_returns_empty(self):
-        cfg = Config()
-        cfg.pco.app_id = "test"
-        cfg.pco.secret = "test"
-        cfg.pco.service_type_id = ""
-        cfg.pco.folder_id = ""
-        cfg.pco.search_mode = "service_type"
+        cfg = _make_pco_config(service_type_id="", folder_id="", search_mode="service_type")
         client = PCOClient(cfg)
 
         ids = await client._get_service_type_ids()
@@ -906,121 +637,118 @@ class TestServiceTypeDiscovery:
 class TestGetLiveStatus:
     """Test get_live_status() error handling."""
 
-    @pytest.mark.asyncio
     async def test_no_folder_configured(self):
-        cfg = Config()
-        cfg.pco.app_id = "test"
-        cfg.pco.secret = "test"
-        cfg.pco.folder_id = ""
-        cfg.pco.search_mode = "folder"
+        cfg = _make_pco_config(folder_id="", search_mode="folder")
         client = PCOClient(cfg)
 
         status = await client.get_live_status()
         assert "No folder ID" in status.message
 
-    @pytest.mark.asyncio
     async def test_no_service_type_configured(self):
-        cfg = Config()
-        cfg.pco.app_id = "test"
-        cfg.pco.secret = "test"
-        cfg.pco.service_type_id = ""
-        cfg.pco.search_mode = "service_type"
+        cfg = _make_pco_config(service_type_id="", search_mode="service_type")
         client = PCOClient(cfg)
 
         status = await client.get_live_status()
         assert "No service type" in status.message
 
-    @pytest.mark.asyncio
-    async def test_returns_cached_on_http_error(self, pco_config):
+    @pytest.mark.parametrize(
+        "exc",
+        [httpx.TimeoutException("timeout"), KeyError("missing")],
+        ids=["http_error", "parse_error"],
+    )
+    async def test_returns_cached_on_error(self, pco_config, exc, monkeypatch):
         client = PCOClient(pco_config)
         client._cached_status = LiveStatus(message="cached value")
 
-        with patch.object(client, "_fetch_live_status", side_effect=httpx.TimeoutException("timeout")):
-            status = await client.get_live_status()
+        async def _fail():
+            raise exc
+
+        monkeypatch.setattr(client, "_fetch_live_status", _fail)
+        status = await client.get_live_status()
         assert status.message == "cached value"
 
-    @pytest.mark.asyncio
-    async def test_returns_cached_on_parse_error(self, pco_config):
-        client = PCOClient(pco_config)
-        client._cached_status = LiveStatus(message="cached value")
 
-        with patch.object(client, "_fetch_live_status", side_effect=KeyError("missing")):
-            status = await client.get_live_status()
-        assert status.message == "cached value"
+class _HttpStub:
+    """Stand-in for httpx.AsyncClient that counts aclose() calls."""
+
+    __slots__ = ("is_closed", "aclose_count")
+
+    def __init__(self, is_closed: bool = False) -> None:
+        self.is_closed = is_closed
+        self.aclose_count = 0
+
+    async def aclose(self) -> None:
+        self.aclose_count += 1
+        self.is_closed = True
 
 
 class TestClose:
     """Test client cleanup."""
 
-    @pytest.mark.asyncio
     async def test_close_closes_http_client(self, pco_config):
         client = PCOClient(pco_config)
-        mock_http = AsyncMock()
-        mock_http.is_closed = False
-        mock_http.aclose = AsyncMock()
-        client._client = mock_http
+        http = _HttpStub()
+        client._client = http
 
         await client.close()
-        mock_http.aclose.assert_awaited_once()
+        assert http.aclose_count == 1
 
-    @pytest.mark.asyncio
     async def test_close_noop_when_no_client(self, pco_config):
         client = PCOClient(pco_config)
         client._client = None
         # Should not raise
         await client.close()
 
-    @pytest.mark.asyncio
     async def test_close_noop_when_already_closed(self, pco_config):
         client = PCOClient(pco_config)
-        mock_http = AsyncMock()
-        mock_http.is_closed = True
-        client._client = mock_http
-        # Should not call aclose
+        http = _HttpStub(is_closed=True)
+        client._client = http
+
         await client.close()
+        assert http.aclose_count == 0
 
 
 class TestCircuitBreaker:
     """Test circuit breaker: exponential backoff after consecutive failures."""
 
-    def test_record_failure_increments_count(self, pco_config):
+    CLOCK = 1000.0
+
+    @pytest.fixture
+    def client(self, pco_config):
         client = PCOClient(pco_config)
+        client._clock = lambda: self.CLOCK
+        return client
+
+    def test_record_failure_increments_count(self, client):
         assert client._consecutive_failures == 0
         client._record_failure()
         assert client._consecutive_failures == 1
         # Below threshold — no backoff
         assert client._backoff_until == 0.0
 
-    def test_circuit_breaker_activates_at_threshold(self, pco_config):
-        import time
-        client = PCOClient(pco_config)
+    def test_circuit_breaker_activates_at_threshold(self, client):
         for _ in range(5):
             client._record_failure()
         assert client._consecutive_failures == 5
-        assert client._backoff_until > time.monotonic() - 1
+        # backoff = 2^(5-5) = 1
+        assert client._backoff_until == self.CLOCK + 1
 
-    def test_exponential_backoff_scales(self, pco_config):
-        import time
-        client = PCOClient(pco_config)
+    def test_exponential_backoff_scales(self, client):
         client._consecutive_failures = 6  # already past threshold
         client._record_failure()  # now 7 failures
         # backoff = min(2^(7-5), 300) = min(4, 300) = 4
         expected_backoff = 4
-        assert client._backoff_until == pytest.approx(time.monotonic() + expected_backoff, abs=1.0)
+        assert client._backoff_until == self.CLOCK + expected_backoff
 
-    @pytest.mark.asyncio
-    async def test_circuit_breaker_skips_poll(self, pco_config):
-        import time
-        client = PCOClient(pco_config)
+    async def test_circuit_breaker_skips_poll(self, client):
         client._consecutive_failures = 5
-        client._backoff_until = time.monotonic() + 300  # far in the future
+        client._backoff_until = self.CLOCK + 300  # far in the future
         client._cached_status = LiveStatus(message="cached during backoff")
 
         status = await client.get_live_status()
         assert status.message == "cached during backoff"
 
-    def test_update_credentials_resets_circuit_breaker(self, pco_config):
-        client = PCOClient(pco_config)
+    def test_update_credentials_resets_circuit_breaker(self, client):
         client._consecutive_failures = 10
         client._backoff_until = 99999.0
         client.update_credentials("new", "new", "1")
@@ -1031,17 +759,16 @@ class TestCircuitBreaker:
 class TestFindBestLivePlan:
     """Test _find_best_live_plan() across multiple service types."""
 
-    @pytest.mark.asyncio
     async def test_finds_most_recent_live_plan(self, pco_config):
         """Should pick the plan with the most recent live_start_at."""
         client = PCOClient(pco_config)
-        now = datetime.now(timezone.utc)
+        now = NOW
         older_start = (now - timedelta(hours=2)).isoformat()
         newer_start = (now - timedelta(minutes=30)).isoformat()
 
         plans_resp = MagicMock()
         plans_resp.status_code = 200
-        plans_resp.raise_for_status = MagicMock()
+        plans_resp.raise_for_status = lambda: None
         plans_resp.json.return_value = {
             "data": [
                 {"id": "plan-old", "relationships": {"plan_times": {"data": []}}},
@@ -1078,12 +805,11 @@ class TestFindBestLivePlan:
         assert result is not None
         assert result[0] == "plan-new"
 
-    @pytest.mark.asyncio
     async def test_returns_none_when_no_live_plans(self, pco_config):
         client = PCOClient(pco_config)
         plans_resp = MagicMock()
         plans_resp.status_code = 200
-        plans_resp.raise_for_status = MagicMock()
+        plans_resp.raise_for_status = lambda: None
         plans_resp.json.return_value = {"data": [], "included": []}
 
         mock_http = AsyncMock()
@@ -1094,7 +820,6 @@ class TestFindBestLivePlan:
         result = await client._find_best_live_plan()
         assert result is None
 
-    @pytest.mark.asyncio
     async def test_returns_none_on_auth_failure(self, pco_config):
         client = PCOClient(pco_config)
         plans_resp = MagicMock()
@@ -1113,15 +838,14 @@ class TestFindBestLivePlan:
 class TestPollLive:
     """Test _poll_live() parsing for a locked plan."""
 
-    @pytest.mark.asyncio
     async def test_poll_live_returns_parsed_status(self, pco_config):
         client = PCOClient(pco_config)
         client._locked_st_id = "12345"
-        now = datetime.now(timezone.utc)
+        now = NOW
 
         mock_resp = MagicMock()
         mock_resp.status_code = 200
-        mock_resp.raise_for_status = MagicMock()
+        mock_resp.raise_for_status = lambda: None
         mock_resp.json.return_value = {
             "data": {
                 "attributes": {"title": "Sunday Service"},
@@ -1136,13 +860,7 @@ class TestPollLive:
                     "attributes": {"live_start_at": (now - timedelta(minutes=5)).isoformat()},
                     "relationships": {"item": {"data": {"id": "item-1"}}},
                 },
-                {
-                    "id": "item-1", "type": "Item",
-                    "attributes": {
-                        "title": "Worship", "length": 900,
-                        "item_type": "song", "service_position": "during",
-                    },
-                },
+                _WORSHIP,
             ],
         }
 
@@ -1156,7 +874,6 @@ class TestPollLive:
         assert status.item_title == "Worship"
         assert status.plan_title == "Sunday Service"
 
-    @pytest.mark.asyncio
     async def test_poll_live_404_returns_not_found(self, pco_config):
         client = PCOClient(pco_config)
         mock_resp = MagicMock()
@@ -1174,18 +891,16 @@ class TestPollLive:
 class TestFetchLiveStatus:
     """Test _fetch_live_status() plan locking flow."""
 
-    @pytest.mark.asyncio
     async def test_locked_plan_polls_directly(self, pco_config):
         """When locked, should poll the locked plan without re-discovering."""
         client = PCOClient(pco_config)
         client._locked_plan_id = "plan-1"
         client._locked_st_id = "12345"
-        client._locked_live_start_at = datetime.now(timezone.utc)
+        client._locked_live_start_at = NOW
 
-        now = datetime.now(timezone.utc)
         mock_resp = MagicMock()
         mock_resp.status_code = 200
-        mock_resp.raise_for_status = MagicMock()
+        mock_resp.raise_for_status = lambda: None
         mock_resp.json.return_value = {
             "data": {
                 "attributes": {"title": "Locked Service"},
@@ -1197,16 +912,10 @@ class TestFetchLiveStatus:
             "included": [
                 {
                     "id": "it-1", "type": "ItemTime",
-                    "attributes": {"live_start_at": now.isoformat()},
+                    "attributes": {"live_start_at": NOW_ISO},
                     "relationships": {"item": {"data": {"id": "item-1"}}},
                 },
-                {
-                    "id": "item-1", "type": "Item",
-                    "attributes": {
-                        "title": "Sermon", "length": 1800,
-                        "item_type": "item", "service_position": "during",
-                    },
-                },
+                _item("item-1", "Sermon", 1800, "during"),
             ],
         }
 
@@ -1221,7 +930,6 @@ class TestFetchLiveStatus:
         # Should still be locked
         assert client._locked_plan_id == "plan-1"
 
-    @pytest.mark.asyncio
     async def test_unlocks_when_session_ends(self, pco_config):
         """When locked plan is no longer live, should unlock and re-discover."""
         client = PCOClient(pco_config)
@@ -1231,7 +939,7 @@ class TestFetchLiveStatus:
         # Live endpoint returns not-live status (no current_item_time)
         live_resp = MagicMock()
         live_resp.status_code = 200
-        live_resp.raise_for_status = MagicMock()
+        live_resp.raise_for_status = lambda: None
         live_resp.json.return_value = {
             "data": {
                 "attributes": {"title": "Ended Service"},
@@ -1244,7 +952,7 @@ class TestFetchLiveStatus:
         # Plans endpoint for re-discovery (no live plans found)
         plans_resp = MagicMock()
         plans_resp.status_code = 200
-        plans_resp.raise_for_status = MagicMock()
+        plans_resp.raise_for_status = lambda: None
         plans_resp.json.return_value = {"data": [], "included": []}
 
         mock_http = AsyncMock()
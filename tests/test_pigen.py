@@ -1,8 +1,69 @@
 """Tests for pi-gen build configuration."""
 
-import pytest
-from pathlib import Path
+import os
 import stat
+from pathlib import Path
+
+import pytest
+
+# Paths relative to deploy/pi-gen, the keys of the pigen_stat/pigen_files fixtures
+_CONFIG = Path("config")
+_BUILD_SH = Path("build.sh")
+_STAGE = Path("stage-pi-decoder")
+_DEPENDS = _STAGE / "DEPENDS"
+_PACKAGES = _STAGE / "00-install-packages" / "00-packages"
+_INSTALL_APP_SH = _STAGE / "01-install-app" / "00-run.sh"
+_CONFIGURE_SH = _STAGE / "02-configure" / "00-run.sh"
+_BOOT_CONFIG_SH = _STAGE / "03-boot-config" / "00-run.sh"
+_FILES_DIR = _STAGE / "02-configure" / "files"
+
+
+@pytest.fixture(scope="module")
+def pigen_stat(pigen_dir: Path) -> dict[Path, os.stat_result]:
+    """lstat the paths these tests check, keyed by path relative to pi-gen.
+
+    Only config, build.sh and the custom stage are visited: build.sh clones
+    pi-gen into deploy/pi-gen/pi-gen, and that checkout's build tree may hold
+    binaries and dangling symlinks. Missing paths are simply absent.
+    """
+    stage = pigen_dir / _STAGE
+    paths = [pigen_dir / _CONFIG, pigen_dir / _BUILD_SH, stage]
+    if stage.is_dir():
+        paths.extend(stage.rglob("*"))
+    result = {}
+    for p in paths:
+        try:
+            result[p.relative_to(pigen_dir)] = p.lstat()
+        except FileNotFoundError:
+            pass
+    return result
+
+
+class _TextCache(dict):
+    """Read a file under pi-gen the first time its relative path is looked up."""
+
+    def __init__(self, root: Path) -> None:
+        super().__init__()
+        self._root = root
+
+    def __missing__(self, rel: Path) -> str:
+        text = self[rel] = (self._root / rel).read_text()
+        return text
+
+
+@pytest.fixture(scope="module")
+def pigen_files(pigen_dir: Path) -> dict[Path, str]:
+    """Return the text of pi-gen files, read lazily and keyed by the constants above."""
+    return _TextCache(pigen_dir)
+
+
+def _is_file(pigen_stat: dict[Path, os.stat_result], rel: Path) -> bool:
+    return rel in pigen_stat and stat.S_ISREG(pigen_stat[rel].st_mode)
+
+
+def _stage_scripts(pigen_stat: dict[Path, os.stat_result]) -> list[Path]:
+    """Every sub-stage 00-run.sh, so new sub-stages are covered automatically."""
+    return sorted(rel for rel in pigen_stat if rel.name == "00-run.sh" and _STAGE in rel.parents)
 
 
 class TestPigenStructure:
@@ -11,33 +72,27 @@ class TestPigenStructure:
     def test_pigen_directory_exists(self, pigen_dir: Path):
         assert pigen_dir.exists(), "deploy/pi-gen directory should exist"
 
-    def test_config_file_exists(self, pigen_dir: Path):
-        config = pigen_dir / "config"
-        assert config.exists(), "config file should exist"
+    def test_config_file_exists(self, pigen_stat: dict[Path, os.stat_result]):
+        assert _is_file(pigen_stat, _CONFIG), "config file should exist"
 
-    def test_build_script_exists(self, pigen_dir: Path):
-        build_sh = pigen_dir / "build.sh"
-        assert build_sh.exists(), "build.sh should exist"
+    def test_build_script_exists(self, pigen_stat: dict[Path, os.stat_result]):
+        assert _is_file(pigen_stat, _BUILD_SH), "build.sh should exist"
 
-    def test_build_script_executable(self, pigen_dir: Path):
-        build_sh = pigen_dir / "build.sh"
-        assert build_sh.stat().st_mode & stat.S_IXUSR, "build.sh should be executable"
+    def test_build_script_executable(self, pigen_stat: dict[Path, os.stat_result]):
+        assert pigen_stat[_BUILD_SH].st_mode & stat.S_IXUSR, "build.sh should be executable"
 
-    def test_stage_directory_exists(self, pigen_dir: Path):
-        stage_dir = pigen_dir / "stage-pi-decoder"
-        assert stage_dir.exists(), "stage-pi-decoder should exist"
+    def test_stage_directory_exists(self, pigen_stat: dict[Path, os.stat_result]):
+        assert stat.S_ISDIR(pigen_stat[_STAGE].st_mode), "stage-pi-decoder should exist"
 
-    def test_depends_file_exists(self, pigen_dir: Path):
-        depends = pigen_dir / "stage-pi-decoder" / "DEPENDS"
-        assert depends.exists(), "DEPENDS file should exist"
+    def test_depends_file_exists(self, pigen_stat: dict[Path, os.stat_result]):
+        assert _is_file(pigen_stat, _DEPENDS), "DEPENDS file should exist"
 
 
 class TestPigenConfig:
     """Verify pi-gen config file contents."""
 
-    def test_config_has_required_variables(self, pigen_dir: Path):
-        config = pigen_dir / "config"
-        content = config.read_text()
+    def test_config_has_required_variables(self, pigen_files: dict[Path, str]):
+        content = pigen_files[_CONFIG]
 
         required_vars = [
             "IMG_NAME",
@@ -46,22 +101,19 @@ class TestPigenConfig:
             "FIRST_USER_NAME",
             "STAGE_LIST",
         ]
-        for var in required_vars:
-            assert var in content, f"{var} should be in config"
+        missing = [var for var in required_vars if var not in content]
+        assert not missing, f"{missing} should be in config"
 
-    def test_config_stage_list_includes_custom_stage(self, pigen_dir: Path):
-        config = pigen_dir / "config"
-        content = config.read_text()
+    def test_config_stage_list_includes_custom_stage(self, pigen_files: dict[Path, str]):
+        content = pigen_files[_CONFIG]
         assert "stage-pi-decoder" in content, "STAGE_LIST should include custom stage"
 
-    def test_config_uses_bookworm(self, pigen_dir: Path):
-        config = pigen_dir / "config"
-        content = config.read_text()
+    def test_config_uses_bookworm(self, pigen_files: dict[Path, str]):
+        content = pigen_files[_CONFIG]
         assert 'RELEASE="bookworm"' in content, "Should use bookworm release"
 
-    def test_config_stage_list_excludes_stage3(self, pigen_dir: Path):
-        config = pigen_dir / "config"
-        for line in config.read_text().splitlines():
+    def test_config_stage_list_excludes_stage3(self, pigen_files: dict[Path, str]):
+        for line in pigen_files[_CONFIG].splitlines():
             if line.startswith("STAGE_LIST="):
                 stages = line.split("=", 1)[1].strip('"').split()
                 assert "stage3" not in stages, "STAGE_LIST should not contain stage3 (Lite image)"
@@ -71,69 +123,55 @@ class TestPigenConfig:
 class TestPigenStage:
     """Verify custom stage structure."""
 
-    def test_depends_on_stage2(self, pigen_dir: Path):
-        depends = pigen_dir / "stage-pi-decoder" / "DEPENDS"
-        content = depends.read_text().strip()
+    def test_depends_on_stage2(self, pigen_files: dict[Path, str]):
+        content = pigen_files[_DEPENDS].strip()
         assert content == "stage2", "Should depend on stage2 (Lite base)"
 
-    def test_packages_file_exists(self, pigen_dir: Path):
-        packages = pigen_dir / "stage-pi-decoder" / "00-install-packages" / "00-packages"
-        assert packages.exists(), "00-packages should exist"
+    def test_packages_file_exists(self, pigen_stat: dict[Path, os.stat_result]):
+        assert _is_file(pigen_stat, _PACKAGES), "00-packages should exist"
 
-    def test_packages_includes_required(self, pigen_dir: Path):
-        packages = pigen_dir / "stage-pi-decoder" / "00-install-packages" / "00-packages"
-        content = packages.read_text()
+    def test_packages_includes_required(self, pigen_files: dict[Path, str]):
+        content = pigen_files[_PACKAGES]
 
         required_packages = ["mpv", "python3-pip", "unattended-upgrades"]
-        for pkg in required_packages:
-            assert pkg in content, f"{pkg} should be in packages list"
-
-    def test_install_app_script_exists(self, pigen_dir: Path):
-        script = pigen_dir / "stage-pi-decoder" / "01-install-app" / "00-run.sh"
-        assert script.exists(), "01-install-app/00-run.sh should exist"
-
-    def test_install_app_script_executable(self, pigen_dir: Path):
-        script = pigen_dir / "stage-pi-decoder" / "01-install-app" / "00-run.sh"
-        assert script.stat().st_mode & stat.S_IXUSR, "Script should be executable"
+        missing = [pkg for pkg in required_packages if pkg not in content]
+        assert not missing, f"{missing} should be in packages list"
 
-    def test_configure_script_exists(self, pigen_dir: Path):
-        script = pigen_dir / "stage-pi-decoder" / "02-configure" / "00-run.sh"
-        assert script.exists(), "02-configure/00-run.sh should exist"
+    def test_install_app_script_exists(self, pigen_stat: dict[Path, os.stat_result]):
+        assert _is_file(pigen_stat, _INSTALL_APP_SH), "01-install-app/00-run.sh should exist"
 
-    def test_configure_script_executable(self, pigen_dir: Path):
-        script = pigen_dir / "stage-pi-decoder" / "02-configure" / "00-run.sh"
-        assert script.stat().st_mode & stat.S_IXUSR, "Script should be executable"
+    def test_configure_script_exists(self, pigen_stat: dict[Path, os.stat_result]):
+        assert _is_file(pigen_stat, _CONFIGURE_SH), "02-configure/00-run.sh should exist"
 
-    def test_boot_config_script_exists(self, pigen_dir: Path):
-        script = pigen_dir / "stage-pi-decoder" / "03-boot-config" / "00-run.sh"
-        assert script.exists(), "03-boot-config/00-run.sh should exist"
+    def test_boot_config_script_exists(self, pigen_stat: dict[Path, os.stat_result]):
+        assert _is_file(pigen_stat, _BOOT_CONFIG_SH), "03-boot-config/00-run.sh should exist"
 
-    def test_boot_config_script_executable(self, pigen_dir: Path):
-        script = pigen_dir / "stage-pi-decoder" / "03-boot-config" / "00-run.sh"
-        assert script.stat().st_mode & stat.S_IXUSR, "Script should be executable"
+    def test_stage_scripts_executable(self, pigen_stat: dict[Path, os.stat_result]):
+        scripts = _stage_scripts(pigen_stat)
+        assert {_INSTALL_APP_SH, _CONFIGURE_SH, _BOOT_CONFIG_SH} <= set(scripts)
+        not_executable = [str(p) for p in scripts if not pigen_stat[p].st_mode & stat.S_IXUSR]
+        assert not not_executable, f"{not_executable} should be executable"
 
 
 class TestPigenConfigFiles:
     """Verify configuration files in 02-configure/files/."""
 
-    @pytest.fixture
-    def files_dir(self, pigen_dir: Path) -> Path:
-        return pigen_dir / "stage-pi-decoder" / "02-configure" / "files"
+    def test_unattended_upgrades_exists(self, pigen_stat: dict[Path, os.stat_result]):
+        assert _is_file(pigen_stat, _FILES_DIR / "50unattended-upgrades")
 
-    def test_unattended_upgrades_exists(self, files_dir: Path):
-        assert (files_dir / "50unattended-upgrades").exists()
-
-    def test_auto_upgrades_exists(self, files_dir: Path):
-        assert (files_dir / "20auto-upgrades").exists()
+    def test_auto_upgrades_exists(self, pigen_stat: dict[Path, os.stat_result]):
+        assert _is_file(pigen_stat, _FILES_DIR / "20auto-upgrades")
 
 
 class TestBuildCopiesAllFiles:
     """Verify build.sh copies every deploy file that 00-run.sh references."""
 
-    def test_build_copies_all_referenced_deploy_files(self, pigen_dir: Path, deploy_dir: Path):
+    def test_build_copies_all_referenced_deploy_files(
+        self, deploy_dir: Path, pigen_files: dict[Path, str],
+    ):
         """Every file from deploy/ that 00-run.sh installs should be copied by build.sh."""
-        build_sh = (pigen_dir / "build.sh").read_text()
-        run_sh = (pigen_dir / "stage-pi-decoder" / "02-configure" / "00-run.sh").read_text()
+        build_sh = pigen_files[_BUILD_SH]
+        run_sh = pigen_files[_CONFIGURE_SH]
 
         # Files that 00-run.sh installs from files/ and that originate from deploy/
         # (excludes files that are static in the stage directory like 50unattended-upgrades)
@@ -155,9 +193,9 @@ class TestBuildCopiesAllFiles:
             # Verify the source file exists in deploy/
             assert (deploy_dir / filename).exists(), f"{filename} should exist in deploy/"
 
-    def test_read_only_setup_in_configure_script(self, pigen_dir: Path):
+    def test_read_only_setup_in_configure_script(self, pigen_files: dict[Path, str]):
         """Verify read-only filesystem setup entries exist in 00-run.sh."""
-        run_sh = (pigen_dir / "stage-pi-decoder" / "02-configure" / "00-run.sh").read_text()
+        run_sh = pigen_files[_CONFIGURE_SH]
         assert "tmpfs /var/log" in run_sh, "Should mount /var/log as tmpfs"
         assert "remount,rw" in run_sh, "Should have dpkg remount-rw hook"
         assert ",ro" in run_sh, "Should add ro to root mount"
@@ -166,38 +204,29 @@ class TestBuildCopiesAllFiles:
 class TestPigenScriptContent:
     """Verify script content uses correct pi-gen conventions."""
 
-    def test_install_app_uses_rootfs_dir(self, pigen_dir: Path):
-        script = pigen_dir / "stage-pi-decoder" / "01-install-app" / "00-run.sh"
-        content = script.read_text()
+    def test_install_app_uses_rootfs_dir(self, pigen_files: dict[Path, str]):
+        content = pigen_files[_INSTALL_APP_SH]
         assert "${ROOTFS_DIR}" in content, "Should use ROOTFS_DIR variable"
         assert "${STAGE_DIR}" in content, "Should use STAGE_DIR variable"
         assert "on_chroot" in content, "Should use on_chroot for pip install"
 
-    def test_configure_uses_first_user_name(self, pigen_dir: Path):
-        script = pigen_dir / "stage-pi-decoder" / "02-configure" / "00-run.sh"
-        content = script.read_text()
+    def test_configure_uses_first_user_name(self, pigen_files: dict[Path, str]):
+        content = pigen_files[_CONFIGURE_SH]
         assert "${FIRST_USER_NAME}" in content, "Should use FIRST_USER_NAME variable"
         assert "on_chroot" in content, "Should use on_chroot for systemctl"
 
-    def test_boot_config_uses_correct_path(self, pigen_dir: Path):
-        script = pigen_dir / "stage-pi-decoder" / "03-boot-config" / "00-run.sh"
-        content = script.read_text()
+    def test_boot_config_uses_correct_path(self, pigen_files: dict[Path, str]):
+        content = pigen_files[_BOOT_CONFIG_SH]
         assert "/boot/firmware/config.txt" in content, "Should use bookworm boot path"
         assert "hdmi_force_hotplug" in content, "Should configure HDMI"
 
-    def test_boot_config_has_drm_resolution(self, pigen_dir: Path):
-        script = pigen_dir / "stage-pi-decoder" / "03-boot-config" / "00-run.sh"
-        content = script.read_text()
+    def test_boot_config_has_drm_resolution(self, pigen_files: dict[Path, str]):
+        content = pigen_files[_BOOT_CONFIG_SH]
         assert "video=HDMI-A-1" in content, "Should set KMS/DRM resolution"
         assert "consoleblank=0" in content, "Should disable console blanking"
 
-    def test_scripts_use_bash_e(self, pigen_dir: Path):
+    def test_scripts_use_bash_e(self, pigen_stat: dict[Path, os.stat_result], pigen_files: dict[Path, str]):
         """All scripts should use #!/bin/bash -e for error handling."""
-        scripts = [
-            pigen_dir / "stage-pi-decoder" / "01-install-app" / "00-run.sh",
-            pigen_dir / "stage-pi-decoder" / "02-configure" / "00-run.sh",
-            pigen_dir / "stage-pi-decoder" / "03-boot-config" / "00-run.sh",
-        ]
-        for script in scripts:
-            content = script.read_text()
-            assert content.startswith("#!/bin/bash -e"), f"{script.name} should start with #!/bin/bash -e"
+        for script in _stage_scripts(pigen_stat):
+            content = pigen_files[script]
+            assert content.startswith("#!/bin/bash -e"), f"{script} should start with #!/bin/bash -e"
@@ -0,0 +1,73 @@
+"""Tests for pi_decoder.procutil module."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from pi_decoder import procutil
+from pi_decoder.procutil import run_command
+
+
+def _make_proc(returncode=0, stdout=b"", stderr=b""):
+    proc = MagicMock()
+    proc.returncode = returncode
+    proc.communicate = AsyncMock(return_value=(stdout, stderr))
+    return proc
+
+
+class TestRunCommand:
+    async def test_returns_returncode_and_output(self):
+        proc = _make_proc(returncode=1, stdout=b"out", stderr=b"err")
+        with patch("asyncio.create_subprocess_exec", new_callable=AsyncMock, return_value=proc):
+            assert await run_command("sudo", "true") == (1, b"out", b"err")
+
+    async def test_none_output_normalized_to_bytes(self):
+        proc = _make_proc(stdout=None, stderr=None)
+        with patch("asyncio.create_subprocess_exec", new_callable=AsyncMock, return_value=proc):
+            assert await run_command("true") == (0, b"", b"")
+
+    async def test_stdin_only_opened_with_input(self):
+        proc = _make_proc()
+        with patch("asyncio.create_subprocess_exec", new_callable=AsyncMock, return_value=proc) as mock_exec:
+            await run_command("sudo", "hostnamectl", "set-hostname", "x")
+            assert mock_exec.call_args.kwargs["stdin"] is None
+
+            await run_command("sudo", "tee", "/etc/hosts", input=b"data", capture_stdout=False)
+            assert mock_exec.call_args.args == ("sudo", "tee", "/etc/hosts")
+            assert mock_exec.call_args.kwargs["stdin"] == asyncio.subprocess.PIPE
+            assert mock_exec.call_args.kwargs["stdout"] == asyncio.subprocess.DEVNULL
+            proc.communicate.assert_called_with(input=b"data")
+
+    async def test_timeout_raises(self):
+        proc = MagicMock()
+
+        async def _hang(input=None):
+            await asyncio.sleep(10)
+
+        proc.communicate = _hang
+        with patch("asyncio.create_subprocess_exec", new_callable=AsyncMock, return_value=proc):
+            with pytest.raises(asyncio.TimeoutError):
+                await run_command("sudo", "tee", "/etc/hosts", input=b"", timeout=0.01)
+
+    async def test_concurrency_is_bounded(self):
+        running = 0
+        peak = 0
+
+        async def _communicate(input=None):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0)
+            await asyncio.sleep(0)
+            running -= 1
+            return b"", b""
+
+        proc = MagicMock()
+        proc.returncode = 0
+        proc.communicate = _communicate
+        with patch("pi_decoder.procutil._sem", asyncio.Semaphore(procutil._MAX_CONCURRENT)), \
+             patch("asyncio.create_subprocess_exec", new_callable=AsyncMock, return_value=proc):
+            await asyncio.gather(*(run_command("true") for _ in range(5)))
+
+        assert peak == procutil._MAX_CONCURRENT
@@ -2,17 +2,27 @@
 
 import asyncio
 import subprocess
+from dataclasses import fields
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import httpx
 import pytest
 from fastapi.testclient import TestClient
 
 from pi_decoder.config import Config
+from pi_decoder.pco_client import LiveStatus
 from pi_decoder.web.app import create_app
 
 
-@pytest.fixture
-def config():
+_MPV_STATUS = {
+    "alive": True,
+    "playing": True,
+    "idle": False,
+    "stream_url": "rtmp://test.local/live",
+}
+
+
+def _make_config():
     """Return a default test config."""
     cfg = Config()
     cfg.general.name = "Test-Decoder"
@@ -22,78 +32,161 @@ def config():
     return cfg
 
 
-@pytest.fixture
+def _async_return(value):
+    """Return a bare coroutine stub for hot mocks no test asserts on."""
+    async def _stub(*args, **kwargs):
+        return value
+    return _stub
+
+
+def _configure_default_mocks(mpv, overlay, pco):
+    """Reset the shared mocks and (re)apply their default behaviour."""
+    for mock in (mpv, overlay, pco):
+        mock.reset_mock()
+
+    mpv.restart.side_effect = None
+    mpv.stop_stream.side_effect = None
+    mpv.take_screenshot.return_value = None
+    mpv.take_screenshot.side_effect = None
+
+    overlay.running = False
+    overlay.last_status = LiveStatus()
+
+    pco.credential_error = ""
+    pco.consecutive_failures = 0
+    pco.get_service_types.return_value = []
+
+
+@pytest.fixture(scope="module")
+def config():
+    """Return the shared test config; reset to defaults before each test."""
+    return _make_config()
+
+
+@pytest.fixture(scope="module")
 def mock_mpv():
     """Return a mocked MpvManager."""
     mpv = MagicMock()
-    mpv.get_status = AsyncMock(return_value={
-        "alive": True,
-        "playing": True,
-        "idle": False,
-        "stream_url": "rtmp://test.local/live",
-    })
+    mpv.get_status = _async_return(_MPV_STATUS)
     mpv.restart = AsyncMock()
     mpv.reset_stream_retry = MagicMock()
-    mpv.take_screenshot = AsyncMock(return_value=None)
+    mpv.take_screenshot = AsyncMock()
     mpv.stop_stream = AsyncMock()
     mpv.load_stream = AsyncMock()
     return mpv
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def mock_overlay():
     """Return a mocked OverlayUpdater."""
     overlay = MagicMock()
-    overlay.running = False
-    overlay.last_status = MagicMock(
-        is_live=False, finished=False, plan_title="", item_title="",
-        service_end_time=None, message="",
-    )
     overlay.stop = AsyncMock()
     overlay.start_task = MagicMock()
     return overlay
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def mock_pco():
     """Return a mocked PCOClient."""
     pco = MagicMock()
     pco.update_credentials = MagicMock()
-    pco.credential_error = ""
-    pco.consecutive_failures = 0
-    pco.get_service_types = AsyncMock(return_value=[])
-    pco.test_connection = AsyncMock(return_value={"success": True, "service_types": []})
+    pco.get_service_types = AsyncMock()
+    pco.test_connection = _async_return({"success": True, "service_types": []})
     pco.close = AsyncMock()
     return pco
 
 
-@pytest.fixture
-def client(config, mock_mpv, mock_overlay, mock_pco, tmp_path):
-    """Return a TestClient for the app."""
-    config_path = str(tmp_path / "config.toml")
-    app = create_app(mock_mpv, mock_pco, mock_overlay, config, config_path)
-    return TestClient(app)
+@pytest.fixture(scope="module")
+def app(config, mock_mpv, mock_overlay, mock_pco, tmp_path_factory):
+    """Return one app for the module; create_app is the slow part of setup."""
+    config_path = str(tmp_path_factory.mktemp("web") / "config.toml")
+    return create_app(mock_mpv, mock_pco, mock_overlay, config, config_path)
+
+
+@pytest.fixture(scope="module")
+async def client(app):
+    """Return an in-process async client for the app, shared across the module."""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as c:
+        yield c
+
+
+@pytest.fixture(scope="module")
+def ws_client(app):
+    """Return a TestClient for WebSocket tests; httpx has no WebSocket support.
+
+    Entered once so every socket shares one portal thread and event loop.
+    """
+    with TestClient(app) as c:
+        yield c
+
+
+async def _one_request(app, method, path, **kwargs):
+    """Send a single request to an app built for one test."""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as c:
+        return await c.request(method, path, **kwargs)
+
+
+@pytest.fixture(scope="module", autouse=True)
+def _block_host_commands():
+    """Keep the module off real subprocesses and network probes.
+
+    Tests that care patch these themselves. Module scope also covers
+    background tasks that outlive their test, such as the kiosk-shutdown
+    poweroff.
+    """
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(subprocess, "run", lambda args, **kw: subprocess.CompletedProcess(args, 0, "", ""))
+        mp.setattr(subprocess, "Popen", MagicMock())
+        mp.setattr("pi_decoder.network.get_network_info_sync", lambda: {})
+        yield
+
+
+@pytest.fixture(scope="module", autouse=True)
+def _fast_sleep():
+    """Collapse the app's polling and delayed-restart sleeps to a bare yield."""
+    real_sleep = asyncio.sleep
+
+    async def _yield(delay, result=None):
+        return await real_sleep(0, result)
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(asyncio, "sleep", _yield)
+        yield
+
+
+@pytest.fixture(autouse=True)
+def _reset_shared_state(config, mock_mpv, mock_overlay, mock_pco, app):
+    """Give every test a clean config, fresh mock defaults and a cold middleware cache."""
+    fresh = _make_config()
+    for f in fields(config):
+        setattr(config, f.name, getattr(fresh, f.name))
+    _configure_default_mocks(mock_mpv, mock_overlay, mock_pco)
+    # Rebuilt lazily on the next request, dropping the captive portal's
+    # cached network info from the previous test
+    app.middleware_stack = None
 
 
 class TestIndexPage:
-    def test_get_index_returns_html(self, client):
-        resp = client.get("/")
+    async def test_get_index_returns_html(self, client):
+        resp = await client.get("/")
         assert resp.status_code == 200
         assert "text/html" in resp.headers["content-type"]
         assert "Test-Decoder" in resp.text
 
 
 class TestHealthEndpoint:
-    def test_health_returns_ok(self, client):
-        resp = client.get("/api/health")
+    async def test_health_returns_ok(self, client):
+        resp = await client.get("/api/health")
         assert resp.status_code == 200
         assert resp.json() == {"status": "ok"}
 
 
 class TestStatusEndpoint:
     @patch("pi_decoder.network.get_network_info_sync", return_value={})
-    def test_status_returns_json(self, _mock_net, client):
-        resp = client.get("/api/status")
+    async def test_status_returns_json(self, _mock_net, client):
+        resp = await client.get("/api/status")
         assert resp.status_code == 200
         data = resp.json()
         assert "mpv" in data
@@ -102,16 +195,16 @@ class TestStatusEndpoint:
 
 
 class TestVersionEndpoint:
-    def test_version_returns_string(self, client):
-        resp = client.get("/api/version")
+    async def test_version_returns_string(self, client):
+        resp = await client.get("/api/version")
         assert resp.status_code == 200
         data = resp.json()
         assert "version" in data
 
 
 class TestStreamConfig:
-    def test_save_stream_config_valid(self, client, config):
-        resp = client.post("/api/config/stream", json={
+    async def test_save_stream_config_valid(self, client, config):
+        resp = await client.post("/api/config/stream", json={
             "url": "rtmp://new.local/live",
             "network_caching": 3000,
         })
@@ -122,8 +215,8 @@ class TestStreamConfig:
 
 
 class TestStreamConfigHwdec:
-    def test_save_hwdec_valid(self, client, config):
-        resp = client.post("/api/config/stream", json={
+    async def test_save_hwdec_valid(self, client, config):
+        resp = await client.post("/api/config/stream", json={
             "url": "rtmp://test.local/live",
             "network_caching": 2000,
             "hwdec": "v4l2m2m",
@@ -132,9 +225,9 @@ class TestStreamConfigHwdec:
         assert resp.json()["ok"] is True
         assert config.stream.hwdec == "v4l2m2m"
 
-    def test_save_hwdec_invalid_rejected(self, client, config):
+    async def test_save_hwdec_invalid_rejected(self, client, config):
         config.stream.hwdec = "auto"
-        resp = client.post("/api/config/stream", json={
+        resp = await client.post("/api/config/stream", json={
             "url": "rtmp://test.local/live",
             "network_caching": 2000,
             "hwdec": "cuda",
@@ -146,9 +239,9 @@ class TestStreamConfigHwdec:
         # Should not have changed
         assert config.stream.hwdec == "auto"
 
-    def test_save_hwdec_omitted_keeps_existing(self, client, config):
+    async def test_save_hwdec_omitted_keeps_existing(self, client, config):
         config.stream.hwdec = "v4l2m2m"
-        resp = client.post("/api/config/stream", json={
+        resp = await client.post("/api/config/stream", json={
             "url": "rtmp://test.local/live",
             "network_caching": 2000,
         })
@@ -157,17 +250,17 @@ class TestStreamConfigHwdec:
 
 
 class TestGeneralConfig:
-    def test_save_name(self, client, config):
+    async def test_save_name(self, client, config):
         with patch("pi_decoder.hostname.set_hostname", new_callable=AsyncMock, return_value="new-name"):
-            resp = client.post("/api/config/general", json={"name": "New Name"})
+            resp = await client.post("/api/config/general", json={"name": "New Name"})
         assert resp.status_code == 200
         assert resp.json()["ok"] is True
         assert config.general.name == "New Name"
 
 
 class TestPcoConfig:
-    def test_save_pco_credentials(self, client, config):
-        resp = client.post("/api/config/pco", json={
+    async def test_save_pco_credentials(self, client, config):
+        resp = await client.post("/api/config/pco", json={
             "app_id": "test_id",
             "secret": "test_secret",
             "service_type_id": "123",
@@ -176,8 +269,8 @@ class TestPcoConfig:
         assert resp.json()["ok"] is True
         assert config.pco.app_id == "test_id"
 
-    def test_test_pco_missing_credentials(self, client):
-        resp = client.post("/api/test-pco", json={
+    async def test_test_pco_missing_credentials(self, client):
+        resp = await client.post("/api/test-pco", json={
             "app_id": "",
             "secret": "",
         })
@@ -188,70 +281,59 @@ class TestPcoConfig:
 
 class TestLogsEndpoint:
     @patch("subprocess.run")
-    def test_logs_valid_service(self, mock_run, client):
+    async def test_logs_valid_service(self, mock_run, client):
         mock_run.return_value = MagicMock(stdout="test log output")
-        resp = client.get("/api/logs?service=pi-decoder&lines=25")
+        resp = await client.get("/api/logs?service=pi-decoder&lines=25")
         assert resp.status_code == 200
         data = resp.json()
         assert "logs" in data
 
-    def test_logs_invalid_service(self, client):
-        resp = client.get("/api/logs?service=malicious-service")
+    async def test_logs_invalid_service(self, client):
+        resp = await client.get("/api/logs?service=malicious-service")
         assert resp.status_code == 400
         assert "error" in resp.json()
 
 
 class TestWifiConnect:
-    def test_wifi_connect_validates_ssid_length(self, client):
-        # SSID > 32 bytes
-        long_ssid = "A" * 33
-        resp = client.post("/api/network/wifi-connect", json={
-            "ssid": long_ssid,
-            "password": "testpassword",
-        })
-        assert resp.status_code == 400
-
-    def test_wifi_connect_validates_password_length(self, client):
-        resp = client.post("/api/network/wifi-connect", json={
-            "ssid": "TestNetwork",
-            "password": "short",
-        })
-        assert resp.status_code == 400
-        assert "8-63" in resp.json()["error"]
-
-    def test_wifi_connect_validates_empty_ssid(self, client):
-        resp = client.post("/api/network/wifi-connect", json={
-            "ssid": "",
-            "password": "testpassword",
+    @pytest.mark.parametrize("ssid,password,error", [
+        pytest.param("A" * 33, "testpassword", "1-32", id="ssid-over-32-bytes"),
+        pytest.param("TestNetwork", "short", "8-63", id="short-password"),
+        pytest.param("", "testpassword", "1-32", id="empty-ssid"),
+    ])
+    async def test_wifi_connect_rejects_invalid(self, client, ssid, password, error):
+        resp = await client.post("/api/network/wifi-connect", json={
+            "ssid": ssid,
+            "password": password,
         })
         assert resp.status_code == 400
+        assert error in resp.json()["error"]
 
 
 class TestCecInput:
-    def test_cec_input_invalid_port(self, client):
-        resp = client.post("/api/cec/input", json={"port": "not_a_number"})
+    async def test_cec_input_invalid_port(self, client):
+        resp = await client.post("/api/cec/input", json={"port": "not_a_number"})
         assert resp.status_code == 400
         assert "Invalid port" in resp.json()["error"]
 
 
 class TestConfigExport:
-    def test_export_returns_toml(self, client):
-        resp = client.get("/api/config/export")
+    async def test_export_returns_toml(self, client):
+        resp = await client.get("/api/config/export")
         assert resp.status_code == 200
         assert "toml" in resp.headers["content-type"]
 
 
 class TestScreenshot:
-    def test_screenshot_success(self, client, mock_mpv):
+    async def test_screenshot_success(self, client, mock_mpv):
         mock_mpv.take_screenshot = AsyncMock(return_value=b"\xff\xd8fake-jpeg-data")
-        resp = client.get("/api/screenshot")
+        resp = await client.get("/api/screenshot")
         assert resp.status_code == 200
         assert resp.headers["content-type"] == "image/jpeg"
         assert resp.content == b"\xff\xd8fake-jpeg-data"
 
-    def test_screenshot_failure_returns_500(self, client, mock_mpv):
+    async def test_screenshot_failure_returns_500(self, client, mock_mpv):
         mock_mpv.take_screenshot = AsyncMock(return_value=None)
-        resp = client.get("/api/screenshot")
+        resp = await client.get("/api/screenshot")
         assert resp.status_code == 500
         data = resp.json()
         assert data["ok"] is False
@@ -263,8 +345,8 @@ class TestWifiScan:
         [{"ssid": "Network1", "signal": -45}, {"ssid": "Network2", "signal": -70}],
         False,
     ))
-    def test_wifi_scan_returns_networks(self, _mock_scan, client):
-        resp = client.get("/api/network/wifi-scan")
+    async def test_wifi_scan_returns_networks(self, _mock_scan, client):
+        resp = await client.get("/api/network/wifi-scan")
         assert resp.status_code == 200
         data = resp.json()
         assert "networks" in data
@@ -273,8 +355,8 @@ class TestWifiScan:
         assert data["hotspot_mode"] is False
 
     @patch("pi_decoder.network.scan_wifi", new_callable=AsyncMock, return_value=([], True))
-    def test_wifi_scan_hotspot_mode(self, _mock_scan, client):
-        resp = client.get("/api/network/wifi-scan")
+    async def test_wifi_scan_hotspot_mode(self, _mock_scan, client):
+        resp = await client.get("/api/network/wifi-scan")
         assert resp.status_code == 200
         data = resp.json()
         assert data["networks"] == []
@@ -288,8 +370,8 @@ class TestNetworkStatus:
         "ssid": "MyWifi",
         "hotspot_active": False,
     })
-    def test_network_status_returns_info(self, _mock_net, client):
-        resp = client.get("/api/network/status")
+    async def test_network_status_returns_info(self, _mock_net, client):
+        resp = await client.get("/api/network/status")
         assert resp.status_code == 200
         data = resp.json()
         assert data["ip"] == "192.168.1.100"
@@ -297,22 +379,23 @@ class TestNetworkStatus:
 
 
 class TestCecEndpoints:
-    @patch("pi_decoder.cec.power_on", new_callable=AsyncMock, return_value="ok")
-    def test_cec_on(self, _mock, client):
-        resp = client.post("/api/cec/on")
-        assert resp.status_code == 200
-        assert resp.json()["ok"] is True
-
-    @patch("pi_decoder.cec.standby", new_callable=AsyncMock, return_value="ok")
-    def test_cec_standby(self, _mock, client):
-        resp = client.post("/api/cec/standby")
+    @pytest.mark.parametrize("path,func,ret", [
+        ("/api/cec/on", "power_on", "ok"),
+        ("/api/cec/standby", "standby", "ok"),
+        ("/api/cec/volume-down", "volume_down", {"ok": True, "sent": 1, "dropped": False}),
+        ("/api/cec/mute", "mute", {"ok": True, "sent": 1, "dropped": False}),
+        ("/api/cec/active-source", "active_source", "ok"),
+    ])
+    async def test_cec_command(self, client, path, func, ret):
+        with patch(f"pi_decoder.cec.{func}", new_callable=AsyncMock, return_value=ret):
+            resp = await client.post(path)
         assert resp.status_code == 200
         assert resp.json()["ok"] is True
 
     @patch("pi_decoder.cec.volume_up", new_callable=AsyncMock,
            return_value={"ok": True, "sent": 1, "dropped": False})
-    def test_cec_volume_up(self, mock_vol, client):
-        resp = client.post("/api/cec/volume-up")
+    async def test_cec_volume_up(self, mock_vol, client):
+        resp = await client.post("/api/cec/volume-up")
         assert resp.status_code == 200
         body = resp.json()
         assert body["ok"] is True
@@ -321,51 +404,31 @@ class TestCecEndpoints:
 
     @patch("pi_decoder.cec.volume_up", new_callable=AsyncMock,
            return_value={"ok": True, "sent": 5, "dropped": False})
-    def test_cec_volume_up_with_steps(self, mock_vol, client):
-        resp = client.post("/api/cec/volume-up", json={"steps": 5})
+    async def test_cec_volume_up_with_steps(self, mock_vol, client):
+        resp = await client.post("/api/cec/volume-up", json={"steps": 5})
         assert resp.status_code == 200
         assert resp.json()["sent"] == 5
         mock_vol.assert_awaited_once_with(steps=5)
 
     @patch("pi_decoder.cec.volume_up", new_callable=AsyncMock,
            return_value={"ok": True, "sent": 0, "dropped": True})
-    def test_cec_volume_up_dropped(self, _mock, client):
+    async def test_cec_volume_up_dropped(self, _mock, client):
         """Drop-if-busy: response still 200 but dropped:True."""
-        resp = client.post("/api/cec/volume-up")
+        resp = await client.post("/api/cec/volume-up")
         assert resp.status_code == 200
         assert resp.json()["dropped"] is True
 
-    @patch("pi_decoder.cec.volume_down", new_callable=AsyncMock,
-           return_value={"ok": True, "sent": 1, "dropped": False})
-    def test_cec_volume_down(self, _mock, client):
-        resp = client.post("/api/cec/volume-down")
-        assert resp.status_code == 200
-        assert resp.json()["ok"] is True
-
-    @patch("pi_decoder.cec.mute", new_callable=AsyncMock,
-           return_value={"ok": True, "sent": 1, "dropped": False})
-    def test_cec_mute(self, _mock, client):
-        resp = client.post("/api/cec/mute")
-        assert resp.status_code == 200
-        assert resp.json()["ok"] is True
-
-    @patch("pi_decoder.cec.active_source", new_callable=AsyncMock, return_value="ok")
-    def test_cec_active_source(self, _mock, client):
-        resp = client.post("/api/cec/active-source")
-        assert resp.status_code == 200
-        assert resp.json()["ok"] is True
-
     @patch("pi_decoder.cec.get_power_status", new_callable=AsyncMock, return_value="on")
-    def test_cec_power_status(self, _mock, client):
-        resp = client.get("/api/cec/power-status")
+    async def test_cec_power_status(self, _mock, client):
+        resp = await client.get("/api/cec/power-status")
         assert resp.status_code == 200
         data = resp.json()
         assert data["ok"] is True
         assert data["status"] == "on"
 
     @patch("pi_decoder.cec.toggle", new_callable=AsyncMock, return_value="on")
-    def test_cec_toggle(self, _mock, client):
-        resp = client.post("/api/cec/toggle")
+    async def test_cec_toggle(self, _mock, client):
+        resp = await client.post("/api/cec/toggle")
         assert resp.status_code == 200
         data = resp.json()
         assert data["ok"] is True
@@ -379,8 +442,8 @@ class TestCecAudioOutput:
     @patch("pi_decoder.cec.detect_audio_system", new_callable=AsyncMock,
            return_value={"logical_addr": 5, "phys_addr": 0x3000,
                          "phys_addr_str": "3.0.0.0", "vendor": "Sony", "osd": "HT-SF150"})
-    def test_audio_output_soundbar(self, _mock_detect, _mock_mode, client):
-        resp = client.get("/api/cec/audio-output")
+    async def test_audio_output_soundbar(self, _mock_detect, _mock_mode, client):
+        resp = await client.get("/api/cec/audio-output")
         assert resp.status_code == 200
         body = resp.json()
         assert body["ok"] is True
@@ -390,43 +453,43 @@ class TestCecAudioOutput:
 
     @patch("pi_decoder.cec.get_system_audio_mode", new_callable=AsyncMock, return_value="off")
     @patch("pi_decoder.cec.detect_audio_system", new_callable=AsyncMock, return_value=None)
-    def test_audio_output_tv_speakers(self, _mock_detect, _mock_mode, client):
-        resp = client.get("/api/cec/audio-output")
+    async def test_audio_output_tv_speakers(self, _mock_detect, _mock_mode, client):
+        resp = await client.get("/api/cec/audio-output")
         assert resp.status_code == 200
         assert resp.json()["output"] == "tv-speakers"
 
     @patch("pi_decoder.cec.get_system_audio_mode", new_callable=AsyncMock, return_value="unknown")
     @patch("pi_decoder.cec.detect_audio_system", new_callable=AsyncMock, return_value=None)
-    def test_audio_output_unknown(self, _mock_detect, _mock_mode, client):
-        resp = client.get("/api/cec/audio-output")
+    async def test_audio_output_unknown(self, _mock_detect, _mock_mode, client):
+        resp = await client.get("/api/cec/audio-output")
         assert resp.json()["output"] == "unknown"
 
-    def test_prefer_audio_system_enable(self, client, config):
-        resp = client.post("/api/cec/prefer-audio-system", json={"enabled": True})
+    async def test_prefer_audio_system_enable(self, client, config):
+        resp = await client.post("/api/cec/prefer-audio-system", json={"enabled": True})
         assert resp.status_code == 200
         assert resp.json()["prefer_audio_system"] is True
         assert config.cec.prefer_audio_system is True
 
-    def test_prefer_audio_system_disable(self, client, config):
-        resp = client.post("/api/cec/prefer-audio-system", json={"enabled": False})
+    async def test_prefer_audio_system_disable(self, client, config):
+        resp = await client.post("/api/cec/prefer-audio-system", json={"enabled": False})
         assert resp.status_code == 200
         assert resp.json()["prefer_audio_system"] is False
         assert config.cec.prefer_audio_system is False
 
-    def test_prefer_audio_system_string_truthy(self, client, config):
-        resp = client.post("/api/cec/prefer-audio-system", json={"enabled": "on"})
+    async def test_prefer_audio_system_string_truthy(self, client, config):
+        resp = await client.post("/api/cec/prefer-audio-system", json={"enabled": "on"})
         assert resp.json()["prefer_audio_system"] is True
         config.cec.prefer_audio_system = False  # reset for next test
 
-    def test_prefer_audio_system_string_falsey(self, client, config):
-        resp = client.post("/api/cec/prefer-audio-system", json={"enabled": "0"})
+    async def test_prefer_audio_system_string_falsey(self, client, config):
+        resp = await client.post("/api/cec/prefer-audio-system", json={"enabled": "0"})
         assert resp.json()["prefer_audio_system"] is False
 
 
 class TestConfigImport:
-    def test_import_valid_toml(self, client, config):
+    async def test_import_valid_toml(self, client, config):
         toml_content = b'[general]\nname = "Imported-Decoder"\n'
-        resp = client.post(
+        resp = await client.post(
             "/api/config/import",
             files={"file": ("config.toml", toml_content, "application/toml")},
         )
@@ -436,43 +499,26 @@ class TestConfigImport:
         assert data["message"] == "Config imported successfully"
         assert config.general.name == "Imported-Decoder"
 
-    def test_import_invalid_toml(self, client):
-        bad_content = b"this is [not valid toml ==="
-        resp = client.post(
-            "/api/config/import",
-            files={"file": ("config.toml", bad_content, "application/toml")},
-        )
-        assert resp.status_code == 400
-        data = resp.json()
-        assert data["ok"] is False
-        assert "Invalid TOML" in data["error"]
-
-    def test_import_oversized_file(self, client):
-        big_content = b"x" * (65 * 1024)  # 65 KB, over the 64KB limit
-        resp = client.post(
-            "/api/config/import",
-            files={"file": ("config.toml", big_content, "application/toml")},
-        )
-        assert resp.status_code == 400
-        data = resp.json()
-        assert data["ok"] is False
-        assert "too large" in data["error"]
-
-    def test_import_wrong_extension(self, client):
-        content = b'[general]\nname = "Test"\n'
-        resp = client.post(
+    @pytest.mark.parametrize("filename,content,error", [
+        pytest.param("config.toml", b"this is [not valid toml ===", "Invalid TOML", id="invalid-toml"),
+        # 65 KB, over the 64KB limit
+        pytest.param("config.toml", b"x" * (65 * 1024), "too large", id="oversized"),
+        pytest.param("config.json", b'[general]\nname = "Test"\n', ".toml", id="wrong-extension"),
+    ])
+    async def test_import_rejected(self, client, filename, content, error):
+        resp = await client.post(
             "/api/config/import",
-            files={"file": ("config.json", content, "application/json")},
+            files={"file": (filename, content, "application/toml")},
         )
         assert resp.status_code == 400
         data = resp.json()
         assert data["ok"] is False
-        assert ".toml" in data["error"]
+        assert error in data["error"]
 
-    def test_import_calls_validate_config(self, client, config):
+    async def test_import_calls_validate_config(self, client, config):
         toml_content = b'[stream]\nurl = "rtmp://imported.local/live"\n'
         with patch("pi_decoder.web.app.validate_config") as mock_validate:
-            resp = client.post(
+            resp = await client.post(
                 "/api/config/import",
                 files={"file": ("config.toml", toml_content, "application/toml")},
             )
@@ -483,27 +529,27 @@ class TestConfigImport:
 
 
 class TestRestartEndpoints:
-    def test_restart_video(self, client, mock_mpv):
-        resp = client.post("/api/restart/video")
+    async def test_restart_video(self, client, mock_mpv):
+        resp = await client.post("/api/restart/video")
         assert resp.status_code == 200
         assert resp.json()["ok"] is True
 
-    def test_restart_overlay(self, client, mock_overlay):
-        resp = client.post("/api/restart/overlay")
+    async def test_restart_overlay(self, client, mock_overlay):
+        resp = await client.post("/api/restart/overlay")
         assert resp.status_code == 200
         assert resp.json()["ok"] is True
         mock_overlay.stop.assert_awaited_once()
         mock_overlay.start_task.assert_called_once()
 
-    def test_restart_all(self, client, mock_mpv, mock_overlay):
-        resp = client.post("/api/restart/all")
+    async def test_restart_all(self, client, mock_mpv, mock_overlay):
+        resp = await client.post("/api/restart/all")
         assert resp.status_code == 200
         assert resp.json()["ok"] is True
         mock_overlay.stop.assert_awaited_once()
 
 
 class TestLazyOverlayCreation:
-    def test_restart_overlay_creates_lazily(self, config, mock_mpv, tmp_path):
+    async def test_restart_overlay_creates_lazily(self, config, mock_mpv, tmp_path):
         """When pco=None and overlay=None, restart/overlay should create them."""
         config.overlay.enabled = True
         config.pco.app_id = "test_id"
@@ -517,15 +563,14 @@ class TestLazyOverlayCreation:
             mock_ov.start_task = MagicMock()
             MockOverlay.return_value = mock_ov
             MockPCO.return_value = MagicMock()
-            c = TestClient(app)
-            resp = c.post("/api/restart/overlay")
+            resp = await _one_request(app, "POST", "/api/restart/overlay")
         assert resp.status_code == 200
         MockPCO.assert_called_once_with(config)
         MockOverlay.assert_called_once()
         mock_ov.stop.assert_awaited_once()
         mock_ov.start_task.assert_called_once()
 
-    def test_pco_config_creates_pco_lazily(self, config, mock_mpv, tmp_path):
+    async def test_pco_config_creates_pco_lazily(self, config, mock_mpv, tmp_path):
         """Saving PCO credentials should lazily create PCOClient."""
         config.overlay.enabled = True
         config_path = str(tmp_path / "config.toml")
@@ -536,8 +581,7 @@ class TestLazyOverlayCreation:
             mock_pco_inst.update_credentials = MagicMock()
             MockPCO.return_value = mock_pco_inst
             MockOverlay.return_value = MagicMock()
-            c = TestClient(app)
-            resp = c.post("/api/config/pco", json={
+            resp = await _one_request(app, "POST", "/api/config/pco", json={
                 "app_id": "new_id",
                 "secret": "new_secret",
                 "service_type_id": "123",
@@ -546,7 +590,7 @@ class TestLazyOverlayCreation:
         MockPCO.assert_called_once_with(config)
         mock_pco_inst.update_credentials.assert_called_once()
 
-    def test_overlay_disabled_does_not_create(self, config, mock_mpv, tmp_path):
+    async def test_overlay_disabled_does_not_create(self, config, mock_mpv, tmp_path):
         """When overlay is disabled, _ensure_overlay_created should not create anything."""
         config.overlay.enabled = False
         config.pco.app_id = "test_id"
@@ -554,13 +598,12 @@ class TestLazyOverlayCreation:
         app = create_app(mock_mpv, None, None, config, config_path)
         with patch("pi_decoder.web.app.PCOClient") as MockPCO, \
              patch("pi_decoder.web.app.OverlayUpdater") as MockOverlay:
-            c = TestClient(app)
-            resp = c.post("/api/restart/overlay")
+            resp = await _one_request(app, "POST", "/api/restart/overlay")
         assert resp.status_code == 200
         MockPCO.assert_not_called()
         MockOverlay.assert_not_called()
 
-    def test_pco_config_starts_overlay_after_creation(self, config, mock_mpv, tmp_path):
+    async def test_pco_config_starts_overlay_after_creation(self, config, mock_mpv, tmp_path):
         """Saving PCO credentials should start the overlay if it was lazily created."""
         config.overlay.enabled = True
         config_path = str(tmp_path / "config.toml")
@@ -574,8 +617,7 @@ class TestLazyOverlayCreation:
             mock_ov.running = False
             mock_ov.start_task = MagicMock()
             MockOverlay.return_value = mock_ov
-            c = TestClient(app)
-            resp = c.post("/api/config/pco", json={
+            resp = await _one_request(app, "POST", "/api/config/pco", json={
                 "app_id": "new_id",
                 "secret": "new_secret",
                 "service_type_id": "123",
@@ -585,62 +627,38 @@ class TestLazyOverlayCreation:
         mock_pco_inst.update_credentials.assert_called_once()
         mock_ov.start_task.assert_called_once()
 
-    def test_overlay_config_stops_when_disabled(self, config, mock_mpv, mock_overlay, mock_pco, tmp_path):
+    async def test_overlay_config_stops_when_disabled(self, client, config, mock_overlay):
         """Saving overlay config with enabled=False should stop existing overlay."""
         config.overlay.enabled = True
-        config_path = str(tmp_path / "config.toml")
-        app = create_app(mock_mpv, mock_pco, mock_overlay, config, config_path)
-        c = TestClient(app)
-        resp = c.post("/api/config/overlay", json={"enabled": False})
+        resp = await client.post("/api/config/overlay", json={"enabled": False})
         assert resp.status_code == 200
         mock_overlay.stop.assert_awaited_once()
 
 
 class TestStopVideo:
-    def test_stop_video(self, client, mock_mpv):
+    async def test_stop_video(self, client, mock_mpv):
         mock_mpv.stop_stream = AsyncMock()
-        resp = client.post("/api/stop/video")
+        resp = await client.post("/api/stop/video")
         assert resp.status_code == 200
         assert resp.json()["ok"] is True
         mock_mpv.stop_stream.assert_awaited_once()
 
 
 class TestWebSocket:
-    @patch("pi_decoder.cec.get_power_status", new_callable=AsyncMock, return_value="on")
+    @patch("pi_decoder.cec.is_available", return_value=True)
+    @patch("pi_decoder.cec.get_power_status", new_callable=AsyncMock, return_value="standby")
     @patch("pi_decoder.network.get_network_info_sync", return_value={
         "ip": "10.42.0.1",
         "hotspot_active": True,
         "hotspot_password": "secret123",
     })
-    def test_ws_status_sends_json_shape(self, _mock_net, _mock_cec, client):
-        with client.websocket_connect("/ws/status") as ws:
+    def test_ws_status_message(self, _mock_net, _mock_cec, _mock_avail, ws_client):
+        """One status frame: full shape, hotspot password stripped, CEC power included."""
+        with ws_client.websocket_connect("/ws/status") as ws:
             data = ws.receive_json()
-        assert "name" in data
-        assert "hostname" in data
-        assert "mpv" in data
-        assert "overlay" in data
-        assert "system" in data
-        assert "network" in data
-        assert "cec" in data
+        assert {"name", "hostname", "mpv", "overlay", "system", "network", "cec"} <= data.keys()
         assert data["name"] == "Test-Decoder"
-
-    @patch("pi_decoder.cec.get_power_status", new_callable=AsyncMock, return_value="on")
-    @patch("pi_decoder.network.get_network_info_sync", return_value={
-        "ip": "10.42.0.1",
-        "hotspot_active": True,
-        "hotspot_password": "secret123",
-    })
-    def test_ws_status_strips_hotspot_password(self, _mock_net, _mock_cec, client):
-        with client.websocket_connect("/ws/status") as ws:
-            data = ws.receive_json()
         assert "hotspot_password" not in data["network"]
-
-    @patch("pi_decoder.cec.is_available", return_value=True)
-    @patch("pi_decoder.cec.get_power_status", new_callable=AsyncMock, return_value="standby")
-    @patch("pi_decoder.network.get_network_info_sync", return_value={})
-    def test_ws_status_includes_cec_power(self, _mock_net, _mock_cec, _mock_avail, client):
-        with client.websocket_connect("/ws/status") as ws:
-            data = ws.receive_json()
         assert data["cec"]["power"] == "standby"
 
 
@@ -648,16 +666,16 @@ class TestSpeedTest:
     @patch("pi_decoder.network.load_speed_test_result", return_value={
         "download_mbps": 47.2, "latency_ms": 12.0, "timestamp": "2025-01-15T10:30:00",
     })
-    def test_get_returns_last_result(self, _mock, client):
-        resp = client.get("/api/network/speedtest")
+    async def test_get_returns_last_result(self, _mock, client):
+        resp = await client.get("/api/network/speedtest")
         assert resp.status_code == 200
         data = resp.json()
         assert data["ok"] is True
         assert data["result"]["download_mbps"] == 47.2
 
     @patch("pi_decoder.network.load_speed_test_result", return_value=None)
-    def test_get_returns_null_when_no_result(self, _mock, client):
-        resp = client.get("/api/network/speedtest")
+    async def test_get_returns_null_when_no_result(self, _mock, client):
+        resp = await client.get("/api/network/speedtest")
         assert resp.status_code == 200
         data = resp.json()
         assert data["ok"] is True
@@ -667,8 +685,8 @@ class TestSpeedTest:
         "download_mbps": 50.0, "latency_ms": 8.5, "timestamp": "2025-01-15T10:30:00",
         "wifi_band": None, "avg_signal": None, "interface_type": None,
     })
-    def test_post_returns_results(self, _mock, client):
-        resp = client.post("/api/network/speedtest")
+    async def test_post_returns_results(self, _mock, client):
+        resp = await client.post("/api/network/speedtest")
         assert resp.status_code == 200
         data = resp.json()
         assert data["ok"] is True
@@ -676,8 +694,8 @@ class TestSpeedTest:
 
     @patch("pi_decoder.network.run_speed_test", new_callable=AsyncMock,
            side_effect=RuntimeError("Speed test already in progress"))
-    def test_post_409_on_concurrent(self, _mock, client):
-        resp = client.post("/api/network/speedtest")
+    async def test_post_409_on_concurrent(self, _mock, client):
+        resp = await client.post("/api/network/speedtest")
         assert resp.status_code == 409
         data = resp.json()
         assert data["ok"] is False
@@ -685,16 +703,16 @@ class TestSpeedTest:
 
     @patch("pi_decoder.network.run_speed_test", new_callable=AsyncMock,
            side_effect=Exception("Connection failed"))
-    def test_post_500_on_failure(self, _mock, client):
-        resp = client.post("/api/network/speedtest")
+    async def test_post_500_on_failure(self, _mock, client):
+        resp = await client.post("/api/network/speedtest")
         assert resp.status_code == 500
         data = resp.json()
         assert data["ok"] is False
 
 
 class TestOverlayConfig:
-    def test_save_overlay_config(self, client, config):
-        resp = client.post("/api/config/overlay", json={
+    async def test_save_overlay_config(self, client, config):
+        resp = await client.post("/api/config/overlay", json={
             "enabled": True,
             "position": "top-left",
             "font_size": 72,
@@ -714,8 +732,8 @@ class TestOverlayConfig:
 
 
 class TestNetworkConfig:
-    def test_save_network_config(self, client, config):
-        resp = client.post("/api/config/network", json={
+    async def test_save_network_config(self, client, config):
+        resp = await client.post("/api/config/network", json={
             "hotspot_ssid": "NewHotspot",
             "hotspot_password": "newpassword",
             "ethernet_timeout": 15,
@@ -728,61 +746,55 @@ class TestNetworkConfig:
 
 
 class TestServiceTypes:
-    def test_get_service_types(self, client, mock_pco):
+    async def test_get_service_types(self, client, mock_pco):
         mock_pco.get_service_types = AsyncMock(return_value=[
             {"id": "1", "name": "Sunday"},
         ])
-        resp = client.get("/api/service-types")
+        resp = await client.get("/api/service-types")
         assert resp.status_code == 200
         data = resp.json()
         assert len(data["service_types"]) == 1
 
-    def test_get_service_types_no_pco(self, config, mock_mpv, mock_overlay, tmp_path):
+    async def test_get_service_types_no_pco(self, config, mock_mpv, mock_overlay, tmp_path):
         config_path = str(tmp_path / "config.toml")
         app = create_app(mock_mpv, None, mock_overlay, config, config_path)
-        c = TestClient(app)
-        resp = c.get("/api/service-types")
+        resp = await _one_request(app, "GET", "/api/service-types")
         assert resp.status_code == 200
         assert resp.json()["service_types"] == []
 
 
 class TestHotspotGuard:
-    @patch("pi_decoder.network.start_hotspot", new_callable=AsyncMock)
-    @patch("pi_decoder.network.get_network_info_sync", return_value={
-        "connection_type": "ethernet", "hotspot_active": False,
-    })
-    def test_hotspot_rejected_when_ethernet(self, _mock_net, _mock_start, client):
-        resp = client.post("/api/network/hotspot/start")
-        assert resp.status_code == 400
-        data = resp.json()
-        assert data["ok"] is False
-        assert "ethernet" in data["error"]
-        _mock_start.assert_not_awaited()
-
-    @patch("pi_decoder.network.start_hotspot", new_callable=AsyncMock)
-    @patch("pi_decoder.network.get_network_info_sync", return_value={
-        "connection_type": "wifi", "hotspot_active": False,
-    })
-    def test_hotspot_rejected_when_wifi(self, _mock_net, _mock_start, client):
-        resp = client.post("/api/network/hotspot/start")
+    @pytest.fixture(autouse=True)
+    def start_hotspot(self, monkeypatch):
+        mock = AsyncMock()
+        monkeypatch.setattr("pi_decoder.network.start_hotspot", mock)
+        return mock
+
+    @pytest.mark.parametrize("connection_type", ["ethernet", "wifi"])
+    async def test_hotspot_rejected_when_connected(self, client, monkeypatch, start_hotspot, connection_type):
+        monkeypatch.setattr("pi_decoder.network.get_network_info_sync", lambda: {
+            "connection_type": connection_type, "hotspot_active": False,
+        })
+        resp = await client.post("/api/network/hotspot/start")
         assert resp.status_code == 400
         data = resp.json()
         assert data["ok"] is False
-        assert "wifi" in data["error"]
+        assert connection_type in data["error"]
+        start_hotspot.assert_not_awaited()
 
-    @patch("pi_decoder.network.start_hotspot", new_callable=AsyncMock)
-    @patch("pi_decoder.network.get_network_info_sync", return_value={
-        "connection_type": "none", "hotspot_active": False,
-    })
-    def test_hotspot_allowed_when_disconnected(self, _mock_net, _mock_start, client):
-        resp = client.post("/api/network/hotspot/start")
+    async def test_hotspot_allowed_when_disconnected(self, client, monkeypatch, start_hotspot):
+        monkeypatch.setattr("pi_decoder.network.get_network_info_sync", lambda: {
+            "connection_type": "none", "hotspot_active": False,
+        })
+        resp = await client.post("/api/network/hotspot/start")
         assert resp.status_code == 200
         assert resp.json()["ok"] is True
+        start_hotspot.assert_awaited_once()
 
 
 class TestStaticIpConfig:
-    def test_save_static_ip_config(self, client, config):
-        resp = client.post("/api/config/network", json={
+    async def test_save_static_ip_config(self, client, config):
+        resp = await client.post("/api/config/network", json={
             "eth_ip_mode": "manual",
             "eth_ip_address": "192.168.1.100/24",
             "eth_gateway": "192.168.1.1",
@@ -795,8 +807,8 @@ class TestStaticIpConfig:
 
     @patch("pi_decoder.network.apply_static_ip", new_callable=AsyncMock,
            return_value="IP manual applied to Wired connection 1")
-    def test_apply_ip_success(self, _mock_apply, client):
-        resp = client.post("/api/network/apply-ip", json={"interface": "ethernet"})
+    async def test_apply_ip_success(self, _mock_apply, client):
+        resp = await client.post("/api/network/apply-ip", json={"interface": "ethernet"})
         assert resp.status_code == 200
         data = resp.json()
         assert data["ok"] is True
@@ -804,15 +816,15 @@ class TestStaticIpConfig:
 
     @patch("pi_decoder.network.apply_static_ip", new_callable=AsyncMock,
            side_effect=RuntimeError("No active ethernet connection"))
-    def test_apply_ip_no_connection(self, _mock_apply, client):
-        resp = client.post("/api/network/apply-ip", json={"interface": "ethernet"})
+    async def test_apply_ip_no_connection(self, _mock_apply, client):
+        resp = await client.post("/api/network/apply-ip", json={"interface": "ethernet"})
         assert resp.status_code == 500
         data = resp.json()
         assert data["ok"] is False
         assert "No active" in data["error"]
 
-    def test_apply_ip_invalid_interface(self, client):
-        resp = client.post("/api/network/apply-ip", json={"interface": "hotspot"})
+    async def test_apply_ip_invalid_interface(self, client):
+        resp = await client.post("/api/network/apply-ip", json={"interface": "hotspot"})
         assert resp.status_code == 400
         data = resp.json()
         assert data["ok"] is False
@@ -820,26 +832,29 @@ class TestStaticIpConfig:
 
 
 class TestHotspotEndpoints:
-    @patch("pi_decoder.network.start_hotspot", new_callable=AsyncMock)
-    @patch("pi_decoder.network.get_network_info_sync", return_value={
-        "connection_type": "none", "hotspot_active": False,
-    })
-    def test_start_hotspot(self, _mock_net, _mock_start, client):
-        resp = client.post("/api/network/hotspot/start")
+    @pytest.fixture(autouse=True)
+    def _hotspot_stubs(self, monkeypatch):
+        monkeypatch.setattr("pi_decoder.network.start_hotspot", _async_return(None))
+        monkeypatch.setattr("pi_decoder.network.stop_hotspot", _async_return(None))
+        monkeypatch.setattr("pi_decoder.network.get_network_info_sync", lambda: {
+            "connection_type": "none", "hotspot_active": False,
+        })
+
+    async def test_start_hotspot(self, client):
+        resp = await client.post("/api/network/hotspot/start")
         assert resp.status_code == 200
         assert resp.json()["ok"] is True
 
-    @patch("pi_decoder.network.stop_hotspot", new_callable=AsyncMock)
-    def test_stop_hotspot(self, _mock, client):
-        resp = client.post("/api/network/hotspot/stop")
+    async def test_stop_hotspot(self, client):
+        resp = await client.post("/api/network/hotspot/stop")
         assert resp.status_code == 200
         assert resp.json()["ok"] is True
 
 
 class TestSavedNetworks:
     @patch("pi_decoder.network.get_saved_networks", new_callable=AsyncMock, return_value=["HomeWifi", "Office"])
-    def test_get_saved_networks(self, _mock, client):
-        resp = client.get("/api/network/wifi/saved")
+    async def test_get_saved_networks(self, _mock, client):
+        resp = await client.get("/api/network/wifi/saved")
         assert resp.status_code == 200
         data = resp.json()
         assert data["networks"] == ["HomeWifi", "Office"]
@@ -847,51 +862,51 @@ class TestSavedNetworks:
 
 class TestForgetNetwork:
     @patch("pi_decoder.network.forget_network", new_callable=AsyncMock)
-    def test_forget_success(self, _mock, client):
-        resp = client.post("/api/network/wifi/forget", json={"name": "OldWifi"})
+    async def test_forget_success(self, _mock, client):
+        resp = await client.post("/api/network/wifi/forget", json={"name": "OldWifi"})
         assert resp.status_code == 200
         assert resp.json()["ok"] is True
 
-    def test_forget_empty_name(self, client):
-        resp = client.post("/api/network/wifi/forget", json={"name": ""})
+    async def test_forget_empty_name(self, client):
+        resp = await client.post("/api/network/wifi/forget", json={"name": ""})
         assert resp.status_code == 400
         assert resp.json()["ok"] is False
 
 
 class TestRebootShutdown:
     @patch("subprocess.Popen")
-    def test_reboot(self, _mock_popen, client):
-        resp = client.post("/api/reboot")
+    async def test_reboot(self, _mock_popen, client):
+        resp = await client.post("/api/reboot")
         assert resp.status_code == 200
         assert resp.json()["ok"] is True
 
     @patch("subprocess.Popen")
-    def test_shutdown(self, _mock_popen, client):
-        resp = client.post("/api/shutdown")
+    async def test_shutdown(self, _mock_popen, client):
+        resp = await client.post("/api/shutdown")
         assert resp.status_code == 200
         assert resp.json()["ok"] is True
 
     @patch("subprocess.Popen")
     @patch("pi_decoder.cec.standby", new_callable=AsyncMock, return_value="standby ok")
-    def test_kiosk_shutdown_sends_standby_and_poweroff(self, mock_standby, _mock_popen, client):
+    async def test_kiosk_shutdown_sends_standby_and_poweroff(self, mock_standby, _mock_popen, client):
         """Kiosk shutdown: CEC standby first, then poweroff."""
-        resp = client.post("/api/system/kiosk-shutdown")
+        resp = await client.post("/api/system/kiosk-shutdown")
         assert resp.status_code == 200
         assert resp.json()["ok"] is True
         mock_standby.assert_awaited_once()
 
     @patch("subprocess.Popen")
     @patch("pi_decoder.cec.standby", new_callable=AsyncMock, side_effect=Exception("CEC down"))
-    def test_kiosk_shutdown_continues_if_cec_fails(self, _mock_standby, _mock_popen, client):
+    async def test_kiosk_shutdown_continues_if_cec_fails(self, _mock_standby, _mock_popen, client):
         """If TV is already unreachable via CEC, still proceed with Pi poweroff."""
-        resp = client.post("/api/system/kiosk-shutdown")
+        resp = await client.post("/api/system/kiosk-shutdown")
         assert resp.status_code == 200
         assert resp.json()["ok"] is True
 
 
 class TestStreamMaxResolution:
-    def test_save_max_resolution_valid(self, client, config):
-        resp = client.post("/api/config/stream", json={
+    async def test_save_max_resolution_valid(self, client, config):
+        resp = await client.post("/api/config/stream", json={
             "url": "rtmp://test.local/live",
             "network_caching": 2000,
             "max_resolution": "720",
@@ -900,9 +915,9 @@ class TestStreamMaxResolution:
         assert resp.json()["ok"] is True
         assert config.stream.max_resolution == "720"
 
-    def test_save_max_resolution_invalid_rejected(self, client, config):
+    async def test_save_max_resolution_invalid_rejected(self, client, config):
         config.stream.max_resolution = "1080"
-        resp = client.post("/api/config/stream", json={
+        resp = await client.post("/api/config/stream", json={
             "url": "rtmp://test.local/live",
             "network_caching": 2000,
             "max_resolution": "4k",
@@ -913,17 +928,17 @@ class TestStreamMaxResolution:
         assert "Invalid max_resolution" in data["error"]
         assert config.stream.max_resolution == "1080"
 
-    def test_save_max_resolution_omitted_keeps_existing(self, client, config):
+    async def test_save_max_resolution_omitted_keeps_existing(self, client, config):
         config.stream.max_resolution = "720"
-        resp = client.post("/api/config/stream", json={
+        resp = await client.post("/api/config/stream", json={
             "url": "rtmp://test.local/live",
             "network_caching": 2000,
         })
         assert resp.status_code == 200
         assert config.stream.max_resolution == "720"
 
-    def test_save_max_resolution_best(self, client, config):
-        resp = client.post("/api/config/stream", json={
+    async def test_save_max_resolution_best(self, client, config):
+        resp = await client.post("/api/config/stream", json={
             "url": "rtmp://test.local/live",
             "network_caching": 2000,
             "max_resolution": "best",
@@ -938,8 +953,8 @@ class TestCaptivePortalMiddleware:
     @patch("pi_decoder.network.get_network_info_sync", return_value={
         "hotspot_active": True, "ip": "10.42.0.1",
     })
-    def test_apple_probe_hotspot_active_returns_200_html(self, _mock_net, client):
-        resp = client.get("/hotspot-detect.html", headers={"host": "captive.apple.com"})
+    async def test_apple_probe_hotspot_active_returns_200_html(self, _mock_net, client):
+        resp = await client.get("/hotspot-detect.html", headers={"host": "captive.apple.com"})
         assert resp.status_code == 200
         assert "text/html" in resp.headers["content-type"]
         assert "meta http-equiv" in resp.text
@@ -948,21 +963,21 @@ class TestCaptivePortalMiddleware:
     @patch("pi_decoder.network.get_network_info_sync", return_value={
         "hotspot_active": True, "ip": "10.42.0.1",
     })
-    def test_google_probe_hotspot_active_returns_200_html(self, _mock_net, client):
-        resp = client.get("/generate_204", headers={"host": "connectivitycheck.gstatic.com"})
+    async def test_google_probe_hotspot_active_returns_200_html(self, _mock_net, client):
+        resp = await client.get("/generate_204", headers={"host": "connectivitycheck.gstatic.com"})
         assert resp.status_code == 200
         assert "text/html" in resp.headers["content-type"]
 
     @patch("pi_decoder.network.get_network_info_sync", return_value={
         "hotspot_active": False, "ip": "192.168.1.100",
     })
-    def test_apple_probe_hotspot_not_active_passes_through(self, _mock_net, client):
-        resp = client.get("/hotspot-detect.html", headers={"host": "captive.apple.com"})
+    async def test_apple_probe_hotspot_not_active_passes_through(self, _mock_net, client):
+        resp = await client.get("/hotspot-detect.html", headers={"host": "captive.apple.com"})
         # Should pass through to app (404 since no such route)
         assert resp.status_code == 404
 
-    def test_normal_host_passes_through(self, client):
-        resp = client.get("/api/health", headers={"host": "10.42.0.1"})
+    async def test_normal_host_passes_through(self, client):
+        resp = await client.get("/api/health", headers={"host": "10.42.0.1"})
         assert resp.status_code == 200
         assert resp.json() == {"status": "ok"}
 
@@ -971,8 +986,8 @@ class TestDisplayModes:
     @patch("pi_decoder.display.get_current_resolution", return_value="1920x1080@30D")
     @patch("pi_decoder.display.get_available_modes", return_value=["1920x1080", "1280x720"])
     @patch("pi_decoder.display.get_pi_model", return_value=4)
-    def test_get_display_modes_structured(self, _mock_pi, _mock_modes, _mock_current, client):
-        resp = client.get("/api/display/modes")
+    async def test_get_display_modes_structured(self, _mock_pi, _mock_modes, _mock_current, client):
+        resp = await client.get("/api/display/modes")
         assert resp.status_code == 200
         data = resp.json()
         assert len(data["modes"]) == 2
@@ -984,8 +999,8 @@ class TestDisplayModes:
     @patch("pi_decoder.display.get_current_resolution", return_value="3840x2160@30D")
     @patch("pi_decoder.display.get_available_modes", return_value=["3840x2160", "1920x1080"])
     @patch("pi_decoder.display.get_pi_model", return_value=4)
-    def test_4k_rates_limited_on_pi4(self, _mock_pi, _mock_modes, _mock_current, client):
-        resp = client.get("/api/display/modes")
+    async def test_4k_rates_limited_on_pi4(self, _mock_pi, _mock_modes, _mock_current, client):
+        resp = await client.get("/api/display/modes")
         assert resp.status_code == 200
         data = resp.json()
         four_k = data["modes"][0]
@@ -997,8 +1012,8 @@ class TestDisplayModes:
 
 class TestDisplayResolution:
     @patch("pi_decoder.display.set_display_resolution", new_callable=AsyncMock)
-    def test_set_resolution_valid(self, _mock_set, client, config):
-        resp = client.post("/api/display/resolution", json={
+    async def test_set_resolution_valid(self, _mock_set, client, config):
+        resp = await client.post("/api/display/resolution", json={
             "resolution": "1280x720@60D",
         })
         assert resp.status_code == 200
@@ -1007,8 +1022,8 @@ class TestDisplayResolution:
         assert config.display.hdmi_resolution == "1280x720@60D"
         _mock_set.assert_awaited_once_with("1280x720@60D")
 
-    def test_set_resolution_empty_rejected(self, client):
-        resp = client.post("/api/display/resolution", json={
+    async def test_set_resolution_empty_rejected(self, client):
+        resp = await client.post("/api/display/resolution", json={
             "resolution": "",
         })
         assert resp.status_code == 400
@@ -1016,8 +1031,8 @@ class TestDisplayResolution:
         assert data["ok"] is False
         assert "required" in data["error"]
 
-    def test_set_resolution_invalid_format_rejected(self, client):
-        resp = client.post("/api/display/resolution", json={
+    async def test_set_resolution_invalid_format_rejected(self, client):
+        resp = await client.post("/api/display/resolution", json={
             "resolution": "invalid-res",
         })
         assert resp.status_code == 400
@@ -1025,8 +1040,8 @@ class TestDisplayResolution:
         assert data["ok"] is False
         assert "Invalid resolution" in data["error"]
 
-    def test_set_resolution_120hz_rejected(self, client):
-        resp = client.post("/api/display/resolution", json={
+    async def test_set_resolution_120hz_rejected(self, client):
+        resp = await client.post("/api/display/resolution", json={
             "resolution": "1920x1080@120D",
         })
         assert resp.status_code == 400
@@ -1036,8 +1051,8 @@ class TestDisplayResolution:
 
     @patch("pi_decoder.display.get_pi_model", return_value=4)
     @patch("pi_decoder.display.get_refresh_rates_for_resolution", return_value=[24, 25, 30])
-    def test_4k_60_rejected_on_pi4(self, _mock_rates, _mock_model, client):
-        resp = client.post("/api/display/resolution", json={
+    async def test_4k_60_rejected_on_pi4(self, _mock_rates, _mock_model, client):
+        resp = await client.post("/api/display/resolution", json={
             "resolution": "3840x2160@60D",
         })
         assert resp.status_code == 400
@@ -1048,8 +1063,8 @@ class TestDisplayResolution:
 
     @patch("pi_decoder.display.set_display_resolution", new_callable=AsyncMock,
            side_effect=RuntimeError("cmdline.txt not found"))
-    def test_set_resolution_write_failure(self, _mock_set, client):
-        resp = client.post("/api/display/resolution", json={
+    async def test_set_resolution_write_failure(self, _mock_set, client):
+        resp = await client.post("/api/display/resolution", json={
             "resolution": "1920x1080@60D",
         })
         assert resp.status_code == 500
@@ -1060,8 +1075,8 @@ class TestDisplayResolution:
 
 class TestCecErrorPaths:
     @patch("pi_decoder.cec.power_on", new_callable=AsyncMock, side_effect=Exception("CEC failed"))
-    def test_cec_on_error(self, _mock, client):
-        resp = client.post("/api/cec/on")
+    async def test_cec_on_error(self, _mock, client):
+        resp = await client.post("/api/cec/on")
         assert resp.status_code == 500
         data = resp.json()
         assert data["ok"] is False
@@ -1069,27 +1084,27 @@ class TestCecErrorPaths:
 
 
 class TestStreamPresets:
-    def test_get_presets_returns_list(self, client, config):
+    async def test_get_presets_returns_list(self, client, config):
         config.stream.presets = [
             {"label": "Church", "url": "rtmp://church.local/live"},
             {"label": "Backup", "url": "rtmp://backup.local/live"},
         ]
-        resp = client.get("/api/stream/presets")
+        resp = await client.get("/api/stream/presets")
         assert resp.status_code == 200
         data = resp.json()
         assert len(data["presets"]) == 2
         assert data["presets"][0]["label"] == "Church"
 
-    def test_get_presets_empty(self, client, config):
+    async def test_get_presets_empty(self, client, config):
         config.stream.presets = []
-        resp = client.get("/api/stream/presets")
+        resp = await client.get("/api/stream/presets")
         assert resp.status_code == 200
         assert resp.json()["presets"] == []
 
 
 class TestStreamPresetsSave:
-    def test_save_presets_valid(self, client, config):
-        resp = client.post("/api/stream/presets", json={
+    async def test_save_presets_valid(self, client, config):
+        resp = await client.post("/api/stream/presets", json={
             "presets": [
                 {"label": "Church", "url": "rtmp://church.local/live"},
                 {"label": "Backup", "url": "rtmp://backup.local/live"},
@@ -1099,14 +1114,14 @@ class TestStreamPresetsSave:
         assert resp.json()["ok"] is True
         assert len(config.stream.presets) == 2
 
-    def test_save_presets_max_10_rejected(self, client):
+    async def test_save_presets_max_10_rejected(self, client):
         presets = [{"label": f"P{i}", "url": f"rtmp://host{i}/live"} for i in range(11)]
-        resp = client.post("/api/stream/presets", json={"presets": presets})
+        resp = await client.post("/api/stream/presets", json={"presets": presets})
         assert resp.status_code == 400
         assert "Max 10" in resp.json()["error"]
 
-    def test_save_presets_drops_empty_label(self, client, config):
-        resp = client.post("/api/stream/presets", json={
+    async def test_save_presets_drops_empty_label(self, client, config):
+        resp = await client.post("/api/stream/presets", json={
             "presets": [
                 {"label": "", "url": "rtmp://host/live"},
                 {"label": "Valid", "url": "rtmp://valid/live"},
@@ -1116,9 +1131,9 @@ class TestStreamPresetsSave:
         assert len(config.stream.presets) == 1
         assert config.stream.presets[0]["label"] == "Valid"
 
-    def test_save_presets_truncates_label(self, client, config):
+    async def test_save_presets_truncates_label(self, client, config):
         long_label = "A" * 60
-        resp = client.post("/api/stream/presets", json={
+        resp = await client.post("/api/stream/presets", json={
             "presets": [{"label": long_label, "url": "rtmp://host/live"}],
         })
         assert resp.status_code == 200
@@ -1126,21 +1141,21 @@ class TestStreamPresetsSave:
 
 
 class TestStreamSwitch:
-    def test_switch_success(self, client, config, mock_mpv):
-        resp = client.post("/api/stream/switch", json={"url": "rtmp://new.local/live"})
+    async def test_switch_success(self, client, config, mock_mpv):
+        resp = await client.post("/api/stream/switch", json={"url": "rtmp://new.local/live"})
         assert resp.status_code == 200
         assert resp.json()["ok"] is True
         assert config.stream.url == "rtmp://new.local/live"
         mock_mpv.restart.assert_awaited_once()
 
-    def test_switch_empty_url(self, client):
-        resp = client.post("/api/stream/switch", json={"url": ""})
+    async def test_switch_empty_url(self, client):
+        resp = await client.post("/api/stream/switch", json={"url": ""})
         assert resp.status_code == 400
         assert "URL required" in resp.json()["error"]
 
-    def test_switch_restart_failure(self, client, mock_mpv):
+    async def test_switch_restart_failure(self, client, mock_mpv):
         mock_mpv.restart = AsyncMock(side_effect=RuntimeError("mpv crash"))
-        resp = client.post("/api/stream/switch", json={"url": "rtmp://host/live"})
+        resp = await client.post("/api/stream/switch", json={"url": "rtmp://host/live"})
         assert resp.status_code == 500
         assert "restart failed" in resp.json()["error"]
 
@@ -1150,8 +1165,8 @@ class TestBadInputReturns400:
 
     # -- POST /api/config/stream --
 
-    def test_stream_bad_network_caching(self, client):
-        resp = client.post("/api/config/stream", json={
+    async def test_stream_bad_network_caching(self, client):
+        resp = await client.post("/api/config/stream", json={
             "url": "rtmp://test.local/live",
             "network_caching": "not_a_number",
         })
@@ -1162,29 +1177,29 @@ class TestBadInputReturns400:
 
     # -- POST /api/config/overlay --
 
-    def test_overlay_bad_font_size(self, client):
-        resp = client.post("/api/config/overlay", json={"font_size": "big"})
+    async def test_overlay_bad_font_size(self, client):
+        resp = await client.post("/api/config/overlay", json={"font_size": "big"})
         assert resp.status_code == 400
         data = resp.json()
         assert data["ok"] is False
         assert "Invalid value" in data["error"]
 
-    def test_overlay_bad_font_size_title(self, client):
-        resp = client.post("/api/config/overlay", json={"font_size_title": "large"})
+    async def test_overlay_bad_font_size_title(self, client):
+        resp = await client.post("/api/config/overlay", json={"font_size_title": "large"})
         assert resp.status_code == 400
         data = resp.json()
         assert data["ok"] is False
         assert "Invalid value" in data["error"]
 
-    def test_overlay_bad_font_size_info(self, client):
-        resp = client.post("/api/config/overlay", json={"font_size_info": "small"})
+    async def test_overlay_bad_font_size_info(self, client):
+        resp = await client.post("/api/config/overlay", json={"font_size_info": "small"})
         assert resp.status_code == 400
         data = resp.json()
         assert data["ok"] is False
         assert "Invalid value" in data["error"]
 
-    def test_overlay_bad_transparency(self, client):
-        resp = client.post("/api/config/overlay", json={"transparency": "opaque"})
+    async def test_overlay_bad_transparency(self, client):
+        resp = await client.post("/api/config/overlay", json={"transparency": "opaque"})
         assert resp.status_code == 400
         data = resp.json()
         assert data["ok"] is False
@@ -1192,8 +1207,8 @@ class TestBadInputReturns400:
 
     # -- POST /api/config/pco --
 
-    def test_pco_bad_poll_interval(self, client):
-        resp = client.post("/api/config/pco", json={
+    async def test_pco_bad_poll_interval(self, client):
+        resp = await client.post("/api/config/pco", json={
             "app_id": "id",
             "secret": "secret",
             "service_type_id": "123",
@@ -1206,8 +1221,8 @@ class TestBadInputReturns400:
 
     # -- POST /api/config/network --
 
-    def test_network_bad_ethernet_timeout(self, client):
-        resp = client.post("/api/config/network", json={
+    async def test_network_bad_ethernet_timeout(self, client):
+        resp = await client.post("/api/config/network", json={
             "ethernet_timeout": "forever",
         })
         assert resp.status_code == 400
@@ -1215,8 +1230,8 @@ class TestBadInputReturns400:
         assert data["ok"] is False
         assert "Invalid value" in data["error"]
 
-    def test_network_bad_wifi_timeout(self, client):
-        resp = client.post("/api/config/network", json={
+    async def test_network_bad_wifi_timeout(self, client):
+        resp = await client.post("/api/config/network", json={
             "wifi_timeout": "never",
         })
         assert resp.status_code == 400
@@ -1226,60 +1241,60 @@ class TestBadInputReturns400:
 
 
 class TestStreamSwitchBack:
-    def test_switch_back_success(self, client, mock_mpv):
-        resp = client.post("/api/stream/switch-back")
+    async def test_switch_back_success(self, client, mock_mpv):
+        resp = await client.post("/api/stream/switch-back")
         assert resp.status_code == 200
         assert resp.json()["ok"] is True
         mock_mpv.reset_stream_retry.assert_called_once()
         mock_mpv.restart.assert_awaited_once()
 
-    def test_switch_back_restart_failure(self, client, mock_mpv):
+    async def test_switch_back_restart_failure(self, client, mock_mpv):
         mock_mpv.restart = AsyncMock(side_effect=RuntimeError("mpv crash"))
-        resp = client.post("/api/stream/switch-back")
+        resp = await client.post("/api/stream/switch-back")
         assert resp.status_code == 500
         assert "failed" in resp.json()["error"]
 
 
 class TestNetworkPing:
     @patch("subprocess.run")
-    def test_ping_success(self, mock_run, client):
+    async def test_ping_success(self, mock_run, client):
         mock_run.return_value = MagicMock(
             returncode=0,
             stdout="PING host (1.2.3.4): 3 packets\nrtt min/avg/max = 5.0/10.5/15.0 ms",
         )
-        resp = client.post("/api/network/ping", json={"host": "example.com"})
+        resp = await client.post("/api/network/ping", json={"host": "example.com"})
         assert resp.status_code == 200
         data = resp.json()
         assert data["ok"] is True
         assert data["reachable"] is True
         assert data["avg_ms"] == 10.5
 
-    def test_ping_invalid_hostname(self, client):
-        resp = client.post("/api/network/ping", json={"host": "bad;host"})
+    async def test_ping_invalid_hostname(self, client):
+        resp = await client.post("/api/network/ping", json={"host": "bad;host"})
         assert resp.status_code == 400
         assert "Invalid hostname" in resp.json()["error"]
 
-    def test_ping_falls_back_to_stream_url(self, client, config):
+    async def test_ping_falls_back_to_stream_url(self, client, config):
         config.stream.url = "rtmp://stream.example.com/live"
         with patch("subprocess.run") as mock_run:
             mock_run.return_value = MagicMock(
                 returncode=0,
                 stdout="rtt min/avg/max = 1.0/2.0/3.0 ms",
             )
-            resp = client.post("/api/network/ping", json={"host": ""})
+            resp = await client.post("/api/network/ping", json={"host": ""})
         assert resp.status_code == 200
         data = resp.json()
         assert data["host"] == "stream.example.com"
 
-    def test_ping_no_host_no_url(self, client, config):
+    async def test_ping_no_host_no_url(self, client, config):
         config.stream.url = ""
-        resp = client.post("/api/network/ping", json={"host": ""})
+        resp = await client.post("/api/network/ping", json={"host": ""})
         assert resp.status_code == 400
         assert "No host" in resp.json()["error"]
 
     @patch("subprocess.run", side_effect=subprocess.TimeoutExpired(cmd="ping", timeout=15))
-    def test_ping_timeout(self, _mock, client):
-        resp = client.post("/api/network/ping", json={"host": "slow.example.com"})
+    async def test_ping_timeout(self, _mock, client):
+        resp = await client.post("/api/network/ping", json={"host": "slow.example.com"})
         assert resp.status_code == 200
         data = resp.json()
         assert data["reachable"] is False
@@ -1289,9 +1304,9 @@ class TestNetworkPing:
 class TestLogsDownload:
     @patch("socket.gethostname", return_value="test-decoder")
     @patch("subprocess.run")
-    def test_download_returns_text_file(self, mock_run, _mock_host, client):
+    async def test_download_returns_text_file(self, mock_run, _mock_host, client):
         mock_run.return_value = MagicMock(stdout="log line 1\nlog line 2\n")
-        resp = client.get("/api/logs/download")
+        resp = await client.get("/api/logs/download")
         assert resp.status_code == 200
         assert resp.headers["content-type"] == "text/plain; charset=utf-8"
         assert 'test-decoder-pi-decoder-logs.txt' in resp.headers["content-disposition"]
@@ -1299,26 +1314,26 @@ class TestLogsDownload:
 
 
 class TestPreviewWebSocket:
-    def test_ws_preview_sends_binary(self, client, mock_mpv):
+    def test_ws_preview_sends_binary(self, ws_client, mock_mpv):
         mock_mpv.take_screenshot = AsyncMock(return_value=b"\xff\xd8\xff\xe0fake-jpeg")
-        with client.websocket_connect("/ws/preview") as ws:
+        with ws_client.websocket_connect("/ws/preview") as ws:
             data = ws.receive_bytes()
         assert data[:2] == b"\xff\xd8"  # JPEG magic bytes
         assert len(data) > 0
 
-    def test_ws_preview_skips_when_no_screenshot(self, client, mock_mpv):
+    def test_ws_preview_skips_when_no_screenshot(self, ws_client, mock_mpv):
         # First call returns None (no screenshot), second returns data
         mock_mpv.take_screenshot = AsyncMock(side_effect=[None, b"\xff\xd8\xff\xe0jpeg"])
-        with client.websocket_connect("/ws/preview") as ws:
+        with ws_client.websocket_connect("/ws/preview") as ws:
             data = ws.receive_bytes()
         # Should eventually receive the second screenshot
         assert data[:2] == b"\xff\xd8"
 
 
 class TestRestartVideoError:
-    def test_restart_video_error(self, client, mock_mpv):
+    async def test_restart_video_error(self, client, mock_mpv):
         mock_mpv.restart = AsyncMock(side_effect=RuntimeError("mpv segfault"))
-        resp = client.post("/api/restart/video")
+        resp = await client.post("/api/restart/video")
         assert resp.status_code == 500
         data = resp.json()
         assert data["ok"] is False